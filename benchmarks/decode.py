@@ -0,0 +1,68 @@
+"""
+Benchmark for the data decoders.
+
+Decodes every response in the tests/data fixtures repeatedly and reports the
+time per call for each decoder.
+
+Run from the repository root:
+
+    python -m benchmarks.decode
+"""
+import argparse
+from glob import glob
+import timeit
+
+from screenlogicpy.requests.chemistry import decode_chemistry
+from screenlogicpy.requests.config import decode_pool_config
+from screenlogicpy.requests.pump import decode_pump_status
+from screenlogicpy.requests.scg import decode_scg_config
+from screenlogicpy.requests.status import decode_pool_status
+
+from tests.conftest import load_response_collections
+
+
+def decode_all_pumps(pumps, data):
+    for idx, pump in enumerate(pumps):
+        decode_pump_status(pump.raw, data, idx)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    collections = load_response_collections(
+        sorted(glob("slpy-*.json", root_dir="tests/data/"))
+    )
+
+    cases = {
+        "decode_pool_config": lambda rc, data: decode_pool_config(rc.config.raw, data),
+        "decode_pool_status": lambda rc, data: decode_pool_status(rc.status.raw, data),
+        "decode_pump_status": lambda rc, data: decode_all_pumps(rc.pumps, data),
+        "decode_chemistry": lambda rc, data: decode_chemistry(rc.chemistry.raw, data),
+        "decode_scg_config": lambda rc, data: decode_scg_config(rc.scg.raw, data),
+    }
+
+    print(f"{len(collections)} fixtures, best of {args.repeat} x {args.number}")
+    total = 0.0
+    for name, case in cases.items():
+        best = 0.0
+        for _, rc in collections:
+            # Decode into already populated data, as the poller does.
+            data = {}
+            decode_pool_config(rc.config.raw, data)
+            case(rc, data)
+            best += min(
+                timeit.repeat(
+                    lambda: case(rc, data), number=args.number, repeat=args.repeat
+                )
+            )
+        per_call = best / args.number / len(collections) * 1_000_000
+        total += per_call
+        print(f"{name:>20}: {per_call:8.2f} us/call")
+    print(f"{'total':>20}: {total:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark for loading response collection JSON files.
+
+Loads every tests/data fixture with the format 1 loader that rebuilt bytes with
+eval(), and with the current loader from both the original format 1 file and a
+format 2 copy. Reports the time per load and the file sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.fixtures
+"""
+
+import argparse
+from glob import glob
+import json
+import os
+import tempfile
+import timeit
+
+from screenlogicpy.data import (
+    ScreenLogicResponseCollection,
+    ScreenLogicResponseSet,
+    export_response_collection,
+    import_response_collection,
+)
+
+
+def eval_object_hook(o: dict):
+    """The format 1 object hook, for comparison."""
+    if "__type" in o:
+        return eval(o["repr"])
+    if "decoded" in o and "raw" in o:
+        return ScreenLogicResponseSet(**o)
+    if "value" in o:
+        value = o["value"]
+        if isinstance(value, list) and len(value) == 3:
+            o["value"] = tuple(value)
+    for key in [key for key in o.keys() if isinstance(key, str) and key.isdigit()]:
+        o[int(key)] = o.pop(key)
+    return o
+
+
+def eval_import(filename: str) -> ScreenLogicResponseCollection:
+    with open(filename, "r", encoding="utf-8") as fp:
+        return ScreenLogicResponseCollection(
+            **json.load(fp, object_hook=eval_object_hook)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    files = [
+        f"tests/data/{f}" for f in sorted(glob("slpy*.json", root_dir="tests/data/"))
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        converted = []
+        for file in files:
+            collection = import_response_collection(file)
+            assert eval_import(file) == collection
+            copy = os.path.join(directory, os.path.basename(file))
+            export_response_collection(collection, copy)
+            converted.append(copy)
+
+        cases = {
+            "format 1, eval": (eval_import, files),
+            "format 1": (import_response_collection, files),
+            "format 2": (import_response_collection, converted),
+        }
+        print(f"{len(files)} fixtures, best of {args.repeat} x {args.number}")
+        for name, (load, paths) in cases.items():
+            best = min(
+                timeit.repeat(
+                    lambda: [load(path) for path in paths],
+                    number=args.number,
+                    repeat=args.repeat,
+                )
+            )
+            per_load = best / args.number / len(paths) * 1000
+            size = sum(os.path.getsize(path) for path in paths) / len(paths) / 1024
+            print(f"{name:>15}: {per_load:6.3f} ms/load {size:6.1f} KiB/file")
+
+
+if __name__ == "__main__":
+    main()
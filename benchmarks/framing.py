@@ -0,0 +1,124 @@
+"""
+Micro-benchmark for framing received ScreenLogic messages.
+
+Feeds multi-KB config answers to the framer in random 1-1460 byte chunks, the way
+they arrive from data_received(), and reports throughput and allocations per
+message. The pre-framer pop(0) loop is included for comparison.
+
+Run from the repository root:
+
+    python -m benchmarks.framing
+"""
+import argparse
+import random
+import struct
+import time
+import tracemalloc
+
+from screenlogicpy.const.msg import CODE, HEADER_LENGTH
+from screenlogicpy.requests.framer import MessageFramer
+from screenlogicpy.requests.utility import makeMessage, takeMessage
+
+from tests.conftest import load_response_collections
+
+MAX_CHUNK = 1460  # Typical TCP MSS
+
+
+class LegacyFramer:
+    """Per-byte framing loop used by ScreenLogicProtocol before MessageFramer."""
+
+    def __init__(self) -> None:
+        self._buff = bytearray()
+
+    def feed(self, data: bytes) -> list[tuple[int, int, bytes]]:
+        self._buff.extend(data)
+        complete = []
+        while len(self._buff) >= HEADER_LENGTH:
+            dataLen = struct.unpack_from("<I", self._buff, 4)[0]
+            totalLen = HEADER_LENGTH + dataLen
+            if len(self._buff) >= totalLen:
+                out = bytearray()
+                for _ in range(totalLen):
+                    out.append(self._buff.pop(0))
+                complete.append(takeMessage(bytes(out)))
+            else:
+                break
+        return complete
+
+
+def build_stream(payload_size: int, count: int) -> tuple[bytes, int]:
+    """Return a stream of config answers padded out to roughly payload_size."""
+    configs = [rc.config.raw for _, rc in load_response_collections()]
+    stream = bytearray()
+    for i in range(count):
+        payload = configs[i % len(configs)]
+        payload = (payload * (payload_size // len(payload) + 1))[:payload_size]
+        stream += makeMessage(i, CODE.CTRLCONFIG_QUERY + 1, payload)
+    return bytes(stream), count
+
+
+def chunk(stream: bytes, seed: int) -> list[bytes]:
+    rand = random.Random(seed)
+    chunks = []
+    pos = 0
+    while pos < len(stream):
+        size = rand.randint(1, MAX_CHUNK)
+        chunks.append(stream[pos : pos + size])
+        pos += size
+    return chunks
+
+
+def run(framer_type, chunks: list[bytes], expected: int) -> tuple[float, float]:
+    """Return (MB/s, allocated bytes per message) for one pass over chunks."""
+    total = sum(len(c) for c in chunks)
+
+    framer = framer_type()
+    start = time.perf_counter()
+    framed = 0
+    for c in chunks:
+        framed += len(framer.feed(c))
+    elapsed = time.perf_counter() - start
+    assert framed == expected
+
+    framer = framer_type()
+    tracemalloc.start()
+    allocated = 0
+    for c in chunks:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        framer.feed(c)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+    tracemalloc.stop()
+
+    return total / elapsed / 1_000_000, allocated / expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=8192, help="Payload bytes")
+    parser.add_argument("--count", type=int, default=200, help="Messages")
+    parser.add_argument("--seed", type=int, default=1444)
+    parser.add_argument("--no-legacy", action="store_true")
+    args = parser.parse_args()
+
+    stream, count = build_stream(args.size, args.count)
+    chunks = chunk(stream, args.seed)
+    print(
+        f"{count} messages of {args.size} byte payloads, "
+        f"{len(stream)} bytes in {len(chunks)} chunks"
+    )
+
+    framers = [("MessageFramer", MessageFramer)]
+    if not args.no_legacy:
+        framers.append(("legacy pop(0)", LegacyFramer))
+
+    for name, framer_type in framers:
+        mbps, per_message = run(framer_type, chunks, count)
+        print(
+            f"{name:>14}: {mbps:10.2f} MB/s {per_message / 1024:10.1f} KiB allocated/msg"
+        )
+
+
+if __name__ == "__main__":
+    main()
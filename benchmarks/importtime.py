@@ -0,0 +1,64 @@
+"""
+Benchmark for the cold import time of screenlogicpy.
+
+Runs each import statement in a new interpreter with 'python -X importtime' and
+sums the cumulative time of the screenlogicpy modules imported at the top level,
+which includes everything they import in turn. Exits with status 1 if the median
+time of any statement exceeds its target.
+
+Run from the repository root:
+
+    python -m benchmarks.importtime
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Import statements and their target median cold import time in milliseconds.
+TARGETS = {
+    "import screenlogicpy": 10,
+    "from screenlogicpy import async_discover": 30,
+    "from screenlogicpy import ScreenLogicGateway": 80,
+}
+
+
+def import_time(statement: str) -> float:
+    """Return the cold import time of a statement in milliseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Modules imported at the top level have no indentation.
+        if name.startswith(" screenlogicpy"):
+            total += int(cumulative)
+    return total / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=10)
+    parser.add_argument(
+        "--no-check", action="store_true", help="do not fail on exceeded targets"
+    )
+    args = parser.parse_args()
+
+    exceeded = False
+    for statement, target in TARGETS.items():
+        median = statistics.median(import_time(statement) for _ in range(args.number))
+        status = "ok" if median <= target else "SLOW"
+        exceeded |= median > target
+        print(f"{median:7.1f} ms (target {target:3d} ms) {status:4} {statement}")
+    if exceeded and not args.no_check:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark for throughput and tail latency against a fleet of simulated adapters.
+
+Serves simulated protocol adapters from the tests/data fixtures on localhost, each
+pushing status changes, chemistry drift and color light shows to its clients, with
+optional latency, fragmentation, dropped responses and slow-loris writes.
+
+The gateway scenario connects a subscribed ScreenLogicGateway to every adapter and
+updates each in a loop, timing every update. The fleet scenario adds every
+adapter as a GatewayPool site and times rounds of updating all sites.
+
+Run from the repository root:
+
+    python -m benchmarks.load --adapters 200 --duration 10
+"""
+
+import argparse
+import asyncio
+from glob import glob
+import time
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.common import ScreenLogicException
+from screenlogicpy.const.msg import CODE
+from screenlogicpy.fleet import GatewayPool
+from screenlogicpy.metrics import MetricsCollector
+
+from tests.conftest import load_response_collections
+from tests.simulator import AdapterFaults, AdapterFleet, PushTraffic
+
+PUSH_SUBSCRIPTIONS = (CODE.STATUS_CHANGED, CODE.CHEMISTRY_CHANGED, CODE.COLOR_UPDATE)
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return float("nan")
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def report(name: str, latencies: list[float], seconds: float, errors: int) -> None:
+    ordered = sorted(latencies)
+    print(
+        f"{name:>8}: {len(ordered) / seconds:8.1f}/s"
+        f" p50 {percentile(ordered, 0.5) * 1000:7.1f} ms"
+        f" p95 {percentile(ordered, 0.95) * 1000:7.1f} ms"
+        f" p99 {percentile(ordered, 0.99) * 1000:7.1f} ms"
+        f" max {(ordered[-1] if ordered else float('nan')) * 1000:7.1f} ms"
+        f" {errors} errors"
+    )
+
+
+async def run_gateways(hosts: list[dict], args: argparse.Namespace) -> None:
+    metrics = MetricsCollector()
+    gateways = [
+        ScreenLogicGateway(max_in_flight=args.max_in_flight, metrics=metrics)
+        for _ in hosts
+    ]
+    connecting = asyncio.Semaphore(args.connect_concurrency)
+    latencies = []
+    errors = 0
+
+    async def connect(gateway: ScreenLogicGateway, host: dict) -> None:
+        async with connecting:
+            await gateway.async_connect(**host)
+        for code in PUSH_SUBSCRIPTIONS:
+            await gateway.async_subscribe_client(lambda: None, code)
+
+    async def update(gateway: ScreenLogicGateway, deadline: float) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await gateway.async_update()
+            except ScreenLogicException:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*map(connect, gateways, hosts))
+    print(f"connected {len(gateways)} gateways in {time.perf_counter() - start:.2f} s")
+    metrics.reset()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(update(gateway, deadline) for gateway in gateways))
+    seconds = time.perf_counter() - start
+    report("updates", latencies, seconds, errors)
+    pushes = sum(stats["pushes"] for stats in metrics.as_dict()["codes"].values())
+    print(f"  pushes: {pushes / seconds:8.1f}/s received")
+    await asyncio.gather(*(gateway.async_disconnect(True) for gateway in gateways))
+
+
+async def run_fleet(hosts: list[dict], args: argparse.Namespace) -> None:
+    pool = GatewayPool(max_concurrent=args.pool_concurrency)
+    for i, host in enumerate(hosts):
+        pool.add_site(f"site-{i}", **host, max_in_flight=args.max_in_flight)
+    start = time.perf_counter()
+    failed = await pool.async_connect_all()
+    print(
+        f"connected {len(hosts) - len(failed)} sites in"
+        f" {time.perf_counter() - start:.2f} s"
+    )
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    deadline = start + args.duration
+    while time.perf_counter() < deadline:
+        round_start = time.perf_counter()
+        errors += len(await pool.async_update_all())
+        latencies.append(time.perf_counter() - round_start)
+    report("rounds", latencies, time.perf_counter() - start, errors)
+    for site_id in pool.sites:
+        await pool.async_remove_site(site_id)
+
+
+async def run(args: argparse.Namespace) -> None:
+    collections = [
+        rc
+        for _, rc in load_response_collections(
+            sorted(glob("slpy-*.json", root_dir="tests/data/"))
+        )
+    ]
+    faults = AdapterFaults(
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop,
+        fragment=args.fragment,
+        slow_loris=args.slow_loris,
+    )
+    traffic = PushTraffic(
+        status_interval=args.status_interval,
+        chemistry_interval=args.chemistry_interval,
+        color_interval=args.color_interval,
+    )
+    print(
+        f"{args.adapters} adapters from {len(collections)} fixtures,"
+        f" {args.duration:.0f} s per scenario, {faults}"
+    )
+    for scenario in args.scenario:
+        fleet = AdapterFleet(collections, faults, traffic, seed=args.seed)
+        try:
+            hosts = await fleet.async_start(args.adapters)
+            print(f"{scenario}:")
+            if scenario == "gateway":
+                await run_gateways(hosts, args)
+            else:
+                await run_fleet(hosts, args)
+        finally:
+            await fleet.async_stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--adapters", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument(
+        "--scenario",
+        nargs="+",
+        choices=("gateway", "fleet"),
+        default=["gateway", "fleet"],
+    )
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    parser.add_argument("--connect-concurrency", type=int, default=32)
+    parser.add_argument("--pool-concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--drop", type=float, default=0.0)
+    parser.add_argument("--fragment", type=int, default=None)
+    parser.add_argument("--slow-loris", type=float, default=0.0)
+    parser.add_argument("--status-interval", type=float, default=1.0)
+    parser.add_argument("--chemistry-interval", type=float, default=5.0)
+    parser.add_argument("--color-interval", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark for the time from reconnecting to having current pool status.
+
+Connects to the fake protocol adapter from the tests, which answers each request
+after a fixed delay, updates once, then repeatedly disconnects and times reconnecting
+until a fresh pool status has been received.
+
+Run from the repository root:
+
+    python -m benchmarks.reconnect
+"""
+import argparse
+import asyncio
+from glob import glob
+import time
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.msg import CODE, COM_CONNECT_SETTLE
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.metrics import MetricsCollector
+
+from benchmarks.update import DelayedTCPProtocolAdapter
+from tests.conftest import load_response_collections
+
+
+async def time_reconnects(
+    responses: ScreenLogicResponseCollection, delay: float, number: int, settle: float
+) -> float:
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(
+        lambda: DelayedTCPProtocolAdapter(responses, delay), "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+    metrics = MetricsCollector()
+    gateway = ScreenLogicGateway(metrics=metrics, connect_settle=settle)
+    try:
+        await gateway.async_connect("127.0.0.1", port)
+        await gateway.async_update()
+        total = 0.0
+        for _ in range(number):
+            await gateway.async_disconnect()
+            metrics.reset()
+            start = time.perf_counter()
+            await gateway.async_connect()
+            if not metrics.code_stats(CODE.POOLSTATUS_QUERY).latency.count:
+                await gateway.async_get_status()
+            total += time.perf_counter() - start
+        return total / number
+    finally:
+        await gateway.async_disconnect()
+        server.close()
+        await server.wait_closed()
+
+
+async def run(args: argparse.Namespace) -> None:
+    collections = load_response_collections(
+        sorted(glob("slpy-*.json", root_dir="tests/data/"))
+    )
+
+    print(
+        f"{len(collections)} fixtures, {args.delay * 1000:.0f} ms per request,"
+        f" {args.settle * 1000:.0f} ms connect settle"
+    )
+    for filename, rc in collections:
+        seconds = await time_reconnects(rc, args.delay, args.number, args.settle)
+        print(f"{filename}: {seconds * 1000:8.1f} ms to first status")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--settle", type=float, default=COM_CONNECT_SETTLE)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark for keeping historical copies of gateway data.
+
+Compares a deep copy of the nested data dict with a ScreenLogicSnapshot sharing
+metadata, reporting the memory held per copy and the time to take one.
+
+Run from the repository root:
+
+    python -m benchmarks.snapshot
+"""
+import argparse
+import copy
+from glob import glob
+import timeit
+import tracemalloc
+
+from screenlogicpy.snapshot import ScreenLogicSnapshot, SnapshotMetadata
+
+from tests.conftest import load_response_collections
+
+
+def held_per_copy(make, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    copies = [make() for _ in range(count)]
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del copies
+    return held / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=1000)
+    args = parser.parse_args()
+
+    collections = load_response_collections(
+        sorted(glob("slpy-*.json", root_dir="tests/data/"))
+    )
+
+    print(f"{len(collections)} fixtures, {args.count} copies each")
+    for filename, rc in collections:
+        data = rc.decoded_complete
+        metadata = SnapshotMetadata(data)
+        cases = {
+            "deepcopy": lambda: copy.deepcopy(data),
+            "snapshot": lambda: ScreenLogicSnapshot.capture(data, metadata),
+        }
+        print(filename)
+        for name, make in cases.items():
+            size = held_per_copy(make, args.count)
+            seconds = timeit.timeit(make, number=args.number) / args.number
+            print(f"{name:>10}: {size:9.0f} B/copy {seconds * 1_000_000:8.2f} us/copy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark for the latency of a full gateway update.
+
+Runs async_update against the fake protocol adapter from the tests, which answers
+each request after a fixed delay, once sending requests one at a time and once
+pipelined with several requests awaiting a response at once.
+
+Run from the repository root:
+
+    python -m benchmarks.update
+"""
+import argparse
+import asyncio
+from glob import glob
+import time
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.data import ScreenLogicResponseCollection
+
+from tests.adapter import FakeTCPProtocolAdapter, SLMessage
+from tests.conftest import load_response_collections
+
+
+class DelayedTCPProtocolAdapter(FakeTCPProtocolAdapter):
+    """Fake protocol adapter that answers every request after a delay."""
+
+    def __init__(self, responses: ScreenLogicResponseCollection, delay: float) -> None:
+        super().__init__(responses)
+        self.delay = delay
+
+    def process_message(self, msg: SLMessage) -> None:
+        asyncio.get_running_loop().call_later(self.delay, super().process_message, msg)
+
+
+async def time_updates(
+    responses: ScreenLogicResponseCollection,
+    delay: float,
+    max_in_flight: int,
+    number: int,
+) -> float:
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(
+        lambda: DelayedTCPProtocolAdapter(responses, delay), "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+    gateway = ScreenLogicGateway(max_in_flight=max_in_flight)
+    try:
+        await gateway.async_connect("127.0.0.1", port)
+        start = time.perf_counter()
+        for _ in range(number):
+            await gateway.async_update()
+        return (time.perf_counter() - start) / number
+    finally:
+        await gateway.async_disconnect()
+        server.close()
+        await server.wait_closed()
+
+
+async def run(args: argparse.Namespace) -> None:
+    collections = load_response_collections(
+        sorted(glob("slpy-*.json", root_dir="tests/data/"))
+    )
+
+    print(f"{len(collections)} fixtures, {args.delay * 1000:.0f} ms per request")
+    for filename, rc in collections:
+        print(f"{filename} ({len(rc.pumps or [])} pumps)")
+        for max_in_flight in (1, *args.max_in_flight):
+            seconds = await time_updates(rc, args.delay, max_in_flight, args.number)
+            print(f"{max_in_flight:>4} in flight: {seconds * 1000:8.1f} ms/update")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--max-in-flight", type=int, nargs="+", default=[2, 4, 8])
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,35 @@
 __version__ = "0.10.2"
 # flake8: noqa F401
-from screenlogicpy.gateway import ScreenLogicGateway
-from screenlogicpy.const.common import ScreenLogicError, ScreenLogicCommunicationError
-from screenlogicpy.discovery import async_discover
+
+# Avoids importing typing, which costs more than the rest of this module.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from screenlogicpy.gateway import ScreenLogicGateway
+    from screenlogicpy.const.common import (
+        ScreenLogicError,
+        ScreenLogicCommunicationError,
+    )
+    from screenlogicpy.discovery import async_discover
+
+# Names are imported from their modules on first access, so importing the package
+# for one of them does not load the others.
+_LAZY_IMPORTS = {
+    "ScreenLogicGateway": "screenlogicpy.gateway",
+    "ScreenLogicError": "screenlogicpy.const.common",
+    "ScreenLogicCommunicationError": "screenlogicpy.const.common",
+    "async_discover": "screenlogicpy.discovery",
+}
+
+
+def __getattr__(name: str):
+    if (module := _LAZY_IMPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted((*globals(), *_LAZY_IMPORTS))
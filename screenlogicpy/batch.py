@@ -0,0 +1,205 @@
+"""Send several write commands to a ScreenLogic protocol adapter as one batch."""
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import TYPE_CHECKING, Callable
+
+from .const.common import ScreenLogicCommunicationError, ScreenLogicError
+from .const.data import ATTR, DEVICE
+from .requests import (
+    async_request_pool_button_press,
+    async_request_pool_lights_command,
+    async_request_set_heat_mode,
+    async_request_set_heat_setpoint,
+)
+from .validation import DataValidation, DataValidationKey as DVK
+
+if TYPE_CHECKING:
+    from .gateway import ScreenLogicGateway
+
+# Seconds to wait between the commands of a batch.
+BATCH_PACING = 0.1
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchCommand:
+    """A queued write command."""
+
+    name: str
+    args: tuple
+    request: Callable = field(repr=False, compare=False)
+
+
+@dataclass
+class CommandResult:
+    """
+    Outcome of one command in a batch.
+
+    'latency' is the seconds from sending the command to its response, or None if
+    the command was not sent because an earlier command failed.
+    """
+
+    command: BatchCommand
+    latency: float | None = None
+    error: ScreenLogicCommunicationError | None = None
+
+    @property
+    def sent(self) -> bool:
+        return self.latency is not None and self.error is None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch and of the status refresh that followed it."""
+
+    commands: list[CommandResult]
+    refresh_latency: float | None = None
+
+    @property
+    def ok(self) -> bool:
+        return all(result.sent for result in self.commands)
+
+
+def data_validation(data: dict) -> DataValidation:
+    """Return a DataValidation with bounds taken from the gateway data."""
+    validation = DataValidation()
+    if circuits := data.get(DEVICE.CIRCUIT):
+        validation.update(DVK.CIRCUIT, set(circuits))
+    if bodies := data.get(DEVICE.BODY):
+        validation.update(DVK.BODY, set(bodies))
+        for index, body in bodies.items():
+            if ATTR.MIN_SETPOINT in body and ATTR.MAX_SETPOINT in body:
+                validation.update(
+                    (DVK.HEAT_TEMP, index),
+                    (body[ATTR.MIN_SETPOINT], body[ATTR.MAX_SETPOINT]),
+                )
+    return validation
+
+
+class CommandBatch:
+    """
+    Class for queueing write commands to send together.
+
+    Commands are validated as they are queued. A later command for the same circuit,
+    body setting or lights replaces the earlier one in its place in the queue. Sending
+    the batch sends each command in order, paced by 'pacing' seconds, then refreshes
+    the pool status once.
+
+    May be used as an async context manager, which sends the batch on exit unless an
+    exception was raised. The outcome is then available from 'result'.
+    """
+
+    def __init__(
+        self, gateway: "ScreenLogicGateway", pacing: float = BATCH_PACING
+    ) -> None:
+        self._gateway = gateway
+        self._pacing = pacing
+        self._validation = data_validation(gateway.get_data())
+        self._commands: dict[tuple, BatchCommand] = {}
+        self.result: BatchResult | None = None
+
+    @property
+    def commands(self) -> list[BatchCommand]:
+        return list(self._commands.values())
+
+    def set_circuit(self, circuitID: int, circuitState: int) -> "CommandBatch":
+        """Queue setting the circuit state for the specified circuit."""
+        self._validate(DVK.CIRCUIT, circuitID, "circuitID")
+        self._validate(DVK.ON_OFF, circuitState, "circuitState")
+        return self._queue(
+            ("circuit", circuitID),
+            "set_circuit",
+            (circuitID, circuitState),
+            async_request_pool_button_press,
+        )
+
+    def set_heat_temp(self, body: int, temp: int) -> "CommandBatch":
+        """Queue setting the target temperature for the specified body."""
+        self._validate(DVK.BODY, body, "body")
+        if not self._validation.is_valid((DVK.HEAT_TEMP, body), temp):
+            raise ValueError(f"Invalid temp ({temp}) for body ({body})")
+        return self._queue(
+            ("heat_temp", body),
+            "set_heat_temp",
+            (body, temp),
+            async_request_set_heat_setpoint,
+        )
+
+    def set_heat_mode(self, body: int, mode: int) -> "CommandBatch":
+        """Queue setting the heating mode for the specified body."""
+        self._validate(DVK.BODY, body, "body")
+        self._validate(DVK.HEAT_MODE, mode, "mode")
+        return self._queue(
+            ("heat_mode", body),
+            "set_heat_mode",
+            (body, mode),
+            async_request_set_heat_mode,
+        )
+
+    def set_color_lights(self, light_command: int) -> "CommandBatch":
+        """Queue setting the light show mode for all capable lights."""
+        self._validate(DVK.COLOR_MODE, light_command, "light_command")
+        return self._queue(
+            ("color_lights",),
+            "set_color_lights",
+            (light_command,),
+            async_request_pool_lights_command,
+        )
+
+    async def async_send(self) -> BatchResult:
+        """
+        Send the queued commands, then refresh the pool status.
+
+        If a command fails, the remaining commands are not sent. The status is still
+        refreshed if any command was sent.
+        """
+        if self.result is not None:
+            raise ScreenLogicError("Batch already sent")
+        results = [CommandResult(command) for command in self._commands.values()]
+        self.result = BatchResult(results)
+
+        for position, result in enumerate(results):
+            if position and self._pacing:
+                await asyncio.sleep(self._pacing)
+            command = result.command
+            _LOGGER.debug("Sending batched %s%s", command.name, command.args)
+            start = time.perf_counter()
+            try:
+                await self._gateway._async_connected_request(
+                    command.request, *command.args
+                )
+            except ScreenLogicCommunicationError as ex:
+                result.error = ex
+                _LOGGER.debug("Batched %s failed: %s", command.name, ex)
+                break
+            finally:
+                result.latency = time.perf_counter() - start
+
+        if any(result.sent for result in results):
+            start = time.perf_counter()
+            await self._gateway.async_get_status()
+            self.result.refresh_latency = time.perf_counter() - start
+        return self.result
+
+    async def __aenter__(self) -> "CommandBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.async_send()
+
+    def _validate(self, key: str, value, name: str) -> None:
+        if not self._validation.is_valid(key, value):
+            raise ValueError(f"Invalid {name}: {value}")
+
+    def _queue(
+        self, target: tuple, name: str, args: tuple, request: Callable
+    ) -> "CommandBatch":
+        if self.result is not None:
+            raise ScreenLogicError("Batch already sent")
+        self._commands[target] = BatchCommand(name, args, request)
+        return self
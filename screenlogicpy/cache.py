@@ -0,0 +1,91 @@
+"""Store ScreenLogic configuration responses on disk between runs."""
+
+from dataclasses import asdict
+import os
+import re
+
+from .const.common import DATA_REQUEST, ScreenLogicError
+from .data import (
+    build_response_collection,
+    import_response_collection,
+    write_sl_data_json,
+)
+
+# Requests whose responses are cached.
+CACHED_REQUESTS = (DATA_REQUEST.VERSION, DATA_REQUEST.CONFIG)
+
+# Upper bound of the random delay before a configuration loaded from the cache is
+# refreshed from the protocol adapter, so many gateways started at once do not all
+# request it at the same moment.
+CONFIG_CACHE_REFRESH_JITTER = 30.0
+
+
+class ConfigCache:
+    """
+    Class for storing the version and configuration responses of protocol adapters.
+
+    Each protocol adapter's responses are stored in 'directory' as a response
+    collection JSON file, named for its MAC address and firmware version. A firmware
+    update therefore never loads a configuration stored by the old firmware.
+
+    A gateway that loads its configuration from the cache refreshes it from the
+    protocol adapter after a random delay of up to 'refresh_jitter' seconds.
+    """
+
+    def __init__(
+        self, directory: str, refresh_jitter: float = CONFIG_CACHE_REFRESH_JITTER
+    ) -> None:
+        self._directory = directory
+        self._refresh_jitter = refresh_jitter
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def refresh_jitter(self) -> float:
+        return self._refresh_jitter
+
+    def path(self, mac: str, firmware: str) -> str:
+        """Return the file path for a protocol adapter's responses."""
+        name = re.sub(r"[^0-9A-Za-z.]+", "_", f"{mac}_{firmware}").strip("_")
+        return os.path.join(self._directory, f"slpy-config-{name}.json")
+
+    def load(self, mac: str, firmware: str) -> dict[str, bytes] | None:
+        """Return the cached raw responses, or None if none are cached."""
+        path = self.path(mac, firmware)
+        try:
+            collection = import_response_collection(path)
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError, SyntaxError, ScreenLogicError):
+            # Unreadable, or written in a newer format. It is replaced on save.
+            return None
+        raw = {
+            request: getattr(collection, request).raw
+            for request in CACHED_REQUESTS
+            if getattr(collection, request) is not None
+        }
+        return raw if len(raw) == len(CACHED_REQUESTS) else None
+
+    def save(self, mac: str, firmware: str, raw: dict[str, bytes]) -> None:
+        """
+        Store the raw responses, replacing any stored before.
+
+        Responses in 'raw' to requests that are not cached are ignored.
+        """
+        os.makedirs(self._directory, exist_ok=True)
+        path = self.path(mac, firmware)
+        collection = build_response_collection(
+            {request: raw[request] for request in CACHED_REQUESTS}, {}
+        )
+        temp_path = f"{path}.tmp"
+        write_sl_data_json(temp_path, asdict(collection))
+        os.replace(temp_path, path)
+
+    def remove(self, mac: str, firmware: str) -> None:
+        """Remove a protocol adapter's cached responses."""
+        try:
+            os.remove(self.path(mac, firmware))
+        except FileNotFoundError:
+            pass
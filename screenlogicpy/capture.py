@@ -0,0 +1,263 @@
+"""Record and replay the messages exchanged with a ScreenLogic protocol adapter."""
+
+import asyncio
+from collections import deque
+import logging
+import struct
+import threading
+import time
+from typing import BinaryIO, Iterable, Iterator, NamedTuple
+
+from .const.common import DATA_REQUEST, ScreenLogicError
+from .const.msg import CODE
+
+# Written at the start of every capture file.
+CAPTURE_MAGIC = b"SLPYCAP1"
+
+# Timestamp, direction, message ID, message code and payload length of a record,
+# which is followed by the payload itself.
+RECORD_HEADER = struct.Struct("<dBHHI")
+
+# Record directions.
+SENT = 0
+RECEIVED = 1
+
+_LOGGER = logging.getLogger(__name__)
+
+# Message codes whose payload decodes into data, and the data request they are for.
+CAPTURE_DECODE_REQUESTS = {
+    CODE.VERSION_QUERY + 1: DATA_REQUEST.VERSION,
+    CODE.CTRLCONFIG_QUERY + 1: DATA_REQUEST.CONFIG,
+    CODE.POOLSTATUS_QUERY + 1: DATA_REQUEST.STATUS,
+    CODE.STATUS_CHANGED: DATA_REQUEST.STATUS,
+    CODE.PUMPSTATUS_QUERY + 1: DATA_REQUEST.PUMPS,
+    CODE.CHEMISTRY_QUERY + 1: DATA_REQUEST.CHEMISTRY,
+    CODE.CHEMISTRY_CHANGED: DATA_REQUEST.CHEMISTRY,
+    CODE.SCGCONFIG_QUERY + 1: DATA_REQUEST.SCG,
+    CODE.COLOR_UPDATE: DATA_REQUEST.KEY_COLOR,
+    CODE.GET_DATETIME_QUERY + 1: DATA_REQUEST.DATE_TIME,
+}
+
+
+class CaptureRecord(NamedTuple):
+    timestamp: float
+    direction: int
+    msgID: int
+    msgCode: int
+    payload: bytes
+
+
+class CaptureWriter:
+    """
+    Class for writing messages to a capture file.
+
+    'file' is a path, which is appended to, or a binary file object. Set as the
+    'capture' of a ScreenLogicProtocol or ScreenLogicGateway to record every
+    message sent and received on its connection.
+
+    Created or recorded from a running event loop, the file is opened and records
+    are written in the loop's default executor, so disk I/O does not block the
+    loop. Records made while a write is in progress are written together by the
+    next one. Use async_close() there to wait for them. Records made after the
+    capture is closed are dropped.
+    """
+
+    def __init__(self, file: str | BinaryIO) -> None:
+        if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+            self._path = file
+            self._file: BinaryIO | None = None
+            self._owns_file = True
+        else:
+            self._path = None
+            self._file = file
+            self._owns_file = False
+        self._opened = False
+        self._closed = False
+        self._records = 0
+        self._pending: deque[bytes] = deque()
+        self._lock = threading.Lock()
+        self._writing: asyncio.Future | None = None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_pending()
+        else:
+            self._start_write(loop)
+
+    def __enter__(self) -> "CaptureWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def records(self) -> int:
+        """Number of records written."""
+        return self._records
+
+    def record(
+        self,
+        direction: int,
+        msgID: int,
+        msgCode: int,
+        payload: bytes = b"",
+        timestamp: float = None,
+    ) -> None:
+        """Write one message."""
+        if self._closed:
+            return
+        self._pending.append(
+            RECORD_HEADER.pack(
+                time.time() if timestamp is None else timestamp,
+                direction,
+                msgID,
+                msgCode,
+                len(payload),
+            )
+            + payload
+        )
+        self._records += 1
+        if self._writing is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_pending()
+            return
+        self._start_write(loop)
+
+    def _start_write(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._writing = loop.run_in_executor(None, self._write_pending)
+        self._writing.add_done_callback(self._written)
+
+    def _write_pending(self) -> None:
+        """
+        Write the records waiting to be written, opening the file first if needed.
+
+        Does nothing once the capture is closed. Blocks on file I/O.
+        """
+        with self._lock:
+            if self._closed:
+                self._pending.clear()
+                return
+            if not self._opened:
+                if self._file is None:
+                    self._file = open(self._path, "ab")
+                if self._file.tell() == 0:
+                    self._file.write(CAPTURE_MAGIC)
+                self._opened = True
+            chunks = []
+            while self._pending:
+                chunks.append(self._pending.popleft())
+            if chunks:
+                self._file.write(b"".join(chunks))
+
+    def _written(self, job: asyncio.Future) -> None:
+        self._writing = None
+        if not job.cancelled() and (ex := job.exception()) is not None:
+            _LOGGER.error(f"Error writing capture: {ex}")
+        if self._pending and not self._closed:
+            self._start_write(asyncio.get_running_loop())
+
+    def flush(self) -> None:
+        """Write the records waiting to be written and flush the file."""
+        self._write_pending()
+        with self._lock:
+            if not self._closed:
+                self._file.flush()
+
+    def close(self) -> None:
+        """Flush the capture, closing the file if it was opened from a path."""
+        self.flush()
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._owns_file:
+                self._file.close()
+
+    async def async_close(self) -> None:
+        """
+        Wait for the writes in progress, then close the capture in the event loop's
+        default executor.
+        """
+        while (writing := self._writing) is not None:
+            await asyncio.wait((writing,))
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+def read_capture(file: str | BinaryIO) -> Iterator[CaptureRecord]:
+    """
+    Yield the records of a capture file.
+
+    A record cut short at the end of the file, as left by a process that stopped
+    while writing, is ignored.
+    """
+    if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+        with open(file, "rb") as fp:
+            yield from read_capture(fp)
+        return
+
+    if file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+        raise ScreenLogicError("Not a screenlogicpy capture file")
+    header_size = RECORD_HEADER.size
+    while len(header := file.read(header_size)) == header_size:
+        timestamp, direction, msgID, msgCode, length = RECORD_HEADER.unpack(header)
+        payload = file.read(length)
+        if len(payload) < length:
+            return
+        yield CaptureRecord(timestamp, direction, msgID, msgCode, payload)
+
+
+def replay_capture(
+    records: Iterable[CaptureRecord], data: dict = None
+) -> Iterator[tuple[CaptureRecord, str, int | None]]:
+    """
+    Decode received records into 'data' in capture order.
+
+    Yields each record that was decoded with the data request it updated and, for
+    pump status, the pump index, so data can be inspected after every message.
+    """
+    from .data import REQUEST_DECODE_FUNCS
+
+    data = {} if data is None else data
+    pump_requests: dict[int, int] = {}
+    for record in records:
+        if record.direction == SENT:
+            if record.msgCode == CODE.PUMPSTATUS_QUERY:
+                _, pump_requests[record.msgID] = struct.unpack_from(
+                    "<II", record.payload
+                )
+            continue
+        if (request := CAPTURE_DECODE_REQUESTS.get(record.msgCode)) is None:
+            continue
+        if request == DATA_REQUEST.PUMPS:
+            if (index := pump_requests.pop(record.msgID, None)) is None:
+                continue
+            REQUEST_DECODE_FUNCS[request](record.payload, data, index)
+        else:
+            index = None
+            REQUEST_DECODE_FUNCS[request](record.payload, data)
+        yield record, request, index
+
+
+def capture_response_collection(records: Iterable[CaptureRecord]):
+    """
+    Return a ScreenLogicResponseCollection of the last response to each request.
+
+    Pushed status and chemistry messages count as responses. The collection can be
+    exported as a test fixture or served by a fake protocol adapter.
+    """
+    from .data import build_response_collection
+
+    data = {}
+    raw = {}
+    for record, request, index in replay_capture(records, data):
+        if request == DATA_REQUEST.PUMPS:
+            raw.setdefault(request, {})[index] = record.payload
+        elif request != DATA_REQUEST.KEY_COLOR:
+            # Color updates are pushed for light shows, not requested.
+            raw[request] = record.payload
+    if pumps := raw.get(DATA_REQUEST.PUMPS):
+        raw[DATA_REQUEST.PUMPS] = dict(sorted(pumps.items()))
+    return build_response_collection(raw, data)
@@ -6,7 +6,7 @@ import logging
 import string
 
 from screenlogicpy import __version__
-from screenlogicpy.discovery import async_discover
+from screenlogicpy.discovery import DISCOVERY_CACHE_TTL, async_discover
 from screenlogicpy.gateway import ScreenLogicGateway
 from screenlogicpy.const.common import (
     ON_OFF,
@@ -639,8 +639,12 @@ async def cli(cli_args):
         host = {SL_GATEWAY_IP: args.ip, SL_GATEWAY_PORT: args.port}
         discovered = False
         if not host[SL_GATEWAY_IP]:
-            # Try to discover gateway
-            hosts = await async_discover()
+            # Try to discover gateway. Other commands use the first one to answer,
+            # which may have answered an earlier discovery.
+            if args.action == "discover":
+                hosts = await async_discover()
+            else:
+                hosts = await async_discover(1, max_age=DISCOVERY_CACHE_TTL)
             # Host(s) found
             if len(hosts) > 0:
                 discovered = True
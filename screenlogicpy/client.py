@@ -2,25 +2,23 @@
 import asyncio
 import logging
 import random
-from typing import Any, Awaitable, Callable
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from .const.common import COM_KEEPALIVE, ScreenLogicCommunicationError
 from .const.msg import (
     CODE,
     COM_MAX_RETRIES,
 )
-from .requests import (
-    async_request_add_client,
-    async_request_ping,
-    async_request_remove_client,
-)
-from .requests.chemistry import decode_chemistry
-from .requests.lights import decode_color_update
-from .requests.status import decode_pool_status
-from .requests.protocol import ScreenLogicProtocol
+from .diff import ChangeSink, DataChange
+
+if TYPE_CHECKING:
+    from .requests.protocol import ScreenLogicProtocol
 
 _LOGGER = logging.getLogger(__name__)
 
+# Message codes decoded into the data, whose decoders record what they change.
+DECODED_CODES = (CODE.STATUS_CHANGED, CODE.CHEMISTRY_CHANGED, CODE.COLOR_UPDATE)
+
 
 class ClientManager:
     """Class to manage callback subscriptions to specific ScreenLogic messages."""
@@ -29,12 +27,17 @@ class ClientManager:
         self,
         async_request_manager: Callable[[bytes, Any], Awaitable[Any]],
         client_id: int = None,
+        is_changed: Callable[[int, bytes], bool] = None,
+        updated: Callable[[int], None] = None,
     ) -> None:
         self._async_managed_request = async_request_manager
+        self._is_changed = is_changed
+        self._updated = updated
         self._client_id = (
             client_id if client_id is not None else random.randint(32767, 65535)
         )
         self._listeners = {}
+        self._change_listeners = {}
         self._is_client = False
         self._client_sub_unsub_lock = asyncio.Lock()
         self._protocol = None
@@ -60,7 +63,7 @@ class ClientManager:
 
     async def attach(
         self,
-        protocol: ScreenLogicProtocol,
+        protocol: "ScreenLogicProtocol",
         data: dict,
         max_retries: int = COM_MAX_RETRIES,
     ):
@@ -83,31 +86,63 @@ class ClientManager:
                 )
             await self.async_subscribe_gateway()
 
-    def _notify_listeners(self, code: int) -> None:
-        """Notify all listeners."""
+    def _notify_listeners(self, code: int, changes: list[DataChange] = None) -> None:
+        """
+        Notify all listeners.
+
+        Listeners that subscribed with changes are only called if there are changes.
+        """
+        change_listeners = self._change_listeners.get(code, ())
         for callback in self._listeners.get(code):
-            callback()
+            if callback not in change_listeners:
+                callback()
+            elif changes:
+                callback(changes)
 
     def _callback_factory(self, code) -> Callable:
         """Return decoding method for known message codes."""
         if code == CODE.STATUS_CHANGED:
+            from .requests.status import decode_pool_status
+
             return decode_pool_status
         elif code == CODE.CHEMISTRY_CHANGED:
+            from .requests.chemistry import decode_chemistry
+
             return decode_chemistry
         elif code == CODE.COLOR_UPDATE:
+            from .requests.lights import decode_color_update
+
             return decode_color_update
         else:
             return None
 
     async def _async_common_callback(self, message, code, data):
-        """Decode known incoming messages."""
-        if decoder := self._callback_factory(code):
-            decoder(message, data)
+        """
+        Decode known incoming messages.
+
+        Messages reported as unchanged by 'is_changed' are not decoded again.
+        Listeners are notified either way, after 'updated' is called with the code
+        of each known message.
+        """
+        changes = None
+        if (decoder := self._callback_factory(code)) and (
+            self._is_changed is None or self._is_changed(code, message)
+        ):
+            from .metrics import timed_decode
+
+            metrics = self._protocol.metrics if self._protocol else None
+            if self._change_listeners.get(code):
+                changes = []
+                timed_decode(metrics, decoder, message, data, ChangeSink(changes))
+            else:
+                timed_decode(metrics, decoder, message, data)
+        if decoder and self._updated is not None:
+            self._updated(code)
 
-        self._notify_listeners(code)
+        self._notify_listeners(code, changes)
 
     async def async_subscribe(
-        self, callback: Callable[..., any], code: int
+        self, callback: Callable[..., any], code: int, with_changes: bool = False
     ) -> Callable:
         """
         Register listener callback.
@@ -115,6 +150,9 @@ class ClientManager:
         Registers a callback method to call when a message with the specified
         message code is received. Messages with known codes will be processed
         and applied to gateway data before callback method is called.
+
+        If 'with_changes' is True, the callback is passed a list of DataChange for
+        the values the message changed, and is not called when nothing changed.
         """
         if not self._attached():
             return None
@@ -123,6 +161,8 @@ class ClientManager:
         code_listeners: set = self._listeners.setdefault(code, set())
 
         code_listeners.add(callback)
+        if with_changes:
+            self._change_listeners.setdefault(code, set()).add(callback)
 
         if self._attached():
             self._protocol.register_async_message_callback(
@@ -138,6 +178,10 @@ class ClientManager:
             if callback in code_listeners:
                 _LOGGER.debug(f"Removing listener {callback}")
                 code_listeners.remove(callback)
+                if (change_listeners := self._change_listeners.get(code)) is not None:
+                    change_listeners.discard(callback)
+                    if not change_listeners:
+                        self._change_listeners.pop(code)
                 if not code_listeners:
                     _LOGGER.debug(f"No more listeners for code {code}. Removing.")
                     if code in self._listeners:
@@ -158,6 +202,8 @@ class ClientManager:
 
         This is an unmanaged request. Failure here will only be logged.
         """
+        from .requests.ping import async_request_ping
+
         _LOGGER.debug("Requesting ping")
         try:
             if await async_request_ping(self._protocol, max_retries=0):
@@ -167,11 +213,15 @@ class ClientManager:
 
     async def _async_add_client(self):
         """Send a managed add client request."""
+        from .requests.client import async_request_add_client
+
         _LOGGER.debug("Requesting add client")
         await self._async_managed_request(async_request_add_client, self._client_id)
 
     async def _async_remove_client(self):
         """Send a unmanaged remove client request."""
+        from .requests.client import async_request_remove_client
+
         _LOGGER.debug("Requesting remove client")
         try:
             await async_request_remove_client(
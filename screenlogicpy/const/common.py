@@ -130,6 +130,15 @@ class DATA_REQUEST:
     VERSION = "version"
 
 
+class OVERFLOW:
+    """What an update stream does with a new update when its queue is full."""
+
+    # Discard the oldest update.
+    DROP_OLDEST = "drop_oldest"
+    # Keep one update per message code, merging each new update into it.
+    COALESCE_LATEST = "coalesce_latest"
+
+
 class RANGE:
     MIN = 0
     MAX = 1
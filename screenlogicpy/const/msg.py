@@ -1,8 +1,20 @@
 import struct
 
+COM_MAX_IN_FLIGHT = 1
 COM_MAX_RETRIES = 1
 COM_RETRY_WAIT = 1
 COM_TIMEOUT = 2
+# Bounds for timeouts and retry delays derived from measured round trip times
+COM_MIN_TIMEOUT = 0.5
+COM_MAX_TIMEOUT = 10
+COM_RETRY_BASE_WAIT = 0.25
+COM_MAX_RETRY_WAIT = 4
+# Seconds the protocol adapter is given to take the connect ping on its own
+COM_CONNECT_SETTLE = 0.25
+# Unsolicited messages of one code waiting for their handler.
+COM_PUSH_DEPTH = 16
+# Pushed updates an update stream holds for a consumer that has not caught up.
+UPDATE_QUEUE_SIZE = 64
 HEADER_FORMAT = "<HHI"
 HEADER_LENGTH = struct.calcsize(HEADER_FORMAT)
 
@@ -1,8 +1,9 @@
+import ast
 from dataclasses import asdict, dataclass
 import json
 from typing import Any
 
-from .const.common import DATA_REQUEST
+from .const.common import DATA_REQUEST, ScreenLogicError
 from .requests.chemistry import decode_chemistry
 from .requests.config import decode_pool_config
 from .requests.datetime import decode_date_time
@@ -83,61 +84,90 @@ def deconstruct_response_collection(
 
 
 T_KEY = "__type"
+FORMAT_KEY = "__format"
 
-
-def int_key_json_decoder(o: dict) -> Any:
-    if isinstance(o, dict):
-        strkeys = []
-        for key in o.keys():
-            if isinstance(key, str):
-                if key.isdigit():
-                    strkeys.append(key)
-        for strkey in strkeys:
-            o[int(strkey)] = o.pop(strkey)
-    return o
+# Version of the JSON format written by write_sl_data_json. Format 1 files, which
+# have no FORMAT_KEY, store bytes as their repr(). Format 2 stores them as hex.
+SL_DATA_FORMAT = 2
 
 
-# Patch for color RGB tuples
-def value_list_json_decoder(o: dict) -> Any:
-    if "value" in o:
-        value = o["value"]
-        if isinstance(value, list) and len(value) == 3:
-            o["value"] = tuple(value)
-    return int_key_json_decoder(o)
+def bytes_json_decoder(o: dict) -> bytes:
+    if "hex" in o:
+        return bytes.fromhex(o["hex"])
+    # Format 1. literal_eval only accepts literals, so a file can not run code.
+    value = ast.literal_eval(o["repr"])
+    if not isinstance(value, bytes):
+        raise ValueError(f"Expected a bytes literal, got {o['repr']!r}")
+    return value
 
 
-def response_set_json_decoder(o: dict) -> Any:
+def sl_data_object_hook(o: dict) -> Any:
+    """Build an object of a screenlogicpy JSON file as it is parsed."""
+    for key in o:
+        if key.isdigit():
+            o = {int(key) if key.isdigit() else key: value for key, value in o.items()}
+            break
+    if T_KEY in o:
+        return bytes_json_decoder(o)
     if "decoded" in o and "raw" in o:
         return ScreenLogicResponseSet(**o)
-    return value_list_json_decoder(o)
+    # Patch for color RGB tuples
+    if isinstance(value := o.get("value"), list) and len(value) == 3:
+        o["value"] = tuple(value)
+    return o
 
 
-def bytes_json_decoder(o: dict) -> Any:
-    if T_KEY in o:
-        return eval(o["repr"])
-    return response_set_json_decoder(o)
+def _format_header() -> str:
+    return f"{{{json.dumps(FORMAT_KEY)}: {SL_DATA_FORMAT}"
 
 
 def read_sl_data_json(filename: str) -> dict:
+    """
+    Read a screenlogicpy JSON file.
+
+    Format 2 files are parsed one line, and so one response, at a time. Other files
+    are parsed whole.
+    """
     with open(filename, "r", encoding="utf-8") as fp:
-        return json.load(fp, object_hook=bytes_json_decoder)
+        first = fp.readline()
+        if first.rstrip().removesuffix(",") == _format_header():
+            data = {FORMAT_KEY: SL_DATA_FORMAT}
+            for line in fp:
+                if (line := line.rstrip().removesuffix(",")) == "}":
+                    break
+                data.update(
+                    json.loads(f"{{{line}}}", object_hook=sl_data_object_hook)
+                )
+        else:
+            data = json.loads(first + fp.read(), object_hook=sl_data_object_hook)
+    if (file_format := data.pop(FORMAT_KEY, 1)) > SL_DATA_FORMAT:
+        raise ScreenLogicError(
+            f"{filename} has data format {file_format}, newer than supported"
+        )
+    return data
 
 
 def bytes_json_encoder(o: Any) -> Any:
     if isinstance(o, bytes):
-        return {T_KEY: repr(type(o)), "repr": repr(o)}
+        return {T_KEY: "bytes", "hex": o.hex()}
     return o
 
 
 def write_sl_data_json(filename: str, data: dict) -> None:
+    """
+    Write 'data' as a format 2 screenlogicpy JSON file.
+
+    The file is a single JSON object with each top level entry on its own line, so
+    read_sl_data_json() can parse it one entry at a time.
+    """
     with open(filename, "w", encoding="utf-8") as fp:
-        json.dump(
-            data,
-            fp,
-            default=bytes_json_encoder,
-            ensure_ascii=False,
-            indent=2,
-        )
+        fp.write(_format_header())
+        for key, value in data.items():
+            entry = json.dumps(
+                {key: value}, default=bytes_json_encoder, ensure_ascii=False
+            )
+            fp.write(f",\n{entry[1:-1]}")
+        fp.write("\n}\n")
 
 
 def import_response_collection(filename: str) -> ScreenLogicResponseCollection:
@@ -0,0 +1,115 @@
+"""Field-level differences between two states of ScreenLogic gateway data."""
+
+from typing import Any, NamedTuple
+
+
+class DataChange(NamedTuple):
+    """
+    A changed value in the gateway data.
+
+    'path' is the full key path, as accepted by ScreenLogicGateway.get_data(). 'old'
+    is None for added values and 'new' is None for removed ones.
+    """
+
+    path: tuple
+    old: Any
+    new: Any
+
+
+def flatten_data(data: dict, keypaths: tuple[tuple, ...] = ((),)) -> dict[tuple, Any]:
+    """
+    Return the values under each of 'keypaths' keyed by their full key path.
+
+    Nested dicts are walked. Any other value, including lists and tuples, is
+    treated as a single value.
+    """
+    flat = {}
+    for keypath in keypaths:
+        current = data
+        for key in keypath:
+            if not isinstance(current, dict) or (current := current.get(key)) is None:
+                break
+        else:
+            _flatten_into(flat, current, keypath)
+    return flat
+
+
+def _flatten_into(flat: dict, value: Any, path: tuple) -> None:
+    if isinstance(value, dict):
+        for key, child in value.items():
+            _flatten_into(flat, child, (*path, key))
+    else:
+        flat[path] = value
+
+
+def diff_data(old: dict[tuple, Any], new: dict[tuple, Any]) -> list[DataChange]:
+    """
+    Return the changes between two flattened states of the gateway data.
+
+    Changes are listed in the key order of 'new', followed by removed values.
+    """
+    changes = [
+        DataChange(path, old.get(path), value)
+        for path, value in new.items()
+        if path not in old or old[path] != value
+    ]
+    changes.extend(
+        DataChange(path, value, None) for path, value in old.items() if path not in new
+    )
+    return changes
+
+
+# Stands for a value that was not in the data before it was written.
+_MISSING = object()
+
+
+class ChangeSink:
+    """
+    Records a DataChange for each value a decoder writes below 'path'.
+
+    Decoders given a sink write through set(), and setValue() reports the values
+    it writes, so the changes a message made are known without flattening and
+    comparing the data before and after decoding. Nothing is recorded if
+    'changes' is None.
+    """
+
+    __slots__ = ("changes", "path")
+
+    def __init__(self, changes: list[DataChange] | None = None, path: tuple = ()):
+        self.changes = changes
+        self.path = path
+
+    def at(self, *keys) -> "ChangeSink":
+        """Return a sink for the values below 'keys' of this sink's path."""
+        if self.changes is None:
+            return self
+        return ChangeSink(self.changes, (*self.path, *keys))
+
+    def set(self, parent: dict, key, value) -> None:
+        """Set parent[key] to 'value', recording the values it changed."""
+        if self.changes is not None:
+            self.record(key, parent.get(key, _MISSING), value)
+        parent[key] = value
+
+    def record(self, key, old, new) -> None:
+        """
+        Record the change of the value at 'key' from 'old' to 'new'.
+
+        Dicts are compared value by value. 'old' is _MISSING for an added value.
+        """
+        if self.changes is None:
+            return
+        path = (*self.path, key)
+        if isinstance(old, dict) or isinstance(new, dict):
+            before, after = {}, {}
+            if old is not _MISSING:
+                _flatten_into(before, old, path)
+            _flatten_into(after, new, path)
+            self.changes.extend(diff_data(before, after))
+        elif old is _MISSING:
+            self.changes.append(DataChange(path, None, new))
+        elif old != new:
+            self.changes.append(DataChange(path, old, new))
+
+# Sink for decoding without recording changes.
+NO_CHANGES = ChangeSink()
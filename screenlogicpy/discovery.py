@@ -1,8 +1,10 @@
 """Discovery for screenlogic gateways."""
 import asyncio
 import logging
+import re
 import socket
 import struct
+import time
 
 from .const.common import (  # pylint: disable=relative-beyond-top-level
     SL_GATEWAY_IP,
@@ -21,6 +23,12 @@ DISCOVERY_ADDRESS = "255.255.255.255"
 DISCOVERY_PORT = 1444
 DISCOVERY_CHKSUM = 2
 DISCOVERY_TIMEOUT = 1
+# Seconds discovered gateways are remembered for 'max_age' lookups.
+DISCOVERY_CACHE_TTL = 300
+# Seconds between discoveries of a running DiscoveryService.
+DISCOVERY_INTERVAL = 300
+# Interface request for the broadcast address on Linux.
+SIOCGIFBRDADDR = 0x8919
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +42,44 @@ def create_broadcast_socket():
     return udp_sock
 
 
+def get_broadcast_addresses() -> list[str]:
+    """
+    Return the addresses to send discovery broadcasts to.
+
+    Includes the directed broadcast address of each IPv4 interface, where the
+    platform can list them, so every network of a multi-homed host is searched,
+    followed by the limited broadcast address.
+    """
+    addresses = []
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    if fcntl is not None and hasattr(socket, "if_nameindex"):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for _, name in socket.if_nameindex():
+                try:
+                    request = struct.pack("256s", name.encode()[:15])
+                    result = fcntl.ioctl(sock.fileno(), SIOCGIFBRDADDR, request)
+                except OSError:
+                    continue
+                address = socket.inet_ntoa(result[20:24])
+                if address != "0.0.0.0" and address not in addresses:
+                    addresses.append(address)
+    addresses.append(DISCOVERY_ADDRESS)
+    return addresses
+
+
+def gateway_name_matches_mac(name: str, mac: str) -> bool:
+    """
+    Return if a gateway name is that of the protocol adapter with MAC address 'mac'.
+
+    Protocol adapters name themselves for the last three bytes of their MAC
+    address, such as 'Pentair: AB-CD-EF'. 'mac' may be colon or dash separated.
+    """
+    return name.upper().endswith("-".join(re.split("[:-]", mac.upper())[-3:]))
+
+
 def process_discovery_response(data):
     """Process a discovery response."""
 
@@ -71,10 +117,13 @@ def process_discovery_response(data):
 class ScreenLogicDiscoveryProtocol:
     """Implement ScreenLogic discovery protocol."""
 
-    def __init__(self):
+    def __init__(self, expected: int = None, mac: str = None):
         """Init protocol."""
         self.transport = None
         self.hosts = []
+        self._expected = expected
+        self._mac = mac
+        self.done = asyncio.Event()
 
     def connection_lost(self, _):
         """Connection lost."""
@@ -86,25 +135,201 @@ class ScreenLogicDiscoveryProtocol:
     def datagram_received(self, data, _):
         """Response recieved."""
         try:
-            self.hosts.append(process_discovery_response(data))
+            host = process_discovery_response(data)
         except Exception as ex:  # pylint: disable=broad-except
             _LOGGER.warning(ex)
+            return
+        # A gateway answers each broadcast address that reaches it.
+        if host in self.hosts:
+            return
+        self.hosts.append(host)
+        if (self._expected is not None and len(self.hosts) >= self._expected) or (
+            self._mac is not None
+            and gateway_name_matches_mac(host[SL_GATEWAY_NAME], self._mac)
+        ):
+            self.done.set()
 
     def error_received(self, exc):
         """Error received."""
+        _LOGGER.debug("Discovery error: %s", exc)
+
+
+class DiscoveryCache:
+    """Gateways found by discovery, with the time each last answered."""
+
+    def __init__(self) -> None:
+        self._hosts: dict[str, tuple[float, dict]] = {}
+
+    def update(self, hosts: list[dict]) -> None:
+        now = time.monotonic()
+        for host in hosts:
+            self._hosts[host[SL_GATEWAY_NAME]] = (now, host)
+
+    def get(self, max_age: float) -> list[dict]:
+        """Return the gateways that answered within the last 'max_age' seconds."""
+        oldest = time.monotonic() - max_age
+        return [dict(host) for seen, host in self._hosts.values() if seen >= oldest]
+
+    def clear(self) -> None:
+        self._hosts.clear()
+
+
+DISCOVERY_CACHE = DiscoveryCache()
+
+
+async def async_discover(
+    expected: int = None,
+    mac: str = None,
+    timeout: float = DISCOVERY_TIMEOUT,
+    max_age: float = 0,
+    addresses: list[str] = None,
+) -> list[dict]:
+    """
+    Discover screenlogic gateways.
+
+    Broadcasts to every address of get_broadcast_addresses(), or 'addresses', and
+    collects answers for up to 'timeout' seconds. Returns as soon as 'expected'
+    gateways, or the gateway with MAC address 'mac', have answered.
 
+    Gateways that answered an earlier discovery within 'max_age' seconds are returned
+    without broadcasting if they satisfy 'expected' or 'mac'.
+    """
+    if max_age > 0 and (expected is not None or mac is not None):
+        cached = DISCOVERY_CACHE.get(min(max_age, DISCOVERY_CACHE_TTL))
+        if mac is not None:
+            if matches := [
+                host
+                for host in cached
+                if gateway_name_matches_mac(host[SL_GATEWAY_NAME], mac)
+            ]:
+                return matches
+        elif len(cached) >= expected:
+            return cached
 
-async def async_discover():
-    """Discover screenlogic gateways."""
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     udp_sock = create_broadcast_socket()
     transport, protocol = await loop.create_datagram_endpoint(
-        lambda: ScreenLogicDiscoveryProtocol(),  # pylint: disable=unnecessary-lambda
+        lambda: ScreenLogicDiscoveryProtocol(expected, mac),
         sock=udp_sock,
     )
     try:
-        transport.sendto(DISCOVERY_PAYLOAD, (DISCOVERY_ADDRESS, DISCOVERY_PORT))
-        await asyncio.sleep(DISCOVERY_TIMEOUT)
+        for address in addresses or get_broadcast_addresses():
+            transport.sendto(DISCOVERY_PAYLOAD, (address, DISCOVERY_PORT))
+        try:
+            await asyncio.wait_for(protocol.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
     finally:
         transport.close()
+    DISCOVERY_CACHE.update(protocol.hosts)
     return protocol.hosts
+
+
+class DiscoveryService:
+    """
+    Class for keeping the addresses of protocol adapters current.
+
+    Runs discovery every 'interval' seconds once started, and on demand, keeping
+    the address each protocol adapter last answered from. Discovery responses do
+    not include the MAC address, so protocol adapters are resolved by MAC address
+    through the name they derive from it.
+
+    Given to a gateway, the gateway connects to the address its protocol adapter
+    last answered from, and runs a discovery for it when a connection fails.
+    """
+
+    def __init__(
+        self,
+        interval: float = DISCOVERY_INTERVAL,
+        timeout: float = DISCOVERY_TIMEOUT,
+        addresses: list[str] = None,
+    ) -> None:
+        self._interval = interval
+        self._timeout = timeout
+        self._addresses = addresses
+        self._hosts: dict[str, dict] = {}
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def hosts(self) -> list[dict]:
+        """The protocol adapters found so far, at the address they last answered from."""
+        return [dict(host) for host in self._hosts.values()]
+
+    def update(self, hosts: list[dict]) -> None:
+        """Record discovered protocol adapters."""
+        for host in hosts:
+            name = host[SL_GATEWAY_NAME]
+            if (known := self._hosts.get(name)) is not None and (
+                known[SL_GATEWAY_IP],
+                known[SL_GATEWAY_PORT],
+            ) != (host[SL_GATEWAY_IP], host[SL_GATEWAY_PORT]):
+                _LOGGER.info(
+                    "'%s' moved from %s:%s to %s:%s",
+                    name,
+                    known[SL_GATEWAY_IP],
+                    known[SL_GATEWAY_PORT],
+                    host[SL_GATEWAY_IP],
+                    host[SL_GATEWAY_PORT],
+                )
+            self._hosts[name] = dict(host)
+
+    def resolve(self, mac: str) -> dict | None:
+        """Return the protocol adapter with MAC address 'mac', if it has been found."""
+        for name, host in self._hosts.items():
+            if gateway_name_matches_mac(name, mac):
+                return dict(host)
+        return None
+
+    async def async_discover(self, mac: str = None, max_age: float = 0) -> list[dict]:
+        """
+        Run a discovery now, returning early once 'mac' answers if given.
+
+        If 'mac' answered a discovery within 'max_age' seconds, it is not asked again.
+        """
+        hosts = await async_discover(
+            mac=mac, timeout=self._timeout, max_age=max_age, addresses=self._addresses
+        )
+        self.update(hosts)
+        return hosts
+
+    async def async_resolve(
+        self, mac: str, max_age: float = DISCOVERY_CACHE_TTL
+    ) -> dict | None:
+        """
+        Run a discovery for the protocol adapter with MAC address 'mac'.
+
+        An answer to a discovery within 'max_age' seconds is used without asking
+        again, so gateways reconnecting to the same protocol adapter together
+        broadcast once.
+        """
+        await self.async_discover(mac, max_age)
+        return self.resolve(mac)
+
+    async def async_start(self) -> None:
+        """Run discovery in the background."""
+        if self._task is not None:
+            return
+        self._stop.clear()
+        self._task = asyncio.create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        if self._task is not None:
+            self._stop.set()
+            await self._task
+            self._task = None
+
+    async def _async_run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.async_discover()
+            except OSError as ex:
+                _LOGGER.debug("Background discovery failed: %s", ex)
+            try:
+                await asyncio.wait_for(self._stop.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,312 @@
+"""Manage connections to many ScreenLogic protocol adapters from one event loop."""
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from .const.common import (
+    SL_GATEWAY_IP,
+    SL_GATEWAY_NAME,
+    SL_GATEWAY_PORT,
+    SL_GATEWAY_SUBTYPE,
+    SL_GATEWAY_TYPE,
+    ScreenLogicConnectionError,
+    ScreenLogicException,
+)
+from .gateway import ScreenLogicGateway
+
+POOL_MAX_CONCURRENT = 8
+POOL_MAX_PER_SITE = 1
+POOL_POLL_INTERVAL = 30.0
+
+# Fractional part of the golden ratio. Offsets of consecutive sites stepped by it
+# stay spread over the interval no matter how many sites are added.
+_STAGGER_STEP = 0.6180339887498949
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class SiteHealth:
+    """Outcome of the operations performed on one site."""
+
+    connected: bool = False
+    last_success: float | None = None
+    last_failure: float | None = None
+    last_error: str | None = None
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+
+
+@dataclass(frozen=True)
+class PoolHealth:
+    """Health of all sites in a GatewayPool."""
+
+    sites: dict[str, SiteHealth]
+
+    @property
+    def total(self) -> int:
+        return len(self.sites)
+
+    @property
+    def connected(self) -> int:
+        return sum(1 for health in self.sites.values() if health.connected)
+
+    @property
+    def failing(self) -> list[str]:
+        """Sites whose last operation failed."""
+        return [
+            site
+            for site, health in self.sites.items()
+            if health.consecutive_failures > 0
+        ]
+
+
+class _Site:
+    __slots__ = (
+        "gateway",
+        "connect_info",
+        "limit",
+        "health",
+        "offset",
+        "stop",
+        "task",
+    )
+
+    def __init__(
+        self,
+        gateway: ScreenLogicGateway,
+        connect_info: dict,
+        max_per_site: int,
+        offset: float,
+    ) -> None:
+        self.gateway = gateway
+        self.connect_info = connect_info
+        self.limit = asyncio.Semaphore(max_per_site)
+        self.health = SiteHealth()
+        self.offset = offset
+        self.stop = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+
+class GatewayPool:
+    """
+    Class for managing a ScreenLogicGateway per site.
+
+    All operations started through the pool are limited to 'max_concurrent' at a time
+    across all sites, and to 'max_per_site' at a time for any one site. Polling started
+    with async_start() gives each site a fixed offset into the poll interval, so sites
+    are not all updated at the same moment.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = POOL_MAX_CONCURRENT,
+        max_per_site: int = POOL_MAX_PER_SITE,
+        poll_interval: float = POOL_POLL_INTERVAL,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError(f"Invalid max_concurrent: {max_concurrent}")
+        if max_per_site < 1:
+            raise ValueError(f"Invalid max_per_site: {max_per_site}")
+        if poll_interval <= 0:
+            raise ValueError(f"Invalid poll_interval: {poll_interval}")
+        self._limit = asyncio.Semaphore(max_concurrent)
+        self._max_per_site = max_per_site
+        self._poll_interval = poll_interval
+        self._sites: dict[str, _Site] = {}
+        self._added = 0
+        self._running = False
+
+    @property
+    def sites(self) -> list[str]:
+        return list(self._sites)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def health(self) -> PoolHealth:
+        return PoolHealth(
+            {site_id: site.health for site_id, site in self._sites.items()}
+        )
+
+    def add_site(
+        self,
+        site_id: str,
+        ip: str,
+        port: int = 80,
+        gtype: int = None,
+        gsubtype: int = None,
+        name: str = None,
+        **gateway_kwargs,
+    ) -> ScreenLogicGateway:
+        """
+        Add a site and return the gateway created for it.
+
+        Any 'gateway_kwargs' are passed to ScreenLogicGateway. If polling is running,
+        the site's polling starts immediately.
+        """
+        if site_id in self._sites:
+            raise ValueError(f"Site already added: {site_id}")
+        connect_info = {
+            SL_GATEWAY_IP: ip,
+            SL_GATEWAY_PORT: port,
+            SL_GATEWAY_TYPE: gtype,
+            SL_GATEWAY_SUBTYPE: gsubtype,
+            SL_GATEWAY_NAME: name,
+        }
+        offset = (self._added * _STAGGER_STEP) % 1 * self._poll_interval
+        self._added += 1
+        site = _Site(
+            ScreenLogicGateway(**gateway_kwargs),
+            connect_info,
+            self._max_per_site,
+            offset,
+        )
+        self._sites[site_id] = site
+        if self._running:
+            self._start_polling(site_id, site)
+        return site.gateway
+
+    async def async_remove_site(self, site_id: str) -> None:
+        """Stop polling a site and disconnect from it."""
+        site = self._sites.pop(site_id)
+        await self._async_stop_polling(site)
+        await self._async_disconnect(site)
+
+    def get_gateway(self, site_id: str) -> ScreenLogicGateway:
+        return self._sites[site_id].gateway
+
+    async def async_call(
+        self,
+        site_id: str,
+        method: Callable[..., Awaitable[Any]],
+        *args,
+        **kwargs,
+    ) -> Any:
+        """
+        Await 'method(gateway, *args, **kwargs)' within the pool limits.
+
+        The site is connected first if needed, and a failed login raises
+        ScreenLogicConnectionError. The outcome is recorded in the site's health, and
+        any ScreenLogic error is raised to the caller.
+        """
+        site = self._sites[site_id]
+        async with site.limit, self._limit:
+            try:
+                if not site.gateway.is_connected and not (
+                    await site.gateway.async_connect(**site.connect_info)
+                ):
+                    raise ScreenLogicConnectionError(f"Login failed: {site_id}")
+                result = await method(site.gateway, *args, **kwargs)
+            except ScreenLogicException as ex:
+                self._record_failure(site, ex)
+                raise
+            self._record_success(site)
+            return result
+
+    async def async_connect_all(self) -> dict[str, ScreenLogicException]:
+        """Connect to every site. Returns the errors of sites that failed."""
+        return await self._async_call_all(_async_noop)
+
+    async def async_update_all(self) -> dict[str, ScreenLogicException]:
+        """Update every site once. Returns the errors of sites that failed."""
+        return await self._async_call_all(ScreenLogicGateway.async_update)
+
+    async def async_start(self) -> None:
+        """Start polling every site at the poll interval."""
+        if self._running:
+            return
+        self._running = True
+        for site_id, site in self._sites.items():
+            self._start_polling(site_id, site)
+
+    async def async_stop(self) -> None:
+        """Stop polling and disconnect from every site."""
+        self._running = False
+        sites = list(self._sites.values())
+        await asyncio.gather(*(self._async_stop_polling(site) for site in sites))
+        await asyncio.gather(*(self._async_disconnect(site) for site in sites))
+
+    async def _async_call_all(self, method) -> dict[str, ScreenLogicException]:
+        site_ids = list(self._sites)
+        results = await asyncio.gather(
+            *(self.async_call(site_id, method) for site_id in site_ids),
+            return_exceptions=True,
+        )
+        errors = {}
+        for site_id, result in zip(site_ids, results):
+            if isinstance(result, ScreenLogicException):
+                errors[site_id] = result
+            elif isinstance(result, BaseException):
+                raise result
+        return errors
+
+    def _start_polling(self, site_id: str, site: _Site) -> None:
+        site.stop = asyncio.Event()
+        site.task = asyncio.create_task(self._async_poll(site_id, site))
+
+    async def _async_poll(self, site_id: str, site: _Site) -> None:
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time() + site.offset
+        while True:
+            try:
+                await asyncio.wait_for(
+                    site.stop.wait(), max(next_poll - loop.time(), 0)
+                )
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.async_call(site_id, ScreenLogicGateway.async_update)
+            except ScreenLogicException as ex:
+                _LOGGER.debug("Polling %s failed: %s", site_id, ex)
+            next_poll += self._poll_interval
+            if next_poll < loop.time():
+                # Skip the slots missed while waiting on a slow site.
+                missed = (loop.time() - next_poll) // self._poll_interval + 1
+                next_poll += missed * self._poll_interval
+
+    async def _async_stop_polling(self, site: _Site) -> None:
+        """
+        Stop a site's polling, letting an update in progress finish.
+
+        Requests swallow cancellation while connected, so the poll task is not
+        cancelled.
+        """
+        if site.task is not None:
+            site.stop.set()
+            await site.task
+            site.task = None
+
+    async def _async_disconnect(self, site: _Site) -> None:
+        if site.gateway.is_connected:
+            try:
+                await site.gateway.async_disconnect()
+            except ScreenLogicException as ex:
+                _LOGGER.debug("Error disconnecting: %s", ex)
+        site.health.connected = False
+
+    def _record_success(self, site: _Site) -> None:
+        health = site.health
+        health.connected = site.gateway.is_connected
+        health.last_success = time.time()
+        health.consecutive_failures = 0
+        health.successes += 1
+
+    def _record_failure(self, site: _Site, ex: ScreenLogicException) -> None:
+        health = site.health
+        health.connected = site.gateway.is_connected
+        health.last_failure = time.time()
+        health.last_error = str(ex)
+        health.consecutive_failures += 1
+        health.failures += 1
+
+
+async def _async_noop(gateway: ScreenLogicGateway) -> None:
+    """Nothing to do once connected."""
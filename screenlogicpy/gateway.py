@@ -3,50 +3,79 @@
 import asyncio
 from datetime import datetime
 import logging
-from typing import Awaitable, Callable
+import random
+from typing import TYPE_CHECKING, Awaitable, Callable
 
 from .client import ClientManager
 from .const.common import (
     DATA_REQUEST,
+    OVERFLOW,
     ON_OFF,
     ScreenLogicCommunicationError,
     ScreenLogicError,
     ScreenLogicConnectionError,
+    ScreenLogicException,
+    SL_GATEWAY_IP,
+    SL_GATEWAY_PORT,
+)
+from .const.msg import (
+    CODE,
+    COM_CONNECT_SETTLE,
+    COM_MAX_IN_FLIGHT,
+    COM_MAX_RETRIES,
+    COM_PUSH_DEPTH,
+    UPDATE_QUEUE_SIZE,
 )
-from .const.msg import COM_MAX_RETRIES
 from .device_const.chemistry import CHEM_RANGE as cr
 from .device_const.system import EQUIPMENT_FLAG
 from .device_const.scg import SCG_RANGE as sr
 from .const.data import ATTR, DEVICE, GROUP, VALUE
-from .requests import (
-    async_connect_to_gateway,
-    async_request_date_time,
-    async_request_gateway_version,
-    async_request_pool_button_press,
-    async_request_pool_config,
-    async_request_pool_lights_command,
-    async_request_pool_status,
-    async_request_pump_status,
-    async_request_set_date_time,
-    async_request_set_heat_mode,
-    async_request_set_heat_setpoint,
-    async_request_chemistry,
-    async_request_scg_config,
-    async_request_set_scg_config,
-    async_request_set_chem_data,
-    async_make_request,
-)
-from .requests.protocol import ScreenLogicProtocol
 from .requests.utility import getTemperatureUnit
 
+# Requests, decoders and optional features are imported where they are used, so
+# importing the gateway does not load them.
+if TYPE_CHECKING:
+    from .batch import CommandBatch
+    from .cache import ConfigCache
+    from .capture import CaptureWriter
+    from .discovery import DiscoveryService
+    from .history import HistoryStore
+    from .metrics import MetricsCollector
+    from .requests.protocol import ScreenLogicProtocol
+    from .requests.query import DataQuery
+    from .requests.retry import RetryPolicy
+    from .segments import SegmentStore
+    from .snapshot import ScreenLogicSnapshot, SnapshotMetadata
+    from .updates import UpdateStream
+
 
 _LOGGER = logging.getLogger(__name__)
 
+# Pushed messages that carry the same payload as a data request response.
+PUSH_REQUEST = {
+    CODE.STATUS_CHANGED: DATA_REQUEST.STATUS,
+    CODE.CHEMISTRY_CHANGED: DATA_REQUEST.CHEMISTRY,
+}
+
 
 class ScreenLogicGateway:
     """Class for interacting and communicating with a ScreenLogic protocol adapter."""
 
-    def __init__(self, client_id: int = None, max_retries: int = None):
+    def __init__(
+        self,
+        client_id: int = None,
+        max_retries: int = None,
+        max_in_flight: int = None,
+        retry_policy: "RetryPolicy" = None,
+        metrics: "MetricsCollector" = None,
+        config_cache: "ConfigCache" = None,
+        capture: "CaptureWriter" = None,
+        history: "HistoryStore" = None,
+        segments: "SegmentStore" = None,
+        discovery: "DiscoveryService" = None,
+        push_depth: int = COM_PUSH_DEPTH,
+        connect_settle: float = COM_CONNECT_SETTLE,
+    ):
         self._ip = None
         self._port = 80
         self._type = 0
@@ -55,16 +84,46 @@ class ScreenLogicGateway:
         self._mac = ""
         self._version = ""
         self._transport: asyncio.Transport = None
-        self._protocol: ScreenLogicProtocol = None
+        self._protocol: "ScreenLogicProtocol" = None
         self._is_client = False
         self._data = {}
         self._last = {}
+        self._decoded: dict[tuple[str, int | None], bytes] = {}
+        self._changed: dict[str, bool] = {}
+        self._generation = 0
+        self._in_flight: dict[tuple[int, bytes], asyncio.Future] = {}
+        self._coalesced: dict[int, int] = {}
+        self._snapshot_metadata: "SnapshotMetadata | None" = None
+        if retry_policy is None:
+            from .requests.retry import AdaptiveRetryPolicy
+
+            retry_policy = AdaptiveRetryPolicy()
+        self._retry_policy = retry_policy
+        self._metrics = metrics
+        self._config_cache = config_cache
+        self._capture = capture
+        self._history = history
+        self._segments = segments
+        self._discovery = discovery
+        self.set_push_depth(push_depth)
+        self.set_connect_settle(connect_settle)
+        self._config_refresh: asyncio.Task | None = None
         (
             self.set_max_retries(max_retries)
             if max_retries is not None
             else self.set_max_retries()
         )
-        self._client_manager = ClientManager(self._async_connected_request, client_id)
+        (
+            self.set_max_in_flight(max_in_flight)
+            if max_in_flight is not None
+            else self.set_max_in_flight()
+        )
+        self._client_manager = ClientManager(
+            self._async_connected_request,
+            client_id,
+            self._push_changed,
+            self._push_updated,
+        )
 
     @property
     def ip(self) -> str:
@@ -112,10 +171,53 @@ class ScreenLogicGateway:
     def client_id(self) -> int:
         return self._client_manager.client_id
 
+    @property
+    def generation(self) -> int:
+        """Number of received payloads that changed the data."""
+        return self._generation
+
+    @property
+    def coalesced_requests(self) -> dict[int, int]:
+        """Number of requests that shared an identical request in flight, by code."""
+        return dict(self._coalesced)
+
     @property
     def max_retries(self) -> int:
         return self._max_retries
 
+    @property
+    def max_in_flight(self) -> int:
+        return self._max_in_flight
+
+    @property
+    def retry_policy(self) -> "RetryPolicy":
+        return self._retry_policy
+
+    @property
+    def metrics(self) -> "MetricsCollector | None":
+        """Statistics collected for this gateway's connections, if enabled."""
+        return self._metrics
+
+    @property
+    def capture(self) -> "CaptureWriter | None":
+        """Writer recording this gateway's messages after login, if enabled."""
+        return self._capture
+
+    @property
+    def history(self) -> "HistoryStore | None":
+        """History of sensor values, if kept."""
+        return self._history
+
+    @property
+    def segments(self) -> "SegmentStore | None":
+        """On-disk history of sensor values, if kept."""
+        return self._segments
+
+    @property
+    def discovery(self) -> "DiscoveryService | None":
+        """Discovery service tracking the protocol adapter's address, if used."""
+        return self._discovery
+
     async def async_connect(
         self,
         ip=None,
@@ -136,36 +238,98 @@ class ScreenLogicGateway:
         self._name = name if name is not None else self._name
         self._custom_connection_closed_callback = connection_closed_callback
 
+        if ip is None and (host := self._discovered_host()) is not None:
+            self._set_address(host)
+
         if not self._ip:
             raise ScreenLogicError(
                 "Attempted to connect when no IP address has been provided for connection."
             )
 
         _LOGGER.debug("Beginning connection and login sequence")
-        connectPkg = await async_connect_to_gateway(
+        try:
+            connectPkg = await self._async_connect_to_gateway()
+        except ScreenLogicConnectionError:
+            # The protocol adapter may have moved to a new address.
+            if (
+                self._discovery is None
+                or not self._mac
+                or not await self._async_rediscover()
+            ):
+                raise
+            connectPkg = await self._async_connect_to_gateway()
+        if connectPkg:
+            transport, protocol, mac = connectPkg
+            has_cached_config = mac == self._mac and self._has_cached_config()
+            self._transport, self._protocol, self._mac = transport, protocol, mac
+            self._protocol.capture = self._capture
+            self._protocol.dispatcher.depth = self._push_depth
+            if has_cached_config and await self._async_revalidate_config():
+                _LOGGER.debug("Login successful. Cached configuration is current")
+            else:
+                from .requests.gateway import async_request_gateway_version
+
+                self._last[DATA_REQUEST.VERSION] = await async_request_gateway_version(
+                    self._protocol, self._data, self._max_retries
+                )
+                if not self.version:
+                    _LOGGER.debug("Login failed")
+                    return False
+                _LOGGER.debug("Login successful")
+                if not await self._async_load_cached_config():
+                    await self.async_get_config()
+            await self._client_manager.attach(
+                self._protocol, self.get_data(), self._max_retries
+            )
+            return True
+        _LOGGER.debug("Login failed")
+        return False
+
+    async def _async_connect_to_gateway(self):
+        from .requests.login import async_connect_to_gateway
+
+        return await async_connect_to_gateway(
             self._ip,
             self._port,
             self._common_connection_closed_callback,
             self._max_retries,
+            self._retry_policy,
+            self._metrics,
+            self._connect_settle,
         )
-        if connectPkg:
-            self._transport, self._protocol, self._mac = connectPkg
-            self._last[DATA_REQUEST.VERSION] = await async_request_gateway_version(
-                self._protocol, self._data, self._max_retries
-            )
-            if self.version:
-                _LOGGER.debug("Login successful")
-                await self.async_get_config()
-                await self._client_manager.attach(
-                    self._protocol, self.get_data(), self._max_retries
-                )
-                return True
-        _LOGGER.debug("Login failed")
-        return False
+
+    def _discovered_host(self) -> dict | None:
+        if self._discovery is None or not self._mac:
+            return None
+        return self._discovery.resolve(self._mac)
+
+    async def _async_rediscover(self) -> bool:
+        """Look the protocol adapter up again. Returns True if its address changed."""
+        host = await self._discovery.async_resolve(self._mac)
+        if host is None:
+            return False
+        if self._set_address(host):
+            return True
+        # The last answer came from the address that failed, so ask again.
+        host = await self._discovery.async_resolve(self._mac, max_age=0)
+        return host is not None and self._set_address(host)
+
+    def _set_address(self, host: dict) -> bool:
+        """Use the address of a discovered host. Returns True if it changed."""
+        address = (host[SL_GATEWAY_IP], host[SL_GATEWAY_PORT])
+        if address == (self._ip, self._port):
+            return False
+        _LOGGER.info(
+            "Protocol adapter %s is now at %s:%s", self._mac, address[0], address[1]
+        )
+        self._ip, self._port = address
+        return True
 
     async def async_disconnect(self, force=False):
         """Shutdown the connection to the ScreenLogic protocol adapter"""
         _LOGGER.debug("Disconnecting from protocol adapter")
+        if self._config_refresh is not None and not self._config_refresh.done():
+            self._config_refresh.cancel()
         if self.is_client:
             await self._client_manager.async_unsubscribe_gateway()
 
@@ -180,63 +344,140 @@ class ScreenLogicGateway:
             raise ScreenLogicError("Internal data missing")
 
         _LOGGER.debug("Beginning update of all data")
-        await self.async_get_status()
-        await self.async_get_pumps()
-        await self.async_get_chemistry()
-        await self.async_get_scg()
-        await self.async_get_datetime()
+        if self._max_in_flight > 1:
+            await self._async_pipelined_update()
+        else:
+            await self.async_get_status()
+            await self.async_get_pumps()
+            await self.async_get_chemistry()
+            await self.async_get_scg()
+            await self.async_get_datetime()
         _LOGGER.debug("Update complete")
 
+    async def _async_pipelined_update(self) -> None:
+        """
+        Send all update requests together and apply the responses in request order.
+
+        Pumps are requested from the equipment flags known before the status response
+        is applied. Like other data requests, a request identical to one in flight
+        waits for it instead of being sent.
+        """
+        from .requests.pipeline import async_request_many
+        from .requests.query import (
+            chemistry_query,
+            date_time_query,
+            pump_query,
+            scg_query,
+            status_query,
+        )
+
+        queries: list["DataQuery"] = [status_query()]
+        for pumpID in range(8):
+            if EQUIPMENT_FLAG.INTELLIFLO_0 << pumpID & self.equipment_flags:
+                queries.append(pump_query(pumpID))
+        queries.extend((chemistry_query(), scg_query(), date_time_query()))
+
+        # Requests already in flight are waited for instead of sent again, and the
+        # rest are registered so that identical requests wait for this update.
+        joined: list[asyncio.Future] = []
+        sent: list["DataQuery"] = []
+        current = asyncio.current_task()
+        for query in queries:
+            pending = self._in_flight.get((query.code, query.payload))
+            if pending is None or pending is current:
+                sent.append(query)
+            else:
+                self._coalesced[query.code] = self._coalesced.get(query.code, 0) + 1
+                joined.append(pending)
+
+        async def request_many():
+            results = await self._async_connected_request(
+                async_request_many, sent, self._max_in_flight, reconnect_delay=1
+            )
+            self._changed[DATA_REQUEST.PUMPS] = False
+            for query, last_raw in zip(sent, results):
+                if not last_raw:
+                    continue
+                if self._set_last(query.request, last_raw, query.index):
+                    query.apply(last_raw, self._data, self._metrics)
+                if self._history is not None:
+                    self._history.record(query.request, self._data, query.index)
+                if self._segments is not None:
+                    self._segments.append(query.request, last_raw, query.index)
+
+        keys = [
+            (query.code, query.payload)
+            for query in sent
+            if (query.code, query.payload) not in self._in_flight
+        ]
+        task = asyncio.ensure_future(request_many())
+        for key in keys:
+            self._in_flight[key] = task
+
+        def done(_):
+            for key in keys:
+                if self._in_flight.get(key) is task:
+                    del self._in_flight[key]
+
+        task.add_done_callback(done)
+        await asyncio.shield(task)
+        for pending in joined:
+            await asyncio.shield(pending)
+
     async def async_get_config(self):
         """Request pool configuration data."""
+        from .requests.config import async_request_pool_config
+        from .requests.query import config_query
+
         _LOGGER.debug("Requesting config data")
-        if last_raw := await self._async_connected_request(
-            async_request_pool_config, self._data, reconnect_delay=1
-        ):
-            self._last[DATA_REQUEST.CONFIG] = last_raw
+        await self._async_get_data(config_query(), async_request_pool_config)
+        if self._config_cache is not None and self._changed.get(DATA_REQUEST.CONFIG):
+            await self._async_save_cached_config()
 
     async def async_get_status(self):
         """Request pool state data."""
+        from .requests.query import status_query
+        from .requests.status import async_request_pool_status
+
         _LOGGER.debug("Requesting pool status")
-        if last_raw := await self._async_connected_request(
-            async_request_pool_status, self._data, reconnect_delay=1
-        ):
-            self._last[DATA_REQUEST.STATUS] = last_raw
+        await self._async_get_data(status_query(), async_request_pool_status)
 
     async def async_get_pumps(self):
         """Request all pump state data."""
+        from .requests.pump import async_request_pump_status
+        from .requests.query import pump_query
+
+        self._changed[DATA_REQUEST.PUMPS] = False
         for pumpID in range(8):
             if EQUIPMENT_FLAG.INTELLIFLO_0 << pumpID & self.equipment_flags:
                 _LOGGER.debug("Requesting pump %i data", pumpID)
-                last_pumps = self._last.setdefault(DATA_REQUEST.PUMPS, {})
-                if last_raw := await self._async_connected_request(
-                    async_request_pump_status, self._data, pumpID, reconnect_delay=1
-                ):
-                    last_pumps[pumpID] = last_raw
+                await self._async_get_data(
+                    pump_query(pumpID), async_request_pump_status, pumpID
+                )
 
     async def async_get_chemistry(self):
         """Request IntelliChem controller data."""
+        from .requests.chemistry import async_request_chemistry
+        from .requests.query import chemistry_query
+
         _LOGGER.debug("Requesting chemistry data")
-        if last_raw := await self._async_connected_request(
-            async_request_chemistry, self._data, reconnect_delay=1
-        ):
-            self._last[DATA_REQUEST.CHEMISTRY] = last_raw
+        await self._async_get_data(chemistry_query(), async_request_chemistry)
 
     async def async_get_scg(self):
         """Request salt chlorine generator state data."""
+        from .requests.query import scg_query
+        from .requests.scg import async_request_scg_config
+
         _LOGGER.debug("Requesting scg data")
-        if last_raw := await self._async_connected_request(
-            async_request_scg_config, self._data, reconnect_delay=1
-        ):
-            self._last[DATA_REQUEST.SCG] = last_raw
+        await self._async_get_data(scg_query(), async_request_scg_config)
 
     async def async_get_datetime(self):
         """Request the current date and time from the controller."""
+        from .requests.datetime import async_request_date_time
+        from .requests.query import date_time_query
+
         _LOGGER.debug("Requesting date/time")
-        if last_raw := await self._async_connected_request(
-            async_request_date_time, self._data, reconnect_delay=1
-        ):
-            self._last[DATA_REQUEST.DATE_TIME] = last_raw
+        await self._async_get_data(date_time_query(), async_request_date_time)
 
     def get_data(self, *keypath, strict: bool = False):
         """
@@ -298,6 +539,33 @@ class ScreenLogicGateway:
                 raise KeyError(f"Value for {keypath} not found")
             return None
 
+    def take_snapshot(self) -> "ScreenLogicSnapshot":
+        """
+        Return a compact snapshot of the current data.
+
+        Snapshots taken while the configuration is unchanged share their names, units
+        and other descriptive data, and only store the values that change per poll.
+        """
+        from .snapshot import ScreenLogicSnapshot, SnapshotMetadata, metadata_key
+
+        key = metadata_key(
+            self._data,
+            self._last.get(DATA_REQUEST.VERSION),
+            self._last.get(DATA_REQUEST.CONFIG),
+        )
+        if self._snapshot_metadata is None or self._snapshot_metadata.key != key:
+            self._snapshot_metadata = SnapshotMetadata(self._data, key)
+        return ScreenLogicSnapshot.capture(self._data, self._snapshot_metadata)
+
+    def has_changed(self, request: str) -> bool:
+        """
+        Return if the last response to a data request changed the data.
+
+        'request' is a DATA_REQUEST key. For pumps, returns if any pump changed
+        during the last update.
+        """
+        return self._changed.get(request, False)
+
     def get_debug(self) -> dict:
         """Return the debug last-received data."""
         return self._last
@@ -308,6 +576,79 @@ class ScreenLogicGateway:
         else:
             raise ValueError(f"Invalid max_retries: {max_retries}")
 
+    def set_metrics(self, metrics: "MetricsCollector | None") -> None:
+        """
+        Start collecting statistics into 'metrics', or stop if None.
+
+        Applies to the current connection and any made after.
+        """
+        self._metrics = metrics
+        if self._protocol is not None:
+            self._protocol.metrics = metrics
+
+    def set_capture(self, capture: "CaptureWriter | None") -> None:
+        """
+        Start recording messages to 'capture', or stop if None.
+
+        Applies to the current connection and any made after. The login exchange
+        is not recorded.
+        """
+        self._capture = capture
+        if self._protocol is not None:
+            self._protocol.capture = capture
+
+    def set_push_depth(self, push_depth: int = COM_PUSH_DEPTH) -> None:
+        """
+        Set how many pushed messages of one code may wait for their handler.
+
+        Status, chemistry and color light messages are not limited by it, as only
+        the latest of each is kept. Applies to the current connection and any made
+        after.
+        """
+        if push_depth < 1:
+            raise ValueError(f"Invalid push_depth: {push_depth}")
+        self._push_depth = push_depth
+        if self._protocol is not None:
+            self._protocol.dispatcher.depth = push_depth
+
+    def set_connect_settle(self, connect_settle: float = COM_CONNECT_SETTLE) -> None:
+        """
+        Set the seconds the protocol adapter is given to take the connect ping.
+
+        The protocol adapter does not answer the ping, so the challenge is sent after
+        this wait. Shorter waits reconnect faster, but only suit protocol adapters
+        known to take the challenge that soon. Applies to connections made after.
+        """
+        if connect_settle < 0:
+            raise ValueError(f"Invalid connect_settle: {connect_settle}")
+        self._connect_settle = connect_settle
+
+    def set_history(self, history: "HistoryStore | None") -> None:
+        """Start recording sensor values into 'history', or stop if None."""
+        self._history = history
+
+    def set_segments(self, segments: "SegmentStore | None") -> None:
+        """Start appending sensor values to 'segments', or stop if None."""
+        self._segments = segments
+
+    def set_discovery(self, discovery: "DiscoveryService | None") -> None:
+        """
+        Start resolving the protocol adapter's address with 'discovery', or stop if
+        None.
+        """
+        self._discovery = discovery
+
+    def set_max_in_flight(self, max_in_flight: int = COM_MAX_IN_FLIGHT) -> None:
+        """
+        Set how many update requests may await a response at once.
+
+        A value of 1 sends each update request only after the previous one completes.
+        """
+        if 0 < max_in_flight < 17:
+            self._max_in_flight = max_in_flight
+        else:
+            raise ValueError(f"Invalid max_in_flight: {max_in_flight}")
+
     async def async_set_circuit(self, circuitID: int, circuitState: int):
         """Set the circuit state for the specified circuit."""
         if not self._is_valid_circuit(circuitID):
@@ -315,6 +656,8 @@ class ScreenLogicGateway:
         if not self._is_valid_circuit_state(circuitState):
             raise ValueError(f"Invalid circuitState: {circuitState}")
 
+        from .requests.button import async_request_pool_button_press
+
         await self._async_connected_request(
             async_request_pool_button_press, circuitID, circuitState
         )
@@ -326,6 +669,8 @@ class ScreenLogicGateway:
         if not self._is_valid_heattemp(body, temp):
             raise ValueError(f"Invalid temp ({temp}) for body ({body})")
 
+        from .requests.heat import async_request_set_heat_setpoint
+
         await self._async_connected_request(async_request_set_heat_setpoint, body, temp)
 
     async def async_set_heat_mode(self, body: int, mode: int):
@@ -335,6 +680,8 @@ class ScreenLogicGateway:
         if not self._is_valid_heatmode(mode):
             raise ValueError(f"Invalid mode: {mode}")
 
+        from .requests.heat import async_request_set_heat_mode
+
         await self._async_connected_request(async_request_set_heat_mode, body, mode)
 
     async def async_set_color_lights(self, light_command: int):
@@ -342,10 +689,23 @@ class ScreenLogicGateway:
         if not self._is_valid_color_mode(light_command):
             raise ValueError(f"Invalid light_command: {light_command}")
 
+        from .requests.lights import async_request_pool_lights_command
+
         await self._async_connected_request(
             async_request_pool_lights_command, light_command
         )
 
+    def batch(self, pacing: float = None) -> "CommandBatch":
+        """
+        Return a CommandBatch for sending several write commands together.
+
+        The batch is followed by a single status refresh instead of one per command.
+        Commands are 'pacing' seconds apart, BATCH_PACING if not given.
+        """
+        from .batch import BATCH_PACING, CommandBatch
+
+        return CommandBatch(self, BATCH_PACING if pacing is None else pacing)
+
     async def async_set_scg_config(
         self,
         *,
@@ -387,6 +747,8 @@ class ScreenLogicGateway:
         except (KeyError, ValueError) as ex:
             raise ScreenLogicError(ex.args[0]) from ex
 
+        from .requests.scg import async_request_set_scg_config
+
         await self._async_connected_request(
             async_request_set_scg_config,
             pool_setpoint,
@@ -448,6 +810,8 @@ class ScreenLogicGateway:
 
         ph_setpoint = int(ph_setpoint * 100)
 
+        from .requests.chemistry import async_request_set_chem_data
+
         await self._async_connected_request(
             async_request_set_chem_data,
             ph_setpoint,
@@ -477,6 +841,8 @@ class ScreenLogicGateway:
         if auto_dst is None:
             auto_dst = self.get_value(*DATETIME_CONFIG, VALUE.AUTO_DST, strict=True)
 
+        from .requests.datetime import async_request_set_date_time
+
         return await self._async_connected_request(
             async_request_set_date_time, date_time, auto_dst
         )
@@ -486,7 +852,7 @@ class ScreenLogicGateway:
         return await self.async_set_date_time(date_time=datetime.now())
 
     async def async_subscribe_client(
-        self, callback: Callable[..., any], code: int
+        self, callback: Callable[..., any], code: int, with_changes: bool = False
     ) -> Callable:
         """
         Subscribe client listener to message code.
@@ -495,9 +861,36 @@ class ScreenLogicGateway:
         callback method to call when a message with the specified message code is received.
 
         Messages with known codes will be processed to update gateway data before
-        callback method is called.
+        callback method is called. If 'with_changes' is True, the callback is passed a
+        list of DataChange with the key path, old and new value of each changed value,
+        and is only called when a message changed something.
+        """
+        return await self._client_manager.async_subscribe(callback, code, with_changes)
+
+    def updates(
+        self,
+        codes: list[int] = None,
+        snapshots: bool = False,
+        maxsize: int = UPDATE_QUEUE_SIZE,
+        overflow: str = OVERFLOW.DROP_OLDEST,
+    ) -> "UpdateStream":
+        """
+        Return an async iterator of the pushed updates to message 'codes'.
+
+        By default, the status, chemistry and color light codes are streamed. Each
+        PushUpdate lists the values a message changed, or carries a snapshot of the
+        data after it if 'snapshots' is True. At most 'maxsize' updates wait for
+        the consumer, and 'overflow' is an OVERFLOW policy for when more arrive.
+        Subscribes when iteration starts. Use as an async context manager, or call
+        aclose(), to unsubscribe.
         """
-        return await self._client_manager.async_subscribe(callback, code)
+        from .updates import UpdateStream
+
+        if codes is None:
+            return UpdateStream(
+                self, snapshots=snapshots, maxsize=maxsize, overflow=overflow
+            )
+        return UpdateStream(self, codes, snapshots, maxsize, overflow)
 
     def register_async_message_handler(
         self, message_code: int, handler: Callable[[bytes, any], Awaitable[None]], *argv
@@ -524,11 +917,50 @@ class ScreenLogicGateway:
         self, message_code: int, message: bytes = b""
     ) -> bytes:
         """Send a message to the ScreenLogic protocol adapter."""
+        from .requests.request import async_make_request
+
         _LOGGER.debug(f"User requesting {message_code}")
         return await self._async_connected_request(
             async_make_request, message_code, message
         )
 
+    async def _async_get_data(self, query: "DataQuery", async_method, *args) -> None:
+        """
+        Request data and record the response.
+
+        A caller asking for the same message code and payload as a request still in
+        flight waits for that request instead of sending another one. The request
+        itself may ask again while reconnecting, when the cached configuration is
+        revalidated, and is then sent without waiting on itself.
+        """
+        key = (query.code, query.payload)
+        if (pending := self._in_flight.get(key)) is not None:
+            if pending is not asyncio.current_task():
+                self._coalesced[query.code] = self._coalesced.get(query.code, 0) + 1
+                return await asyncio.shield(pending)
+
+        async def request_data():
+            if last_raw := await self._async_connected_request(
+                async_method,
+                self._data,
+                *args,
+                last=self._decoded.get((query.request, query.index)),
+                reconnect_delay=1,
+            ):
+                self._set_last(query.request, last_raw, query.index)
+                if self._history is not None:
+                    self._history.record(query.request, self._data, query.index)
+                if self._segments is not None:
+                    self._segments.append(query.request, last_raw, query.index)
+
+        if pending is not None:
+            return await request_data()
+
+        task = asyncio.ensure_future(request_data())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
     async def _async_connected_request(
         self, async_method, *args, reconnect_delay: int = 0, **kwargs
     ):
@@ -555,6 +987,110 @@ class ScreenLogicGateway:
             await asyncio.sleep(reconnect_delay)
             return await attempt_request()
 
+    def _has_cached_config(self) -> bool:
+        """Return if a configuration and status were received on an earlier connection."""
+        return (
+            DATA_REQUEST.CONFIG in self._last
+            and DATA_REQUEST.STATUS in self._last
+            and bool(self.version)
+        )
+
+    async def _async_load_cached_config(self) -> bool:
+        """
+        Decode the configuration stored for this protocol adapter and firmware.
+
+        Returns False if there is none. Otherwise a refresh of the configuration from
+        the protocol adapter is scheduled after a random delay.
+        """
+        if self._config_cache is None:
+            return False
+        raw = await asyncio.get_running_loop().run_in_executor(
+            None, self._config_cache.load, self._mac, self.version
+        )
+        if raw is None or raw[DATA_REQUEST.VERSION] != self._last.get(
+            DATA_REQUEST.VERSION
+        ):
+            return False
+        from .requests.query import config_query
+
+        _LOGGER.debug("Using cached config data")
+        query = config_query()
+        if self._set_last(query.request, raw[query.request]):
+            query.apply(raw[query.request], self._data, self._metrics)
+        self._config_refresh = asyncio.create_task(
+            self._async_refresh_cached_config(
+                random.uniform(0, self._config_cache.refresh_jitter)
+            )
+        )
+        return True
+
+    async def _async_refresh_cached_config(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        if not self.is_connected:
+            return
+        try:
+            await self.async_get_config()
+        except ScreenLogicException as ex:
+            _LOGGER.debug("Refreshing cached config failed: %s", ex)
+
+    async def _async_save_cached_config(self) -> None:
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._config_cache.save, self._mac, self.version, dict(self._last)
+            )
+        except OSError as ex:
+            _LOGGER.warning("Unable to save config cache: %s", ex)
+
+    async def _async_revalidate_config(self) -> bool:
+        """
+        Request the pool status and return if the cached configuration still applies.
+
+        The configuration is taken to be unchanged if the status lists the same bodies
+        and circuits as the last status received.
+        """
+        from .requests.status import status_structure
+
+        structure = status_structure(self._last[DATA_REQUEST.STATUS])
+        await self.async_get_status()
+        return status_structure(self._last[DATA_REQUEST.STATUS]) == structure
+
+    def _set_last(self, request: str, raw: bytes, index: int | None = None) -> bool:
+        """
+        Record a received payload for a data request.
+
+        Returns False if the payload is identical to the one already decoded into
+        the data, in which case decoding it again can be skipped. A changed
+        configuration makes every other payload decode again, as their decoding
+        depends on it.
+        """
+        key = (request, index)
+        changed = self._decoded.get(key) != raw
+        if index is None:
+            self._last[request] = raw
+            self._changed[request] = changed
+        else:
+            self._last.setdefault(request, {})[index] = raw
+            self._changed[request] = self._changed.get(request, False) or changed
+        if changed:
+            self._generation += 1
+            if request == DATA_REQUEST.CONFIG:
+                self._decoded.clear()
+            self._decoded[key] = raw
+        return changed
+
+    def _push_changed(self, code: int, message: bytes) -> bool:
+        """Record a pushed payload and return if it needs to be decoded."""
+        if (request := PUSH_REQUEST.get(code)) is None:
+            return True
+        if self._segments is not None:
+            self._segments.append(request, message)
+        return self._set_last(request, message)
+
+    def _push_updated(self, code: int) -> None:
+        """Record the history of the data a pushed payload updated."""
+        if self._history is not None and (request := PUSH_REQUEST.get(code)):
+            self._history.record(request, self._data)
+
     def _common_connection_closed_callback(self):
         """Perform any needed cleanup."""
         if self._custom_connection_closed_callback:
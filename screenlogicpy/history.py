@@ -0,0 +1,227 @@
+"""Keep recent history of ScreenLogic sensor values in memory."""
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+import time
+from typing import Callable
+
+from .const.common import DATA_REQUEST
+from .const.data import ATTR, DEVICE, GROUP, VALUE
+
+# Values recorded for each data request. None stands for every index at that level,
+# such as every body or pump.
+HISTORY_KEYPATHS: dict[str, tuple[tuple, ...]] = {
+    DATA_REQUEST.STATUS: (
+        (DEVICE.CONTROLLER, GROUP.SENSOR, VALUE.AIR_TEMPERATURE),
+        (DEVICE.CONTROLLER, GROUP.SENSOR, VALUE.SALT_PPM),
+        (DEVICE.BODY, None, VALUE.LAST_TEMPERATURE),
+    ),
+    DATA_REQUEST.CHEMISTRY: (
+        (DEVICE.INTELLICHEM, GROUP.SENSOR, VALUE.PH_NOW),
+        (DEVICE.INTELLICHEM, GROUP.SENSOR, VALUE.ORP_NOW),
+    ),
+    DATA_REQUEST.PUMPS: (
+        (DEVICE.PUMP, None, VALUE.WATTS_NOW),
+        (DEVICE.PUMP, None, VALUE.RPM_NOW),
+        (DEVICE.PUMP, None, VALUE.GPM_NOW),
+    ),
+    DATA_REQUEST.SCG: ((DEVICE.SCG, GROUP.SENSOR, VALUE.SALT_PPM),),
+}
+
+
+@dataclass(frozen=True)
+class HistoryTier:
+    """
+    A resolution at which history is kept.
+
+    Samples are averaged over 'interval' seconds, or kept as received if it is 0.
+    The last 'capacity' of them are kept.
+    """
+
+    name: str
+    interval: float
+    capacity: int
+
+    def __post_init__(self):
+        if self.interval < 0 or self.capacity < 1:
+            raise ValueError(f"Invalid history tier: {self}")
+
+
+# About a day of samples polled every 30 seconds, a day by minute and a month by
+# hour.
+DEFAULT_HISTORY_TIERS = (
+    HistoryTier("raw", 0, 2880),
+    HistoryTier("1m", 60, 1440),
+    HistoryTier("1h", 3600, 720),
+)
+
+
+class RingBuffer:
+    """
+    Fixed size buffer of (timestamp, value) samples that overwrites the oldest.
+
+    Samples are stored in two preallocated arrays of doubles, so adding one does not
+    allocate.
+    """
+
+    __slots__ = ("_timestamps", "_values", "_next", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return len(self._values)
+
+    def append(self, timestamp: float, value: float) -> None:
+        self._timestamps[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        if self._count < len(self._values):
+            self._count += 1
+
+    def samples(self, since: float = None) -> tuple[array, array]:
+        """
+        Return new arrays of the timestamps and values, oldest first.
+
+        Only samples at or after 'since' are included if it is given.
+        """
+        start = (self._next - self._count) % len(self._values)
+        if start + self._count <= len(self._values):
+            timestamps = self._timestamps[start : start + self._count]
+            values = self._values[start : start + self._count]
+        else:
+            timestamps = self._timestamps[start:] + self._timestamps[: self._next]
+            values = self._values[start:] + self._values[: self._next]
+        if since is not None and (first := bisect_left(timestamps, since)):
+            del timestamps[:first]
+            del values[:first]
+        return timestamps, values
+
+
+class _Series:
+    """The history of one value at every tier."""
+
+    __slots__ = ("buffers", "_bucket", "_sum", "_count")
+
+    def __init__(self, tiers: tuple[HistoryTier, ...]) -> None:
+        self.buffers = {tier.name: RingBuffer(tier.capacity) for tier in tiers}
+        self._bucket = [None] * len(tiers)
+        self._sum = [0.0] * len(tiers)
+        self._count = [0] * len(tiers)
+
+    def add(self, tiers: tuple[HistoryTier, ...], timestamp: float, value: float):
+        for i, tier in enumerate(tiers):
+            buffer = self.buffers[tier.name]
+            if not tier.interval:
+                buffer.append(timestamp, value)
+                continue
+            bucket = timestamp // tier.interval * tier.interval
+            if bucket != self._bucket[i]:
+                # A sample in a new interval completes the average of the last.
+                if self._count[i]:
+                    buffer.append(self._bucket[i], self._sum[i] / self._count[i])
+                self._bucket[i] = bucket
+                self._sum[i] = 0.0
+                self._count[i] = 0
+            self._sum[i] += value
+            self._count[i] += 1
+
+
+class HistoryStore:
+    """
+    Class for keeping the history of sensor values in ring buffers.
+
+    Given to a gateway, the values listed in HISTORY_KEYPATHS are recorded from every
+    status, chemistry, pump and chlorinator update, polled or pushed. Each value is
+    kept at every tier in 'tiers'. Averaged tiers hold the average of each completed
+    interval, timestamped with the start of the interval.
+    """
+
+    def __init__(
+        self,
+        tiers: tuple[HistoryTier, ...] = DEFAULT_HISTORY_TIERS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if len({tier.name for tier in tiers}) != len(tiers):
+            raise ValueError("History tier names must be unique")
+        self._tiers = tuple(tiers)
+        self._clock = clock
+        self._series: dict[tuple, _Series] = {}
+
+    @property
+    def tiers(self) -> tuple[HistoryTier, ...]:
+        return self._tiers
+
+    def keypaths(self) -> list[tuple]:
+        """Return the key paths of every value with history."""
+        return list(self._series)
+
+    def record(
+        self, request: str, data: dict, index: int = None, timestamp: float = None
+    ) -> None:
+        """
+        Record the values a data request updates from 'data'.
+
+        'index' limits the values recorded to one pump. Values that are missing or
+        not numbers are skipped.
+        """
+        if (keypaths := HISTORY_KEYPATHS.get(request)) is None:
+            return
+        timestamp = self._clock() if timestamp is None else timestamp
+        for keypath in keypaths:
+            self._record_keypath(data, keypath, (), index, timestamp)
+
+    def _record_keypath(
+        self, data: dict, keypath: tuple, prefix: tuple, index, timestamp: float
+    ) -> None:
+        for depth, key in enumerate(keypath):
+            if key is None:
+                indexes = data.keys() if index is None else (index,)
+                for i in indexes:
+                    if isinstance(branch := data.get(i), dict):
+                        self._record_keypath(
+                            branch,
+                            keypath[depth + 1 :],
+                            (*prefix, *keypath[:depth], i),
+                            index,
+                            timestamp,
+                        )
+                return
+            if not isinstance(data := data.get(key), dict):
+                return
+        value = data.get(ATTR.VALUE)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            full_keypath = (*prefix, *keypath)
+            if (series := self._series.get(full_keypath)) is None:
+                series = self._series[full_keypath] = _Series(self._tiers)
+            series.add(self._tiers, timestamp, value)
+
+    def query(
+        self, *keypath, tier: str = None, since: float = None
+    ) -> tuple[array, array]:
+        """
+        Return the timestamps and values recorded for a value, oldest first.
+
+        'tier' is the name of a tier, by default the first. The results are
+        array.array('d') objects, which support the buffer protocol, so they can be
+        wrapped without copying, such as with numpy.frombuffer. Raises KeyError if the
+        value has no history.
+        """
+        tier = self._tiers[0].name if tier is None else tier
+        if (series := self._series.get(keypath)) is None:
+            raise KeyError(f"No history for {keypath}")
+        if (buffer := series.buffers.get(tier)) is None:
+            raise ValueError(f"Unknown history tier: {tier}")
+        return buffer.samples(since)
+
+    def clear(self) -> None:
+        """Discard all history."""
+        self._series.clear()
@@ -0,0 +1,290 @@
+"""Request, response and decoding statistics for a ScreenLogic connection."""
+
+from bisect import bisect_left
+import time
+from typing import Any, Callable
+
+from .const.msg import CODE
+
+# Upper bounds of the response latency and decode time buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DECODE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025)
+# Upper bounds of the buckets for messages framed per read from the transport.
+FRAME_BUCKETS = (0, 1, 2, 4, 8, 16)
+
+CODE_NAMES = {
+    value: name
+    for name, value in vars(CODE).items()
+    if not name.startswith("_") and isinstance(value, int)
+}
+
+
+class Histogram:
+    """Counts of observed values by bucket, with their count and sum."""
+
+    __slots__ = ("bounds", "buckets", "count", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Return (upper bound, count of values <= bound) pairs, ending with inf."""
+        pairs = []
+        total = 0
+        for bound, count in zip((*self.bounds, float("inf")), self.buckets):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class CodeStats:
+    """Statistics for one message code."""
+
+    __slots__ = (
+        "requests",
+        "retries",
+        "timeouts",
+        "errors",
+        "bytes_out",
+        "bytes_in",
+        "messages_in",
+        "pushes",
+        "push_dropped",
+        "push_coalesced",
+        "latency",
+    )
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.messages_in = 0
+        self.pushes = 0
+        self.push_dropped = 0
+        self.push_coalesced = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+
+
+class MetricsCollector:
+    """
+    Class for collecting statistics on the messages of a ScreenLogic connection.
+
+    Requests are counted by the code they were sent with and received messages by
+    the code they arrived with, which for responses is the request code plus one.
+    Response latency, timeouts, retries and error responses are recorded against the
+    request code.
+
+    Collection is disabled by not giving a collector to the gateway or protocol.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._started = clock()
+        self._codes: dict[int, CodeStats] = {}
+        self._frames = Histogram(FRAME_BUCKETS)
+        self._decode: dict[str, Histogram] = {}
+
+    def code_stats(self, code: int) -> CodeStats:
+        """Return the statistics for a message code."""
+        if (stats := self._codes.get(code)) is None:
+            stats = self._codes[code] = CodeStats()
+        return stats
+
+    def reset(self) -> None:
+        """Discard everything collected so far."""
+        self._started = self._clock()
+        self._codes.clear()
+        self._frames = Histogram(FRAME_BUCKETS)
+        self._decode.clear()
+
+    def record_request(self, code: int, attempt: int) -> None:
+        stats = self.code_stats(code)
+        stats.requests += 1
+        if attempt:
+            stats.retries += 1
+
+    def record_response(self, code: int, latency: float, error: bool = False) -> None:
+        stats = self.code_stats(code)
+        stats.latency.observe(latency)
+        if error:
+            stats.errors += 1
+
+    def record_timeout(self, code: int) -> None:
+        self.code_stats(code).timeouts += 1
+
+    def record_sent(self, code: int, nbytes: int) -> None:
+        self.code_stats(code).bytes_out += nbytes
+
+    def record_received(self, code: int, nbytes: int, pushed: bool = False) -> None:
+        stats = self.code_stats(code)
+        stats.bytes_in += nbytes
+        stats.messages_in += 1
+        if pushed:
+            stats.pushes += 1
+
+    def record_push_dropped(self, code: int, count: int = 1) -> None:
+        self.code_stats(code).push_dropped += count
+
+    def record_push_coalesced(self, code: int, count: int = 1) -> None:
+        self.code_stats(code).push_coalesced += count
+
+    def record_frames(self, count: int) -> None:
+        """Record the number of messages framed from one read."""
+        self._frames.observe(count)
+
+    def record_decode(self, decoder: str, seconds: float) -> None:
+        if (histogram := self._decode.get(decoder)) is None:
+            histogram = self._decode[decoder] = Histogram(DECODE_BUCKETS)
+        histogram.observe(seconds)
+
+    def as_dict(self) -> dict:
+        """Return everything collected as plain dicts, lists and numbers."""
+        elapsed = max(self._clock() - self._started, 1e-9)
+        return {
+            "elapsed": elapsed,
+            "codes": {
+                code: {
+                    "name": CODE_NAMES.get(code),
+                    "requests": stats.requests,
+                    "retries": stats.retries,
+                    "timeouts": stats.timeouts,
+                    "errors": stats.errors,
+                    "bytes_out": stats.bytes_out,
+                    "bytes_in": stats.bytes_in,
+                    "messages_in": stats.messages_in,
+                    "pushes": stats.pushes,
+                    "push_rate": stats.pushes / elapsed,
+                    "push_dropped": stats.push_dropped,
+                    "push_coalesced": stats.push_coalesced,
+                    "latency": stats.latency.as_dict(),
+                }
+                for code, stats in sorted(self._codes.items())
+            },
+            "frames_per_read": self._frames.as_dict(),
+            "decode": {
+                decoder: histogram.as_dict()
+                for decoder, histogram in sorted(self._decode.items())
+            },
+        }
+
+    def to_prometheus(
+        self, prefix: str = "screenlogic", labels: dict[str, str] | None = None
+    ) -> str:
+        """
+        Return everything collected in the Prometheus text exposition format.
+
+        'labels' are added to every sample, e.g. to tell gateways apart.
+        """
+        lines = []
+        codes = sorted(self._codes.items())
+
+        def counter(name: str, help_text: str, attr: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for code, stats in codes:
+                lines.append(
+                    f"{prefix}_{name}{_labels(labels, code=code)} {getattr(stats, attr)}"
+                )
+
+        counter("requests_total", "Requests sent, including retries.", "requests")
+        counter("retries_total", "Requests sent as a retry.", "retries")
+        counter("timeouts_total", "Requests that timed out.", "timeouts")
+        counter("error_responses_total", "Requests answered with an error.", "errors")
+        counter("sent_bytes_total", "Bytes sent.", "bytes_out")
+        counter("received_bytes_total", "Bytes received.", "bytes_in")
+        counter("received_messages_total", "Messages received.", "messages_in")
+        counter("push_messages_total", "Unsolicited messages received.", "pushes")
+        counter(
+            "push_dropped_total",
+            "Unsolicited messages dropped from a full queue.",
+            "push_dropped",
+        )
+        counter(
+            "push_coalesced_total",
+            "Unsolicited messages replaced by a newer one before handling.",
+            "push_coalesced",
+        )
+
+        _histogram_lines(
+            lines,
+            f"{prefix}_response_seconds",
+            "Seconds from sending a request to its response.",
+            [(_labels(labels, code=code), stats.latency) for code, stats in codes],
+        )
+        _histogram_lines(
+            lines,
+            f"{prefix}_frames_per_read",
+            "Messages framed from each read from the connection.",
+            [(_labels(labels), self._frames)],
+        )
+        _histogram_lines(
+            lines,
+            f"{prefix}_decode_seconds",
+            "Seconds spent decoding a message.",
+            [
+                (_labels(labels, decoder=decoder), histogram)
+                for decoder, histogram in sorted(self._decode.items())
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+
+def timed_decode(metrics: MetricsCollector | None, decoder: Callable, *args) -> Any:
+    """Call 'decoder' with 'args', recording how long it took if 'metrics' is set."""
+    if metrics is None:
+        return decoder(*args)
+    start = time.perf_counter()
+    try:
+        return decoder(*args)
+    finally:
+        metrics.record_decode(decoder.__name__, time.perf_counter() - start)
+
+
+def _label_value(value) -> str:
+    """Escape a label value as the Prometheus text format requires."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str] | None, **extra) -> str:
+    """Return a Prometheus label set."""
+    items = {**(labels or {}), **extra}
+    if not items:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{key}="{_label_value(value)}"' for key, value in items.items())
+        + "}"
+    )
+
+
+def _histogram_lines(
+    lines: list[str], name: str, help_text: str, series: list[tuple[str, Histogram]]
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for label_set, histogram in series:
+        inner = label_set[1:-1]
+        for bound, count in histogram.cumulative():
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            bucket_labels = f'{{{inner + "," if inner else ""}le="{le}"}}'
+            lines.append(f"{name}_bucket{bucket_labels} {count}")
+        lines.append(f"{name}_sum{label_set} {histogram.sum}")
+        lines.append(f"{name}_count{label_set} {histogram.count}")
@@ -1,16 +1,59 @@
 # flake8: noqa F401
-from .button import async_request_pool_button_press
-from .chemistry import async_request_chemistry, async_request_set_chem_data
-from .client import async_request_add_client, async_request_remove_client
-from .config import async_request_pool_config
-from .datetime import async_request_date_time, async_request_set_date_time
-from .equipment import async_request_equipment_config
-from .gateway import async_request_gateway_version
-from .heat import async_request_set_heat_mode, async_request_set_heat_setpoint
-from .lights import async_request_pool_lights_command
-from .login import async_connect_to_gateway
-from .ping import async_request_ping
-from .pump import async_request_pump_status
-from .status import async_request_pool_status
-from .scg import async_request_scg_config, async_request_set_scg_config
-from .request import async_make_request
+
+# Avoids importing typing, which costs more than the rest of this module.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .button import async_request_pool_button_press
+    from .chemistry import async_request_chemistry, async_request_set_chem_data
+    from .client import async_request_add_client, async_request_remove_client
+    from .config import async_request_pool_config
+    from .datetime import async_request_date_time, async_request_set_date_time
+    from .equipment import async_request_equipment_config
+    from .gateway import async_request_gateway_version
+    from .heat import async_request_set_heat_mode, async_request_set_heat_setpoint
+    from .lights import async_request_pool_lights_command
+    from .login import async_connect_to_gateway
+    from .ping import async_request_ping
+    from .pump import async_request_pump_status
+    from .status import async_request_pool_status
+    from .scg import async_request_scg_config, async_request_set_scg_config
+    from .request import async_make_request
+
+# Request functions are imported from their modules on first access, so importing
+# one module of this package does not load every request and decoder.
+_LAZY_IMPORTS = {
+    "async_request_pool_button_press": ".button",
+    "async_request_chemistry": ".chemistry",
+    "async_request_set_chem_data": ".chemistry",
+    "async_request_add_client": ".client",
+    "async_request_remove_client": ".client",
+    "async_request_pool_config": ".config",
+    "async_request_date_time": ".datetime",
+    "async_request_set_date_time": ".datetime",
+    "async_request_equipment_config": ".equipment",
+    "async_request_gateway_version": ".gateway",
+    "async_request_set_heat_mode": ".heat",
+    "async_request_set_heat_setpoint": ".heat",
+    "async_request_pool_lights_command": ".lights",
+    "async_connect_to_gateway": ".login",
+    "async_request_ping": ".ping",
+    "async_request_pump_status": ".pump",
+    "async_request_pool_status": ".status",
+    "async_request_scg_config": ".scg",
+    "async_request_set_scg_config": ".scg",
+    "async_make_request": ".request",
+}
+
+
+def __getattr__(name: str):
+    if (module := _LAZY_IMPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted((*globals(), *_LAZY_IMPORTS))
@@ -1,311 +1,346 @@
 # import json
 import struct
 
-from ..const.common import (
-    DEVICE_TYPE,
-    ON_OFF,
-    STATE_TYPE,
-    UNIT,
-    ScreenLogicResponseError,
-)
+from ..const.common import ON_OFF, ScreenLogicResponseError
 from ..const.data import ATTR, DEVICE, GROUP, VALUE, UNKNOWN
 from ..const.msg import CODE
 from ..device_const.chemistry import (
     ALARM_FLAG,
     ALERT_FLAG,
     BALANCE_FLAG,
-    CHEM_RANGE,
     DOSE_MASK,
-    DOSE_STATE,
 )
+from ..diff import NO_CHANGES, ChangeSink
+from ..metrics import timed_decode
+from .metadata import setValue
 from .protocol import ScreenLogicProtocol
 from .request import async_make_request
-from .utility import getSome, getTemperatureUnit
+from .utility import getTemperatureUnit
+
+# Chemistry layouts. Most IntelliChem values are big-endian.
+CHEMISTRY_HEADER = struct.Struct("<IB")
+CHEMISTRY_DATA = struct.Struct(">4H2I2H3B3H13B")
+
+CHEM_SENSOR = (DEVICE.INTELLICHEM, GROUP.SENSOR)
+CHEM_CONFIG = (DEVICE.INTELLICHEM, GROUP.CONFIGURATION)
+CHEM_DOSING = (DEVICE.INTELLICHEM, GROUP.DOSE_STATUS)
+CHEM_ALARM = (DEVICE.INTELLICHEM, GROUP.ALARM)
+CHEM_ALERT = (DEVICE.INTELLICHEM, GROUP.ALERT)
+CHEM_BALANCE = (DEVICE.INTELLICHEM, GROUP.WATER_BALANCE)
 
 
 async def async_request_chemistry(
-    protocol: ScreenLogicProtocol, data: dict, max_retries: int
+    protocol: ScreenLogicProtocol,
+    data: dict,
+    max_retries: int,
+    last: bytes | None = None,
 ) -> bytes:
     if result := await async_make_request(
         protocol, CODE.CHEMISTRY_QUERY, struct.pack("<I", 0), max_retries
     ):
-        decode_chemistry(result, data)
+        if result != last:
+            timed_decode(protocol.metrics, decode_chemistry, result, data)
         return result
 
 
 # pylint: disable=unused-variable
-def decode_chemistry(buff: bytes, data: dict) -> None:
+def decode_chemistry(
+    buff: bytes, data: dict, changes: ChangeSink = NO_CHANGES
+) -> None:
     intellichem: dict = data.setdefault(DEVICE.INTELLICHEM, {})
-
-    # size of msg?
-    intellichem[UNKNOWN(0)], offset = getSome("I", buff, 0)  # byte offset 0
-
-    # unknown value
-    intellichem[UNKNOWN(offset)], offset = getSome("B", buff, offset)  # byte offset 4
+    intellichem_changes = changes.at(DEVICE.INTELLICHEM)
+
+    # size of msg?, unknown value
+    msgSize, unknown4 = CHEMISTRY_HEADER.unpack_from(buff, 0)  # byte offset 0, 4
+    intellichem_changes.set(intellichem, UNKNOWN(0), msgSize)
+    intellichem_changes.set(intellichem, UNKNOWN(4), unknown4)
+
+    (
+        pH,  # 5
+        orp,  # 7
+        pHSetpoint,  # 9
+        orpSetpoint,  # 11
+        pHDoseTime,  # 13
+        orpDoseTime,  # 17
+        pHDoseVolume,  # 21
+        orpDoseVolume,  # 23
+        pHSupplyLevel,  # 25
+        orpSupplyLevel,  # 26
+        saturation,  # 27
+        cal,  # 28
+        cya,  # 30
+        alk,  # 32
+        saltPPM,  # 34
+        probeIsCelsius,  # 35
+        waterTemp,  # 36
+        alarms,  # 37
+        alerts,  # 38
+        dose_flags,  # 39
+        config_flags,  # 40
+        vMinor,  # 41
+        vMajor,  # 42
+        balance_flags,  # 43
+        unknown44,  # 44
+        unknown45,  # 45
+        unknown46,  # 46
+    ) = CHEMISTRY_DATA.unpack_from(buff, CHEMISTRY_HEADER.size)
 
     intellichem_sensor: dict = intellichem.setdefault(GROUP.SENSOR, {})
-
-    pH, offset = getSome(">H", buff, offset)  # 5
-    intellichem_sensor[VALUE.PH_NOW] = {
-        ATTR.NAME: "pH Now",
-        ATTR.VALUE: (pH / 100),
-        ATTR.UNIT: UNIT.PH,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    orp, offset = getSome(">H", buff, offset)  # 7
-    intellichem_sensor[VALUE.ORP_NOW] = {
-        ATTR.NAME: "ORP Now",
-        ATTR.VALUE: orp,
-        ATTR.UNIT: UNIT.MILLIVOLT,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
+    sensor_changes = changes.at(*CHEM_SENSOR)
+
+    setValue(
+        intellichem_sensor,
+        (*CHEM_SENSOR, VALUE.PH_NOW),
+        (pH / 100),
+        changes=sensor_changes,
+    )
+
+    setValue(
+        intellichem_sensor,
+        (*CHEM_SENSOR, VALUE.ORP_NOW),
+        orp,
+        changes=sensor_changes,
+    )
 
     intellichem_config: dict = intellichem.setdefault(GROUP.CONFIGURATION, {})
-
-    pHSetpoint, offset = getSome(">H", buff, offset)  # 9
-    intellichem_config[VALUE.PH_SETPOINT] = {
-        ATTR.NAME: "pH Setpoint",
-        ATTR.VALUE: (pHSetpoint / 100),
-        ATTR.UNIT: UNIT.PH,
-        ATTR.MIN_SETPOINT: CHEM_RANGE.PH_SETPOINT.minimum,
-        ATTR.MAX_SETPOINT: CHEM_RANGE.PH_SETPOINT.maximum,
-    }
-
-    orpSetpoint, offset = getSome(">H", buff, offset)  # 11
-    intellichem_config[VALUE.ORP_SETPOINT] = {
-        ATTR.NAME: "ORP Setpoint",
-        ATTR.VALUE: orpSetpoint,
-        ATTR.UNIT: UNIT.MILLIVOLT,
-        ATTR.MIN_SETPOINT: CHEM_RANGE.ORP_SETPOINT.minimum,
-        ATTR.MAX_SETPOINT: CHEM_RANGE.ORP_SETPOINT.maximum,
-    }
+    config_changes = changes.at(*CHEM_CONFIG)
+
+    setValue(
+        intellichem_config,
+        (*CHEM_CONFIG, VALUE.PH_SETPOINT),
+        (pHSetpoint / 100),
+        changes=config_changes,
+    )
+
+    setValue(
+        intellichem_config,
+        (*CHEM_CONFIG, VALUE.ORP_SETPOINT),
+        orpSetpoint,
+        changes=config_changes,
+    )
 
     intellichem_dosing: dict = intellichem.setdefault(GROUP.DOSE_STATUS, {})
-
-    pHDoseTime, offset = getSome(">I", buff, offset)  # 13
-    intellichem_dosing[VALUE.PH_LAST_DOSE_TIME] = {
-        ATTR.NAME: "Last pH Dose Time",
-        ATTR.VALUE: pHDoseTime,
-        ATTR.UNIT: UNIT.SECOND,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.DURATION,
-        ATTR.STATE_TYPE: STATE_TYPE.TOTAL_INCREASING,
-    }
-
-    orpDoseTime, offset = getSome(">I", buff, offset)  # 17
-    intellichem_dosing[VALUE.ORP_LAST_DOSE_TIME] = {
-        ATTR.NAME: "Last ORP Dose Time",
-        ATTR.VALUE: orpDoseTime,
-        ATTR.UNIT: UNIT.SECOND,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.DURATION,
-        ATTR.STATE_TYPE: STATE_TYPE.TOTAL_INCREASING,
-    }
-
-    pHDoseVolume, offset = getSome(">H", buff, offset)  # 21
-    intellichem_dosing[VALUE.PH_LAST_DOSE_VOLUME] = {
-        ATTR.NAME: "Last pH Dose Volume",
-        ATTR.VALUE: pHDoseVolume,
-        ATTR.UNIT: UNIT.MILLILITER,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.VOLUME,
-        ATTR.STATE_TYPE: STATE_TYPE.TOTAL_INCREASING,
-    }
-
-    orpDoseVolume, offset = getSome(">H", buff, offset)  # 23
-    intellichem_dosing[VALUE.ORP_LAST_DOSE_VOLUME] = {
-        ATTR.NAME: "Last ORP Dose Volume",
-        ATTR.VALUE: orpDoseVolume,
-        ATTR.UNIT: UNIT.MILLILITER,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.VOLUME,
-        ATTR.STATE_TYPE: STATE_TYPE.TOTAL_INCREASING,
-    }
-
-    pHSupplyLevel, offset = getSome("B", buff, offset)  # 25
-    intellichem_sensor[VALUE.PH_SUPPLY_LEVEL] = {
-        ATTR.NAME: "pH Supply Level",
-        ATTR.VALUE: pHSupplyLevel,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    orpSupplyLevel, offset = getSome("B", buff, offset)  # 26 (21)
-    intellichem_sensor[VALUE.ORP_SUPPLY_LEVEL] = {
-        ATTR.NAME: "ORP Supply Level",
-        ATTR.VALUE: orpSupplyLevel,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    saturation, offset = getSome("B", buff, offset)  # 27
-    intellichem_sensor[VALUE.SATURATION] = {
-        ATTR.NAME: "Saturation Index",
-        ATTR.VALUE: (saturation - 256) / 100 if saturation & 0x80 else saturation / 100,
-        ATTR.UNIT: UNIT.SATURATION_INDEX,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    cal, offset = getSome(">H", buff, offset)  # 28
-    intellichem_config[VALUE.CALCIUM_HARDNESS] = {
-        ATTR.NAME: "Calcium Hardness",
-        ATTR.VALUE: cal,
-        ATTR.UNIT: UNIT.PARTS_PER_MILLION,
-        ATTR.MIN_SETPOINT: CHEM_RANGE.CALCIUM_HARDNESS.minimum,
-        ATTR.MAX_SETPOINT: CHEM_RANGE.CALCIUM_HARDNESS.maximum,
-    }
-
-    cya, offset = getSome(">H", buff, offset)  # 30
-    intellichem_config[VALUE.CYA] = {
-        ATTR.NAME: "Cyanuric Acid",
-        ATTR.VALUE: cya,
-        ATTR.UNIT: UNIT.PARTS_PER_MILLION,
-        ATTR.MIN_SETPOINT: CHEM_RANGE.CYANURIC_ACID.minimum,
-        ATTR.MAX_SETPOINT: CHEM_RANGE.CYANURIC_ACID.maximum,
-    }
-
-    alk, offset = getSome(">H", buff, offset)  # 32
-    intellichem_config[VALUE.TOTAL_ALKALINITY] = {
-        ATTR.NAME: "Total Alkalinity",
-        ATTR.VALUE: alk,
-        ATTR.UNIT: UNIT.PARTS_PER_MILLION,
-        ATTR.MIN_SETPOINT: CHEM_RANGE.TOTAL_ALKALINITY.minimum,
-        ATTR.MAX_SETPOINT: CHEM_RANGE.TOTAL_ALKALINITY.maximum,
-    }
-
-    saltPPM, offset = getSome("B", buff, offset)  # 34
-    intellichem_config[VALUE.SALT_TDS_PPM] = {
-        ATTR.NAME: "Salt/TDS",
-        ATTR.VALUE: (saltPPM * 50),
-        ATTR.UNIT: UNIT.PARTS_PER_MILLION,
-        ATTR.MIN_SETPOINT: CHEM_RANGE.SALT_TDS.minimum,
-        ATTR.MAX_SETPOINT: CHEM_RANGE.SALT_TDS.maximum,
-    }
+    dosing_changes = changes.at(*CHEM_DOSING)
+
+    setValue(
+        intellichem_dosing,
+        (*CHEM_DOSING, VALUE.PH_LAST_DOSE_TIME),
+        pHDoseTime,
+        changes=dosing_changes,
+    )
+
+    setValue(
+        intellichem_dosing,
+        (*CHEM_DOSING, VALUE.ORP_LAST_DOSE_TIME),
+        orpDoseTime,
+        changes=dosing_changes,
+    )
+
+    setValue(
+        intellichem_dosing,
+        (*CHEM_DOSING, VALUE.PH_LAST_DOSE_VOLUME),
+        pHDoseVolume,
+        changes=dosing_changes,
+    )
+
+    setValue(
+        intellichem_dosing,
+        (*CHEM_DOSING, VALUE.ORP_LAST_DOSE_VOLUME),
+        orpDoseVolume,
+        changes=dosing_changes,
+    )
+
+    setValue(
+        intellichem_sensor,
+        (*CHEM_SENSOR, VALUE.PH_SUPPLY_LEVEL),
+        pHSupplyLevel,
+        changes=sensor_changes,
+    )
+
+    setValue(
+        intellichem_sensor,
+        (*CHEM_SENSOR, VALUE.ORP_SUPPLY_LEVEL),
+        orpSupplyLevel,
+        changes=sensor_changes,
+    )
+
+    setValue(
+        intellichem_sensor,
+        (*CHEM_SENSOR, VALUE.SATURATION),
+        (saturation - 256) / 100 if saturation & 0x80 else saturation / 100,
+        changes=sensor_changes,
+    )
+
+    setValue(
+        intellichem_config,
+        (*CHEM_CONFIG, VALUE.CALCIUM_HARDNESS),
+        cal,
+        changes=config_changes,
+    )
+
+    setValue(
+        intellichem_config,
+        (*CHEM_CONFIG, VALUE.CYA),
+        cya,
+        changes=config_changes,
+    )
+
+    setValue(
+        intellichem_config,
+        (*CHEM_CONFIG, VALUE.TOTAL_ALKALINITY),
+        alk,
+        changes=config_changes,
+    )
+
+    setValue(
+        intellichem_config,
+        (*CHEM_CONFIG, VALUE.SALT_TDS_PPM),
+        (saltPPM * 50),
+        changes=config_changes,
+    )
 
     # Probe temp unit is Celsius?
-    intellichem_config[VALUE.PROBE_IS_CELSIUS], offset = getSome(
-        "B", buff, offset
-    )  # 35
+    config_changes.set(intellichem_config, VALUE.PROBE_IS_CELSIUS, probeIsCelsius)
 
     temperature_unit = getTemperatureUnit(data)
 
-    waterTemp, offset = getSome("B", buff, offset)  # 36
-    intellichem_sensor[VALUE.PH_PROBE_WATER_TEMP] = {
-        ATTR.NAME: "pH Probe Water Temperature",
-        ATTR.VALUE: waterTemp,
-        ATTR.UNIT: temperature_unit,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.TEMPERATURE,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
+    setValue(
+        intellichem_sensor,
+        (*CHEM_SENSOR, VALUE.PH_PROBE_WATER_TEMP),
+        waterTemp,
+        temperature_unit,
+        changes=sensor_changes,
+    )
 
     intellichem_alarm: dict = intellichem.setdefault(GROUP.ALARM, {})
-
-    alarms, offset = getSome("B", buff, offset)  # 37 (32)
-    intellichem_alarm[VALUE.FLAGS] = alarms
-
-    intellichem_alarm[VALUE.FLOW_ALARM] = {
-        ATTR.NAME: "Flow Alarm",
-        ATTR.VALUE: ON_OFF.from_bool(alarms & ALARM_FLAG.FLOW).value,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
-    intellichem_alarm[VALUE.PH_HIGH_ALARM] = {
-        ATTR.NAME: "pH HIGH Alarm",
-        ATTR.VALUE: ON_OFF.from_bool(alarms & ALARM_FLAG.PH_HIGH).value,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
-    intellichem_alarm[VALUE.PH_LOW_ALARM] = {
-        ATTR.NAME: "pH LOW Alarm",
-        ATTR.VALUE: ON_OFF.from_bool(alarms & ALARM_FLAG.PH_LOW).value,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
-    intellichem_alarm[VALUE.ORP_HIGH_ALARM] = {
-        ATTR.NAME: "ORP HIGH Alarm",
-        ATTR.VALUE: ON_OFF.from_bool(alarms & ALARM_FLAG.ORP_HIGH).value,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
-    intellichem_alarm[VALUE.ORP_LOW_ALARM] = {
-        ATTR.NAME: "ORP LOW Alarm",
-        ATTR.VALUE: ON_OFF.from_bool(alarms & ALARM_FLAG.ORP_LOW).value,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
-    intellichem_alarm[VALUE.PH_SUPPLY_ALARM] = {
-        ATTR.NAME: "pH Supply Alarm",
-        ATTR.VALUE: ON_OFF.from_bool(alarms & ALARM_FLAG.PH_SUPPLY).value,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
-    intellichem_alarm[VALUE.ORP_SUPPLY_ALARM] = {
-        ATTR.NAME: "ORP Supply Alarm",
-        ATTR.VALUE: ON_OFF.from_bool(alarms & ALARM_FLAG.ORP_SUPPLY).value,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
-    intellichem_alarm[VALUE.PROBE_FAULT_ALARM] = {
-        ATTR.NAME: "Probe Fault",
-        ATTR.VALUE: ON_OFF.from_bool(alarms & ALARM_FLAG.PROBE_FAULT).value,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
+    alarm_changes = changes.at(*CHEM_ALARM)
+
+    alarm_changes.set(intellichem_alarm, VALUE.FLAGS, alarms)
+
+    setValue(
+        intellichem_alarm,
+        (*CHEM_ALARM, VALUE.FLOW_ALARM),
+        ON_OFF.from_bool(alarms & ALARM_FLAG.FLOW).value,
+        changes=alarm_changes,
+    )
+    setValue(
+        intellichem_alarm,
+        (*CHEM_ALARM, VALUE.PH_HIGH_ALARM),
+        ON_OFF.from_bool(alarms & ALARM_FLAG.PH_HIGH).value,
+        changes=alarm_changes,
+    )
+    setValue(
+        intellichem_alarm,
+        (*CHEM_ALARM, VALUE.PH_LOW_ALARM),
+        ON_OFF.from_bool(alarms & ALARM_FLAG.PH_LOW).value,
+        changes=alarm_changes,
+    )
+    setValue(
+        intellichem_alarm,
+        (*CHEM_ALARM, VALUE.ORP_HIGH_ALARM),
+        ON_OFF.from_bool(alarms & ALARM_FLAG.ORP_HIGH).value,
+        changes=alarm_changes,
+    )
+    setValue(
+        intellichem_alarm,
+        (*CHEM_ALARM, VALUE.ORP_LOW_ALARM),
+        ON_OFF.from_bool(alarms & ALARM_FLAG.ORP_LOW).value,
+        changes=alarm_changes,
+    )
+    setValue(
+        intellichem_alarm,
+        (*CHEM_ALARM, VALUE.PH_SUPPLY_ALARM),
+        ON_OFF.from_bool(alarms & ALARM_FLAG.PH_SUPPLY).value,
+        changes=alarm_changes,
+    )
+    setValue(
+        intellichem_alarm,
+        (*CHEM_ALARM, VALUE.ORP_SUPPLY_ALARM),
+        ON_OFF.from_bool(alarms & ALARM_FLAG.ORP_SUPPLY).value,
+        changes=alarm_changes,
+    )
+    setValue(
+        intellichem_alarm,
+        (*CHEM_ALARM, VALUE.PROBE_FAULT_ALARM),
+        ON_OFF.from_bool(alarms & ALARM_FLAG.PROBE_FAULT).value,
+        changes=alarm_changes,
+    )
 
     intellichem_alert: dict = intellichem.setdefault(GROUP.ALERT, {})
-
-    alerts, offset = getSome("B", buff, offset)  # 38 (33)
-    intellichem_alert[VALUE.FLAGS] = alerts
-
-    intellichem_alert[VALUE.PH_LOCKOUT] = {
-        ATTR.NAME: "pH Lockout",
-        ATTR.VALUE: ON_OFF.from_bool(alerts & ALERT_FLAG.PH_LOCKOUT).value,
-    }
-    intellichem_alert[VALUE.PH_LIMIT] = {
-        ATTR.NAME: "pH Dose Limit Reached",
-        ATTR.VALUE: ON_OFF.from_bool(alerts & ALERT_FLAG.PH_LIMIT).value,
-    }
-    intellichem_alert[VALUE.ORP_LIMIT] = {
-        ATTR.NAME: "ORP Dose Limit Reached",
-        ATTR.VALUE: ON_OFF.from_bool(alerts & ALERT_FLAG.ORP_LIMIT).value,
-    }
-
-    dose_flags, offset = getSome("B", buff, offset)  # 39 (34)
-    intellichem_dosing[VALUE.FLAGS] = dose_flags
-
-    intellichem_dosing[VALUE.PH_DOSING_STATE] = {
-        ATTR.NAME: "pH Dosing State",
-        ATTR.VALUE: (dose_flags & DOSE_MASK.PH_STATE) >> 4,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ENUM,
-        ATTR.ENUM_OPTIONS: [state.title for state in DOSE_STATE],
-    }
-    intellichem_dosing[VALUE.ORP_DOSING_STATE] = {
-        ATTR.NAME: "ORP Dosing State",
-        ATTR.VALUE: (dose_flags & DOSE_MASK.ORP_STATE) >> 6,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ENUM,
-        ATTR.ENUM_OPTIONS: [state.title for state in DOSE_STATE],
-    }
-
-    config_flags, offset = getSome("B", buff, offset)  # 40 (35)
-    intellichem_config[VALUE.FLAGS] = config_flags
-
-    vMinor, offset = getSome("B", buff, offset)  # 41 (36)
-    vMajor, offset = getSome("B", buff, offset)  # 42 (37)
-    intellichem[VALUE.FIRMWARE] = {
-        ATTR.NAME: "IntelliChem Firmware",
-        ATTR.VALUE: f"{vMajor}.{vMinor:03}",
-        ATTR.MAJOR: vMajor,
-        ATTR.MINOR: vMinor,
-    }
+    alert_changes = changes.at(*CHEM_ALERT)
+
+    alert_changes.set(intellichem_alert, VALUE.FLAGS, alerts)
+
+    setValue(
+        intellichem_alert,
+        (*CHEM_ALERT, VALUE.PH_LOCKOUT),
+        ON_OFF.from_bool(alerts & ALERT_FLAG.PH_LOCKOUT).value,
+        changes=alert_changes,
+    )
+    setValue(
+        intellichem_alert,
+        (*CHEM_ALERT, VALUE.PH_LIMIT),
+        ON_OFF.from_bool(alerts & ALERT_FLAG.PH_LIMIT).value,
+        changes=alert_changes,
+    )
+    setValue(
+        intellichem_alert,
+        (*CHEM_ALERT, VALUE.ORP_LIMIT),
+        ON_OFF.from_bool(alerts & ALERT_FLAG.ORP_LIMIT).value,
+        changes=alert_changes,
+    )
+
+    dosing_changes.set(intellichem_dosing, VALUE.FLAGS, dose_flags)
+
+    setValue(
+        intellichem_dosing,
+        (*CHEM_DOSING, VALUE.PH_DOSING_STATE),
+        (dose_flags & DOSE_MASK.PH_STATE) >> 4,
+        changes=dosing_changes,
+    )
+    setValue(
+        intellichem_dosing,
+        (*CHEM_DOSING, VALUE.ORP_DOSING_STATE),
+        (dose_flags & DOSE_MASK.ORP_STATE) >> 6,
+        changes=dosing_changes,
+    )
+
+    config_changes.set(intellichem_config, VALUE.FLAGS, config_flags)
+
+    intellichem_changes.set(
+        intellichem,
+        VALUE.FIRMWARE,
+        {
+            ATTR.NAME: "IntelliChem Firmware",
+            ATTR.VALUE: f"{vMajor}.{vMinor:03}",
+            ATTR.MAJOR: vMajor,
+            ATTR.MINOR: vMinor,
+        },
+    )
 
     intellichem_balance: dict = intellichem.setdefault(GROUP.WATER_BALANCE, {})
-    balance_flags, offset = getSome("B", buff, offset)  # 43
-    intellichem_balance[VALUE.FLAGS] = balance_flags
+    balance_changes = changes.at(*CHEM_BALANCE)
+    balance_changes.set(intellichem_balance, VALUE.FLAGS, balance_flags)
 
     # SI <= -0.41
-    intellichem_balance[VALUE.CORROSIVE] = {
-        ATTR.NAME: "SI Corrosive",
-        ATTR.VALUE: ON_OFF.from_bool(balance_flags & BALANCE_FLAG.CORROSIVE).value,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
+    setValue(
+        intellichem_balance,
+        (*CHEM_BALANCE, VALUE.CORROSIVE),
+        ON_OFF.from_bool(balance_flags & BALANCE_FLAG.CORROSIVE).value,
+        changes=balance_changes,
+    )
 
     # SI >= +0.53
-    intellichem_balance[VALUE.SCALING] = {
-        ATTR.NAME: "SI Scaling",
-        ATTR.VALUE: ON_OFF.from_bool(balance_flags & BALANCE_FLAG.SCALING).value,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
-
-    intellichem[UNKNOWN(offset)], offset = getSome("B", buff, offset)  # 44
-    intellichem[UNKNOWN(offset)], offset = getSome("B", buff, offset)  # 45
-    intellichem[UNKNOWN(offset)], offset = getSome("B", buff, offset)  # 46
+    setValue(
+        intellichem_balance,
+        (*CHEM_BALANCE, VALUE.SCALING),
+        ON_OFF.from_bool(balance_flags & BALANCE_FLAG.SCALING).value,
+        changes=balance_changes,
+    )
+
+    intellichem_changes.set(intellichem, UNKNOWN(44), unknown44)
+    intellichem_changes.set(intellichem, UNKNOWN(45), unknown45)
+    intellichem_changes.set(intellichem, UNKNOWN(46), unknown46)
 
 
 async def async_request_set_chem_data(
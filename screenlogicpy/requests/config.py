@@ -4,13 +4,25 @@ import struct
 from ..const.msg import CODE
 from ..const.data import ATTR, DEVICE, GROUP, VALUE, UNKNOWN
 from ..device_const.system import CONTROLLER, EQUIPMENT_FLAG, EQUIPMENT_MASK_736
+from ..metrics import timed_decode
 from .protocol import ScreenLogicProtocol
 from .request import async_make_request
-from .utility import getAdapterVersion, getSome, getString
+from .utility import getAdapterVersion, getString
+
+# Pool config layouts
+CONFIG_HEADER = struct.Struct("<I8BI")  # controller id..equipment flags
+CONFIG_COUNT = struct.Struct("<I")
+CONFIG_CIRCUIT_ID = struct.Struct("<i")
+CONFIG_CIRCUIT = struct.Struct("<8BH2B")
+CONFIG_COLOR = struct.Struct("<3I")
+CONFIG_TRAILER = struct.Struct("<8B2I")  # pump data, interface tabs, show alarms
 
 
 async def async_request_pool_config(
-    protocol: ScreenLogicProtocol, data: dict, max_retries: int
+    protocol: ScreenLogicProtocol,
+    data: dict,
+    max_retries: int,
+    last: bytes | None = None,
 ) -> bytes:
     if result := await async_make_request(
         protocol,
@@ -18,37 +30,47 @@ async def async_request_pool_config(
         struct.pack("<2I", 0, 0),  # 0,1 yields different return
         max_retries,
     ):
-        decode_pool_config(result, data)
+        if result != last:
+            timed_decode(protocol.metrics, decode_pool_config, result, data)
         return result
 
 
 def decode_pool_config(buff: bytes, data: dict) -> dict:
     controller: dict = data.setdefault(DEVICE.CONTROLLER, {})
 
-    controller[VALUE.CONTROLLER_ID], offset = getSome("I", buff, 0)
+    (
+        controller_id,
+        pool_min_setpoint,
+        pool_max_setpoint,
+        spa_min_setpoint,
+        spa_max_setpoint,
+        degC,
+        c_type,
+        h_type,
+        controller_data,
+        equipFlags,
+    ) = CONFIG_HEADER.unpack_from(buff, 0)
+    offset = CONFIG_HEADER.size
+
+    controller[VALUE.CONTROLLER_ID] = controller_id
 
     controller_config: dict = controller.setdefault(GROUP.CONFIGURATION, {})
     body_type_setpoint: dict = controller_config.setdefault(ATTR.BODY_TYPE, {})
 
-    for i in range(2):
+    for i, (minSetPoint, maxSetPoint) in enumerate(
+        ((pool_min_setpoint, pool_max_setpoint), (spa_min_setpoint, spa_max_setpoint))
+    ):
         body_type_setpoint_indexed: dict = body_type_setpoint.setdefault(i, {})
-
-        minSetPoint, offset = getSome("B", buff, offset)
         body_type_setpoint_indexed[ATTR.MIN_SETPOINT] = minSetPoint
-
-        maxSetPoint, offset = getSome("B", buff, offset)
         body_type_setpoint_indexed[ATTR.MAX_SETPOINT] = maxSetPoint
 
-    degC, offset = getSome("B", buff, offset)
     controller_config[VALUE.IS_CELSIUS] = {
         ATTR.NAME: "Is Celsius",
         ATTR.VALUE: degC,
     }
 
-    c_type, offset = getSome("B", buff, offset)
     controller_config[VALUE.CONTROLLER_TYPE] = c_type
 
-    h_type, offset = getSome("B", buff, offset)
     controller_config[VALUE.HARDWARE_TYPE] = h_type
 
     controller[VALUE.MODEL] = {
@@ -56,10 +78,9 @@ def decode_pool_config(buff: bytes, data: dict) -> dict:
         ATTR.VALUE: CONTROLLER.model_from_type(c_type, h_type),
     }
 
-    controller_config[VALUE.CONTROLLER_DATA], offset = getSome("B", buff, offset)
+    controller_config[VALUE.CONTROLLER_DATA] = controller_data
 
     controller_equipment: dict = controller.setdefault(GROUP.EQUIPMENT, {})
-    equipFlags, offset = getSome("I", buff, offset)
 
     # Include only known flags.
     if (minor := getAdapterVersion(data)) is not None:
@@ -76,13 +97,15 @@ def decode_pool_config(buff: bytes, data: dict) -> dict:
 
     controller_config[VALUE.DEFAULT_CIRCUIT_NAME], offset = getString(buff, offset)
 
-    circuitCount, offset = getSome("I", buff, offset)
+    (circuitCount,) = CONFIG_COUNT.unpack_from(buff, offset)
+    offset += CONFIG_COUNT.size
     controller_config[VALUE.CIRCUIT_COUNT] = circuitCount
 
     circuit: dict = data.setdefault(DEVICE.CIRCUIT, {})
 
     for i in range(circuitCount):
-        circuit_id, offset = getSome("i", buff, offset)
+        (circuit_id,) = CONFIG_CIRCUIT_ID.unpack_from(buff, offset)
+        offset += CONFIG_CIRCUIT_ID.size
 
         circuit_indexed: dict = circuit.setdefault(circuit_id, {})
 
@@ -90,48 +113,57 @@ def decode_pool_config(buff: bytes, data: dict) -> dict:
 
         circuit_indexed[ATTR.NAME], offset = getString(buff, offset)
 
+        (
+            name_index,
+            func,
+            interface,
+            flags,
+            color_set,
+            color_position,
+            color_stagger,
+            device_id,
+            default_runtime,
+            unknown_a,
+            unknown_b,
+        ) = CONFIG_CIRCUIT.unpack_from(buff, offset)
+
         circuit_indexed_config: dict = circuit_indexed.setdefault(
             GROUP.CONFIGURATION, {}
         )
-        circuit_indexed_config[ATTR.NAME_INDEX], offset = getSome("B", buff, offset)
+        circuit_indexed_config[ATTR.NAME_INDEX] = name_index
 
-        func, offset = getSome("B", buff, offset)
         circuit_indexed[ATTR.FUNCTION] = func  # CIRCUIT_FUNCTION(func)
 
-        interface, offset = getSome("B", buff, offset)
         circuit_indexed[ATTR.INTERFACE] = interface  # INTERFACE_GROUP(interface)
 
-        circuit_indexed_config[VALUE.FLAGS], offset = getSome("B", buff, offset)
+        circuit_indexed_config[VALUE.FLAGS] = flags
 
-        color_set, offset = getSome("B", buff, offset)
-        color_position, offset = getSome("B", buff, offset)
-        color_stagger, offset = getSome("B", buff, offset)
         circuit_indexed[GROUP.COLOR] = {
             ATTR.COLOR_SET: color_set,
             ATTR.COLOR_POSITION: color_position,
             ATTR.COLOR_STAGGER: color_stagger,
         }
 
-        circuit_indexed[ATTR.DEVICE_ID], offset = getSome("B", buff, offset)
+        circuit_indexed[ATTR.DEVICE_ID] = device_id
 
-        circuit_indexed_config[ATTR.DEFAULT_RUNTIME], offset = getSome(
-            "H", buff, offset
-        )
+        circuit_indexed_config[ATTR.DEFAULT_RUNTIME] = default_runtime
+
+        circuit_indexed_config[UNKNOWN(offset + 10)] = unknown_a
 
-        circuit_indexed_config[UNKNOWN(offset)], offset = getSome("B", buff, offset)
+        circuit_indexed_config[UNKNOWN(offset + 11)] = unknown_b
 
-        circuit_indexed_config[UNKNOWN(offset)], offset = getSome("B", buff, offset)
+        offset += CONFIG_CIRCUIT.size
 
-    colorCount, offset = getSome("I", buff, offset)
+    (colorCount,) = CONFIG_COUNT.unpack_from(buff, offset)
+    offset += CONFIG_COUNT.size
     controller_config[VALUE.COLOR_COUNT] = colorCount
 
     colors = []
 
     for i in range(colorCount):
         colorName, offset = getString(buff, offset)
-        rgbR, offset = getSome("I", buff, offset)
-        rgbG, offset = getSome("I", buff, offset)
-        rgbB, offset = getSome("I", buff, offset)
+        rgbR, rgbG, rgbB = CONFIG_COLOR.unpack_from(buff, offset)
+        offset += CONFIG_COLOR.size
         colors.append(
             {
                 ATTR.NAME: colorName,
@@ -140,15 +172,19 @@ def decode_pool_config(buff: bytes, data: dict) -> dict:
         )
     controller_config[GROUP.COLOR] = colors
 
-    pump_count = 8
+    (
+        *pump_data,
+        interface_tab_flags,
+        show_alarms,
+    ) = CONFIG_TRAILER.unpack_from(buff, offset)
 
     pump: dict = data.setdefault(DEVICE.PUMP, {})
 
-    for i in range(pump_count):
+    for i, pump_data_indexed in enumerate(pump_data):
         pump_indexed = pump.setdefault(i, {})
 
-        pump_indexed[VALUE.DATA], offset = getSome("B", buff, offset)
+        pump_indexed[VALUE.DATA] = pump_data_indexed
 
-    controller_config[VALUE.INTERFACE_TAB_FLAGS], offset = getSome("I", buff, offset)
+    controller_config[VALUE.INTERFACE_TAB_FLAGS] = interface_tab_flags
 
-    controller_config[VALUE.SHOW_ALARMS], offset = getSome("I", buff, offset)
+    controller_config[VALUE.SHOW_ALARMS] = show_alarms
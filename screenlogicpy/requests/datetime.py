@@ -4,18 +4,23 @@ import struct
 from ..const.common import ScreenLogicResponseError
 from ..const.data import ATTR, DEVICE, GROUP, VALUE
 from ..const.msg import CODE
+from ..metrics import timed_decode
 from .protocol import ScreenLogicProtocol
 from .request import async_make_request
 from .utility import getSome, getTime, encodeMessageTime
 
 
 async def async_request_date_time(
-    protocol: ScreenLogicProtocol, data: dict, max_retries: int = None
+    protocol: ScreenLogicProtocol,
+    data: dict,
+    max_retries: int = None,
+    last: bytes | None = None,
 ) -> bytes:
     if result := await async_make_request(
         protocol, CODE.GET_DATETIME_QUERY, max_retries=max_retries
     ):
-        decode_date_time(result, data)
+        if result != last:
+            timed_decode(protocol.metrics, decode_date_time, result, data)
         return result
 
 
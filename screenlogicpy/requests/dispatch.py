@@ -0,0 +1,104 @@
+"""Serialized dispatch of unsolicited ScreenLogic messages to their handlers."""
+
+import asyncio
+from collections import deque
+import logging
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from ..const.msg import CODE, COM_PUSH_DEPTH
+
+if TYPE_CHECKING:
+    from ..metrics import MetricsCollector
+
+_LOGGER = logging.getLogger(__name__)
+
+# Pushed messages that carry a complete state, so only the latest waiting one of
+# each needs handling.
+PUSH_COALESCE_CODES = frozenset(
+    (CODE.STATUS_CHANGED, CODE.CHEMISTRY_CHANGED, CODE.COLOR_UPDATE)
+)
+
+
+class PushDispatcher:
+    """
+    Class to hand unsolicited messages to their handlers one at a time per code.
+
+    Each message code has its own queue, drained by at most one task, so the
+    handler for a code sees its messages in the order they arrived and never runs
+    concurrently with itself. A message for a code in 'coalesce' replaces the one
+    already waiting for that code. Other codes hold up to 'depth' waiting messages,
+    and drop the oldest when another arrives.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        depth: int = COM_PUSH_DEPTH,
+        coalesce: frozenset[int] = PUSH_COALESCE_CODES,
+        metrics: "MetricsCollector" = None,
+    ) -> None:
+        self._loop = loop
+        self.depth = depth
+        self._coalesce = coalesce
+        self.metrics = metrics
+        self._queues: dict[int, deque[tuple[bytes, Callable, tuple]]] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+        self.dropped: dict[int, int] = {}
+        self.coalesced: dict[int, int] = {}
+
+    @property
+    def depth(self) -> int:
+        """Messages of a code that is not coalesced that may wait at once."""
+        return self._depth
+
+    @depth.setter
+    def depth(self, depth: int) -> None:
+        if depth < 1:
+            raise ValueError(f"Invalid push queue depth: {depth}")
+        self._depth = depth
+
+    def pending(self, code: int) -> int:
+        """Return the number of messages waiting for a code's handler."""
+        return len(self._queues.get(code, ()))
+
+    def dispatch(
+        self,
+        code: int,
+        data: bytes,
+        handler: Callable[..., Awaitable],
+        args: tuple = (),
+    ) -> None:
+        """Queue a message for 'handler', starting a task to drain the queue if idle."""
+        queue = self._queues.setdefault(code, deque())
+        if queue and code in self._coalesce:
+            self.coalesced[code] = self.coalesced.get(code, 0) + len(queue)
+            if self.metrics is not None:
+                self.metrics.record_push_coalesced(code, len(queue))
+            queue.clear()
+        elif (excess := len(queue) - self._depth + 1) > 0:
+            # More than one if the depth was lowered since the queue filled.
+            for _ in range(excess):
+                queue.popleft()
+            self.dropped[code] = self.dropped.get(code, 0) + excess
+            if self.metrics is not None:
+                self.metrics.record_push_dropped(code, excess)
+        queue.append((data, handler, args))
+        if code not in self._tasks:
+            self._tasks[code] = self._loop.create_task(self._async_drain(code, queue))
+
+    async def _async_drain(self, code: int, queue: deque) -> None:
+        try:
+            while queue:
+                data, handler, args = queue.popleft()
+                _LOGGER.debug(f"Calling {handler}")
+                try:
+                    await handler(data, *args)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(f"Error handling message code {code}")
+        finally:
+            self._tasks.pop(code, None)
+
+    def clear(self) -> None:
+        """Discard waiting messages. Handlers already running are left to finish."""
+        for queue in self._queues.values():
+            queue.clear()
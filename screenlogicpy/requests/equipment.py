@@ -1,6 +1,7 @@
 import struct
 
 from ..const.msg import CODE
+from ..metrics import timed_decode
 from .protocol import ScreenLogicProtocol
 from .request import async_make_request
 from .utility import getSome, getArray
@@ -12,7 +13,7 @@ async def async_request_equipment_config(
     if result := await async_make_request(
         protocol, CODE.EQUIPMENT_QUERY, struct.pack("<2I", 0, 0), max_retries
     ):
-        decode_equipment_config(result, data)
+        timed_decode(protocol.metrics, decode_equipment_config, result, data)
         return result
 
 
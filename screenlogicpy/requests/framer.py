@@ -0,0 +1,98 @@
+"""Reassembles ScreenLogic messages from a stream of received bytes."""
+import struct
+
+from ..const.msg import HEADER_LENGTH
+from .utility import takeMessage
+
+# Offset of the payload length within the message header.
+_DATA_LENGTH = struct.Struct("<I")
+_DATA_LENGTH_OFFSET = 4
+
+DEFAULT_BUFFER_SIZE = 4096
+
+
+class MessageFramer:
+    """
+    Buffer for framing ScreenLogic messages.
+
+    Incoming data is appended at a write offset and complete messages are taken
+    from a read offset, so partial messages stay in place until the rest of their
+    data arrives. Complete messages are sliced out with memoryviews and handed to
+    takeMessage() without intermediate copies.
+    """
+
+    def __init__(self, size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self._size = size
+        self._buff = bytearray(size)
+        self._read = 0
+        self._write = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered bytes not yet framed."""
+        return self._write - self._read
+
+    @property
+    def capacity(self) -> int:
+        """Current size of the underlying buffer."""
+        return len(self._buff)
+
+    def clear(self) -> None:
+        """Discard any buffered data."""
+        self._read = self._write = 0
+        if len(self._buff) > self._size:
+            self._buff = bytearray(self._size)
+
+    def feed(self, data: bytes) -> list[tuple[int, int, bytes]]:
+        """Add received data and return any messages it completes."""
+        if self._read == self._write:
+            # Nothing pending, so frame directly from the received data and only
+            # buffer what remains of a trailing partial message.
+            with memoryview(data) as view:
+                complete, consumed = _take_complete(view, 0, len(view))
+                if consumed < len(view):
+                    self._read = self._write = 0
+                    self._append(view[consumed:])
+            return complete
+
+        with memoryview(data) as view:
+            self._append(view)
+        with memoryview(self._buff) as view:
+            complete, self._read = _take_complete(view, self._read, self._write)
+        if self._read == self._write:
+            self.clear()
+        return complete
+
+    def _append(self, data: memoryview) -> None:
+        """Copy data in at the write offset, making room if needed."""
+        needed = self._write + len(data)
+        if needed > len(self._buff):
+            pending = self._write - self._read
+            if pending + len(data) > len(self._buff):
+                # Grow to fit. Only the unframed bytes are carried over.
+                grown = bytearray(max(len(self._buff) * 2, pending + len(data)))
+                grown[:pending] = self._buff[self._read : self._write]
+                self._buff = grown
+            else:
+                # Move the partial message back to the start of the buffer.
+                self._buff[:pending] = self._buff[self._read : self._write]
+            self._read, self._write = 0, pending
+        end = self._write + len(data)
+        self._buff[self._write : end] = data
+        self._write = end
+
+
+def _take_complete(
+    view: memoryview, start: int, end: int
+) -> tuple[list[tuple[int, int, bytes]], int]:
+    """Return complete messages between start and end, and where framing stopped."""
+    complete = []
+    while end - start >= HEADER_LENGTH:
+        total = (
+            HEADER_LENGTH
+            + _DATA_LENGTH.unpack_from(view, start + _DATA_LENGTH_OFFSET)[0]
+        )
+        if end - start < total:
+            break
+        complete.append(takeMessage(view[start : start + total]))
+        start += total
+    return complete, start
@@ -1,5 +1,6 @@
 from ..const.msg import CODE
 from ..const.data import ATTR, DEVICE, VALUE
+from ..metrics import timed_decode
 from .protocol import ScreenLogicProtocol
 from .request import async_make_request
 from .utility import decodeMessageString
@@ -11,7 +12,7 @@ async def async_request_gateway_version(
     if result := await async_make_request(
         protocol, CODE.VERSION_QUERY, max_retries=max_retries
     ):
-        decode_version(result, data)
+        timed_decode(protocol.metrics, decode_version, result, data)
         return result
 
 
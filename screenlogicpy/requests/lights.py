@@ -3,6 +3,7 @@ import struct
 from ..const.common import ScreenLogicResponseError
 from ..const.msg import CODE
 from ..const.data import ATTR, DEVICE, GROUP
+from ..diff import NO_CHANGES, ChangeSink
 from .protocol import ScreenLogicProtocol
 from .request import async_make_request
 from .utility import getSome, getString
@@ -24,15 +25,20 @@ async def async_request_pool_lights_command(
         )
 
 
-def decode_color_update(buff: bytes, data: dict):
+def decode_color_update(buff: bytes, data: dict, changes: ChangeSink = NO_CHANGES):
     controller: dict = data.setdefault(DEVICE.CONTROLLER, {})
 
     color_state: dict = controller.setdefault(GROUP.COLOR_LIGHTS, {})
+    color_changes = changes.at(DEVICE.CONTROLLER, GROUP.COLOR_LIGHTS)
 
-    color_state[ATTR.COLOR_MODE], offset = getSome("I", buff, 0)  # 0
+    color_mode, offset = getSome("I", buff, 0)  # 0
+    color_changes.set(color_state, ATTR.COLOR_MODE, color_mode)
 
-    color_state[ATTR.PROGRESS], offset = getSome("I", buff, offset)  # 4
+    progress, offset = getSome("I", buff, offset)  # 4
+    color_changes.set(color_state, ATTR.PROGRESS, progress)
 
-    color_state[ATTR.LIMIT], offset = getSome("I", buff, offset)  # 8
+    limit, offset = getSome("I", buff, offset)  # 8
+    color_changes.set(color_state, ATTR.LIMIT, limit)
 
-    color_state[ATTR.TEXT], offset = getString(buff, offset)  # 12
+    text, offset = getString(buff, offset)  # 12
+    color_changes.set(color_state, ATTR.TEXT, text)
@@ -1,14 +1,23 @@
 import asyncio
 import logging
 import struct
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
 from ..const.common import ScreenLogicConnectionError
-from ..const.msg import CODE, COM_MAX_RETRIES, COM_TIMEOUT
+from ..const.msg import (
+    CODE,
+    COM_CONNECT_SETTLE,
+    COM_MAX_RETRIES,
+    COM_TIMEOUT,
+)
 from .protocol import ScreenLogicProtocol
 from .request import async_make_request
+from .retry import RetryPolicy
 from .utility import asyncio_timeout, decodeMessageString, encodeMessageString
 
+if TYPE_CHECKING:
+    from ..metrics import MetricsCollector
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -36,7 +45,11 @@ async def async_get_mac_address(
 
 
 async def async_create_connection(
-    gateway_ip: str, gateway_port: int, connection_lost_callback: Callable = None
+    gateway_ip: str,
+    gateway_port: int,
+    connection_lost_callback: Callable = None,
+    retry_policy: RetryPolicy = None,
+    metrics: "MetricsCollector" = None,
 ) -> tuple[asyncio.Transport, ScreenLogicProtocol]:
     try:
         loop = asyncio.get_running_loop()
@@ -45,7 +58,9 @@ async def async_create_connection(
         _LOGGER.debug("Creating connection")
         async with asyncio_timeout(COM_TIMEOUT):
             return await loop.create_connection(
-                lambda: ScreenLogicProtocol(loop, connection_lost_callback),
+                lambda: ScreenLogicProtocol(
+                    loop, connection_lost_callback, retry_policy, metrics
+                ),
                 gateway_ip,
                 gateway_port,
             )
@@ -61,8 +76,26 @@ async def async_create_connection(
         ) from os_ex
 
 
+async def async_wait_connect_sent(
+    protocol: ScreenLogicProtocol,
+    settle: float = COM_CONNECT_SETTLE,
+) -> None:
+    """
+    Give the protocol adapter 'settle' seconds to take the connect ping.
+
+    The protocol adapter does not answer the connect ping, so this is a single
+    timed wait. A protocol adapter that rejects the ping closes the connection,
+    which ends the wait early.
+    """
+    if settle > 0 and protocol.is_connected:
+        await asyncio.wait((protocol._closed,), timeout=settle)
+
+
 async def async_gateway_connect(
-    transport: asyncio.Transport, protocol: ScreenLogicProtocol, max_retries: int
+    transport: asyncio.Transport,
+    protocol: ScreenLogicProtocol,
+    max_retries: int,
+    settle: float = COM_CONNECT_SETTLE,
 ) -> str:
     connectString = b"CONNECTSERVERHOST\r\n\r\n"  # as bytes, not string
     try:
@@ -72,7 +105,7 @@ async def async_gateway_connect(
     except Exception as ex:
         raise ScreenLogicConnectionError("Error sending connect ping") from ex
 
-    await asyncio.sleep(0.25)
+    await async_wait_connect_sent(protocol, settle)
     if not protocol.is_connected:
         raise ScreenLogicConnectionError("Host unexpectedly disconnected.")
 
@@ -100,10 +133,15 @@ async def async_connect_to_gateway(
     gateway_port,
     connection_lost_callback: Callable = None,
     max_retries: int = COM_MAX_RETRIES,
+    retry_policy: RetryPolicy = None,
+    metrics: "MetricsCollector" = None,
+    connect_settle: float = COM_CONNECT_SETTLE,
 ) -> tuple[asyncio.Transport, ScreenLogicProtocol, str]:
     transport, protocol = await async_create_connection(
-        gateway_ip, gateway_port, connection_lost_callback
+        gateway_ip, gateway_port, connection_lost_callback, retry_policy, metrics
+    )
+    mac_address = await async_gateway_connect(
+        transport, protocol, max_retries, connect_settle
     )
-    mac_address = await async_gateway_connect(transport, protocol, max_retries)
     if await async_gateway_login(protocol, max_retries):
         return transport, protocol, mac_address
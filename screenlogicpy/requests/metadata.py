@@ -0,0 +1,275 @@
+"""Descriptive data for decoded values, built once and shared between updates."""
+
+from functools import lru_cache
+from typing import Any, Callable
+
+from ..const.common import DEVICE_TYPE, STATE_TYPE, UNIT
+from ..const.data import ATTR, DEVICE, GROUP, VALUE
+from ..diff import NO_CHANGES, ChangeSink
+from ..device_const.chemistry import CHEM_RANGE, DOSE_STATE
+from ..device_const.heat import HEAT_MODE, HEAT_STATE
+from ..device_const.scg import SCG_RANGE
+from ..device_const.system import BODY_TYPE, CONTROLLER_STATE
+
+# Bounds the number of (key, variant) templates kept, e.g. one per body or pump name.
+METADATA_CACHE_SIZE = 512
+
+CONTROLLER_STATE_OPTIONS = [state.title for state in CONTROLLER_STATE]
+HEAT_STATE_OPTIONS = [state.title for state in HEAT_STATE]
+HEAT_MODE_OPTIONS = [mode.title for mode in HEAT_MODE]
+DOSE_STATE_OPTIONS = [state.title for state in DOSE_STATE]
+
+
+def _described(name: str, attrs: dict | None = None) -> dict:
+    """Return metadata with the value placeholder in its usual position."""
+    return {ATTR.NAME: name, ATTR.VALUE: None, **(attrs or {})}
+
+
+def _measurement(name: str, unit: str | None = None) -> dict:
+    attrs = {ATTR.UNIT: unit} if unit is not None else {}
+    attrs[ATTR.STATE_TYPE] = STATE_TYPE.MEASUREMENT
+    return _described(name, attrs)
+
+
+def _temperature(name: str, unit: str, measurement: bool = True) -> dict:
+    attrs = {ATTR.UNIT: unit, ATTR.DEVICE_TYPE: DEVICE_TYPE.TEMPERATURE}
+    if measurement:
+        attrs[ATTR.STATE_TYPE] = STATE_TYPE.MEASUREMENT
+    return _described(name, attrs)
+
+
+def _enum(name: str, options: list[str]) -> dict:
+    return _described(
+        name, {ATTR.DEVICE_TYPE: DEVICE_TYPE.ENUM, ATTR.ENUM_OPTIONS: options}
+    )
+
+
+def _alarm(name: str) -> dict:
+    return _described(name, {ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM})
+
+
+def _setpoint(name: str, unit: str, value_range, attrs: dict | None = None) -> dict:
+    return _described(
+        name,
+        {
+            ATTR.UNIT: unit,
+            ATTR.MIN_SETPOINT: value_range.minimum,
+            ATTR.MAX_SETPOINT: value_range.maximum,
+            **(attrs or {}),
+        },
+    )
+
+
+def _dose(name: str, unit: str, device_type: str) -> dict:
+    return _described(
+        name,
+        {
+            ATTR.UNIT: unit,
+            ATTR.DEVICE_TYPE: device_type,
+            ATTR.STATE_TYPE: STATE_TYPE.TOTAL_INCREASING,
+        },
+    )
+
+
+_CONTROLLER_SENSOR = (DEVICE.CONTROLLER, GROUP.SENSOR)
+_CHEM_SENSOR = (DEVICE.INTELLICHEM, GROUP.SENSOR)
+_CHEM_CONFIG = (DEVICE.INTELLICHEM, GROUP.CONFIGURATION)
+_CHEM_DOSING = (DEVICE.INTELLICHEM, GROUP.DOSE_STATUS)
+_CHEM_ALARM = (DEVICE.INTELLICHEM, GROUP.ALARM)
+_CHEM_ALERT = (DEVICE.INTELLICHEM, GROUP.ALERT)
+_CHEM_BALANCE = (DEVICE.INTELLICHEM, GROUP.WATER_BALANCE)
+_SCG_SENSOR = (DEVICE.SCG, GROUP.SENSOR)
+_SCG_CONFIG = (DEVICE.SCG, GROUP.CONFIGURATION)
+
+# Metadata builders keyed by (DEVICE, GROUP, VALUE). GROUP is None for values held
+# directly by an indexed device. Builders take the variant the metadata depends on,
+# such as a body or pump name, or a temperature unit.
+METADATA: dict[tuple[str, str | None, str], Callable[..., dict]] = {
+    (*_CONTROLLER_SENSOR, VALUE.STATE): lambda: _enum(
+        "Controller State", CONTROLLER_STATE_OPTIONS
+    ),
+    (*_CONTROLLER_SENSOR, VALUE.FREEZE_MODE): lambda: _described("Freeze Mode"),
+    (*_CONTROLLER_SENSOR, VALUE.POOL_DELAY): lambda: _described("Pool Delay"),
+    (*_CONTROLLER_SENSOR, VALUE.SPA_DELAY): lambda: _described("Spa Delay"),
+    (*_CONTROLLER_SENSOR, VALUE.CLEANER_DELAY): lambda: _described("Cleaner Delay"),
+    (*_CONTROLLER_SENSOR, VALUE.AIR_TEMPERATURE): lambda unit: _temperature(
+        "Air Temperature", unit
+    ),
+    (*_CONTROLLER_SENSOR, VALUE.PH): lambda: _measurement("pH", UNIT.PH),
+    (*_CONTROLLER_SENSOR, VALUE.ORP): lambda: _measurement("ORP", UNIT.MILLIVOLT),
+    (*_CONTROLLER_SENSOR, VALUE.SATURATION): lambda: _measurement(
+        "Saturation Index", UNIT.SATURATION_INDEX
+    ),
+    (*_CONTROLLER_SENSOR, VALUE.SALT_PPM): lambda: _measurement(
+        "Salt", UNIT.PARTS_PER_MILLION
+    ),
+    (*_CONTROLLER_SENSOR, VALUE.PH_SUPPLY_LEVEL): lambda: _measurement(
+        "pH Supply Level"
+    ),
+    (*_CONTROLLER_SENSOR, VALUE.ORP_SUPPLY_LEVEL): lambda: _measurement(
+        "ORP Supply Level"
+    ),
+    (*_CONTROLLER_SENSOR, VALUE.ACTIVE_ALERT): lambda: _alarm("Active Alert"),
+    (DEVICE.BODY, None, VALUE.LAST_TEMPERATURE): lambda body, unit: _temperature(
+        f"Last {body} Temperature", unit
+    ),
+    (DEVICE.BODY, None, VALUE.HEAT_STATE): lambda body, unit: _enum(
+        f"{body} Heat", HEAT_STATE_OPTIONS
+    ),
+    (DEVICE.BODY, None, VALUE.HEAT_SETPOINT): lambda body, unit: _temperature(
+        f"{body} Heat Set Point", unit, measurement=False
+    ),
+    (DEVICE.BODY, None, VALUE.COOL_SETPOINT): lambda body, unit: _temperature(
+        f"{body} Cool Set Point", unit, measurement=False
+    ),
+    (DEVICE.BODY, None, VALUE.HEAT_MODE): lambda body, unit: _enum(
+        f"{body} Heat Mode", HEAT_MODE_OPTIONS
+    ),
+    (DEVICE.PUMP, None, VALUE.STATE): lambda pump: _described(pump),
+    (DEVICE.PUMP, None, VALUE.WATTS_NOW): lambda pump: _described(
+        f"{pump} Watts Now",
+        {
+            ATTR.UNIT: UNIT.WATT,
+            ATTR.DEVICE_TYPE: DEVICE_TYPE.POWER,
+            ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
+        },
+    ),
+    (DEVICE.PUMP, None, VALUE.RPM_NOW): lambda pump: _measurement(
+        f"{pump} RPM Now", UNIT.REVOLUTIONS_PER_MINUTE
+    ),
+    (DEVICE.PUMP, None, VALUE.GPM_NOW): lambda pump: _measurement(
+        f"{pump} GPM Now", UNIT.GALLONS_PER_MINUTE
+    ),
+    (*_CHEM_SENSOR, VALUE.PH_NOW): lambda: _measurement("pH Now", UNIT.PH),
+    (*_CHEM_SENSOR, VALUE.ORP_NOW): lambda: _measurement("ORP Now", UNIT.MILLIVOLT),
+    (*_CHEM_SENSOR, VALUE.PH_SUPPLY_LEVEL): lambda: _measurement("pH Supply Level"),
+    (*_CHEM_SENSOR, VALUE.ORP_SUPPLY_LEVEL): lambda: _measurement("ORP Supply Level"),
+    (*_CHEM_SENSOR, VALUE.SATURATION): lambda: _measurement(
+        "Saturation Index", UNIT.SATURATION_INDEX
+    ),
+    (*_CHEM_SENSOR, VALUE.PH_PROBE_WATER_TEMP): lambda unit: _temperature(
+        "pH Probe Water Temperature", unit
+    ),
+    (*_CHEM_CONFIG, VALUE.PH_SETPOINT): lambda: _setpoint(
+        "pH Setpoint", UNIT.PH, CHEM_RANGE.PH_SETPOINT
+    ),
+    (*_CHEM_CONFIG, VALUE.ORP_SETPOINT): lambda: _setpoint(
+        "ORP Setpoint", UNIT.MILLIVOLT, CHEM_RANGE.ORP_SETPOINT
+    ),
+    (*_CHEM_CONFIG, VALUE.CALCIUM_HARDNESS): lambda: _setpoint(
+        "Calcium Hardness", UNIT.PARTS_PER_MILLION, CHEM_RANGE.CALCIUM_HARDNESS
+    ),
+    (*_CHEM_CONFIG, VALUE.CYA): lambda: _setpoint(
+        "Cyanuric Acid", UNIT.PARTS_PER_MILLION, CHEM_RANGE.CYANURIC_ACID
+    ),
+    (*_CHEM_CONFIG, VALUE.TOTAL_ALKALINITY): lambda: _setpoint(
+        "Total Alkalinity", UNIT.PARTS_PER_MILLION, CHEM_RANGE.TOTAL_ALKALINITY
+    ),
+    (*_CHEM_CONFIG, VALUE.SALT_TDS_PPM): lambda: _setpoint(
+        "Salt/TDS", UNIT.PARTS_PER_MILLION, CHEM_RANGE.SALT_TDS
+    ),
+    (*_CHEM_DOSING, VALUE.PH_LAST_DOSE_TIME): lambda: _dose(
+        "Last pH Dose Time", UNIT.SECOND, DEVICE_TYPE.DURATION
+    ),
+    (*_CHEM_DOSING, VALUE.ORP_LAST_DOSE_TIME): lambda: _dose(
+        "Last ORP Dose Time", UNIT.SECOND, DEVICE_TYPE.DURATION
+    ),
+    (*_CHEM_DOSING, VALUE.PH_LAST_DOSE_VOLUME): lambda: _dose(
+        "Last pH Dose Volume", UNIT.MILLILITER, DEVICE_TYPE.VOLUME
+    ),
+    (*_CHEM_DOSING, VALUE.ORP_LAST_DOSE_VOLUME): lambda: _dose(
+        "Last ORP Dose Volume", UNIT.MILLILITER, DEVICE_TYPE.VOLUME
+    ),
+    (*_CHEM_DOSING, VALUE.PH_DOSING_STATE): lambda: _enum(
+        "pH Dosing State", DOSE_STATE_OPTIONS
+    ),
+    (*_CHEM_DOSING, VALUE.ORP_DOSING_STATE): lambda: _enum(
+        "ORP Dosing State", DOSE_STATE_OPTIONS
+    ),
+    (*_CHEM_ALARM, VALUE.FLOW_ALARM): lambda: _alarm("Flow Alarm"),
+    (*_CHEM_ALARM, VALUE.PH_HIGH_ALARM): lambda: _alarm("pH HIGH Alarm"),
+    (*_CHEM_ALARM, VALUE.PH_LOW_ALARM): lambda: _alarm("pH LOW Alarm"),
+    (*_CHEM_ALARM, VALUE.ORP_HIGH_ALARM): lambda: _alarm("ORP HIGH Alarm"),
+    (*_CHEM_ALARM, VALUE.ORP_LOW_ALARM): lambda: _alarm("ORP LOW Alarm"),
+    (*_CHEM_ALARM, VALUE.PH_SUPPLY_ALARM): lambda: _alarm("pH Supply Alarm"),
+    (*_CHEM_ALARM, VALUE.ORP_SUPPLY_ALARM): lambda: _alarm("ORP Supply Alarm"),
+    (*_CHEM_ALARM, VALUE.PROBE_FAULT_ALARM): lambda: _alarm("Probe Fault"),
+    (*_CHEM_ALERT, VALUE.PH_LOCKOUT): lambda: _described("pH Lockout"),
+    (*_CHEM_ALERT, VALUE.PH_LIMIT): lambda: _described("pH Dose Limit Reached"),
+    (*_CHEM_ALERT, VALUE.ORP_LIMIT): lambda: _described("ORP Dose Limit Reached"),
+    (*_CHEM_BALANCE, VALUE.CORROSIVE): lambda: _alarm("SI Corrosive"),
+    (*_CHEM_BALANCE, VALUE.SCALING): lambda: _alarm("SI Scaling"),
+    (*_SCG_SENSOR, VALUE.STATE): lambda: _described("Chlorinator"),
+    (*_SCG_SENSOR, VALUE.SALT_PPM): lambda: _measurement(
+        "Chlorinator Salt", UNIT.PARTS_PER_MILLION
+    ),
+    (*_SCG_CONFIG, VALUE.POOL_SETPOINT): lambda: _setpoint(
+        "Pool Chlorinator Setpoint",
+        UNIT.PERCENT,
+        SCG_RANGE.POOL_SETPOINT,
+        {ATTR.STEP: 1, ATTR.BODY_TYPE: BODY_TYPE.POOL.value},
+    ),
+    (*_SCG_CONFIG, VALUE.SPA_SETPOINT): lambda: _setpoint(
+        "Spa Chlorinator Setpoint",
+        UNIT.PERCENT,
+        SCG_RANGE.SPA_SETPOINT,
+        {ATTR.STEP: 1, ATTR.BODY_TYPE: BODY_TYPE.SPA.value},
+    ),
+    (*_SCG_CONFIG, VALUE.SUPER_CHLOR_TIMER): lambda: _setpoint(
+        "Super Chlorination Timer", UNIT.HOUR, SCG_RANGE.SUPER_CHLOR_RT, {ATTR.STEP: 1}
+    ),
+    (DEVICE.SCG, None, VALUE.SUPER_CHLORINATE): lambda: _described("Super Chlorinate"),
+}
+
+
+@lru_cache(maxsize=METADATA_CACHE_SIZE)
+def _getTemplate(key: tuple, variant: tuple) -> tuple[dict, tuple]:
+    metadata = METADATA[key](*variant)
+    described = tuple(
+        (attr, meta) for attr, meta in metadata.items() if attr != ATTR.VALUE
+    )
+    return metadata, described
+
+
+def _copyMetadata(metadata: dict) -> dict:
+    """Return a copy of 'metadata' whose lists, such as enum options, are its own."""
+    return {
+        attr: list(meta) if isinstance(meta, list) else meta
+        for attr, meta in metadata.items()
+    }
+
+
+def getMetadata(key: tuple, *variant) -> dict:
+    """Return a copy of the metadata for 'key', with no value set."""
+    return _copyMetadata(_getTemplate(key, variant)[0])
+
+
+def setValue(
+    parent: dict,
+    key: tuple,
+    value: Any,
+    *variant,
+    changes: ChangeSink = NO_CHANGES,
+) -> None:
+    """
+    Set the value of the described entry for 'key' in 'parent'.
+
+    When the existing entry already carries the metadata only its value is written.
+    Otherwise the entry is replaced with a fresh copy of the metadata.
+    What changed is recorded in 'changes', a sink for the path of 'parent'.
+    """
+    metadata, described = _getTemplate(key, variant)
+    name = key[-1]
+    entry = parent.get(name)
+    if entry is not None and len(entry) == len(metadata):
+        for attr, meta in described:
+            # Lists are copied into each entry, so they are compared by value.
+            if (current := entry.get(attr)) is not meta and current != meta:
+                break
+        else:
+            changes.at(name).record(ATTR.VALUE, entry.get(ATTR.VALUE), value)
+            entry[ATTR.VALUE] = value
+            return
+    new_entry = _copyMetadata(metadata)
+    new_entry[ATTR.VALUE] = value
+    changes.set(parent, name, new_entry)
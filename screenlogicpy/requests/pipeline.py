@@ -0,0 +1,34 @@
+import asyncio
+
+from .protocol import ScreenLogicProtocol
+from .query import DataQuery
+from .request import async_make_request
+
+
+async def async_request_many(
+    protocol: ScreenLogicProtocol,
+    queries: list[DataQuery],
+    max_in_flight: int,
+    max_retries: int,
+) -> list[bytes | None]:
+    """
+    Send several queries with at most max_in_flight awaiting a response.
+
+    Responses are returned in the order of the queries, not the order they arrived.
+    If any query fails the others are cancelled and the error is raised.
+    """
+    limit = asyncio.Semaphore(max_in_flight)
+
+    async def request(query: DataQuery) -> bytes | None:
+        async with limit:
+            return await async_make_request(
+                protocol, query.code, query.payload, max_retries
+            )
+
+    tasks = [asyncio.ensure_future(request(query)) for query in queries]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -2,13 +2,19 @@
 import asyncio
 import itertools
 import logging
-import struct
 import time
-from typing import Awaitable, Callable
+from typing import TYPE_CHECKING, Awaitable, Callable
 
 from ..const import ScreenLogicError
-from ..const.msg import HEADER_LENGTH
-from .utility import makeMessage, takeMessage
+from ..const.msg import COM_PUSH_DEPTH, HEADER_LENGTH
+from .dispatch import PushDispatcher
+from .framer import MessageFramer
+from .retry import RetryPolicy
+from .utility import makeMessage
+
+if TYPE_CHECKING:
+    from ..capture import CaptureWriter
+    from ..metrics import MetricsCollector
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,9 +22,20 @@ _LOGGER = logging.getLogger(__name__)
 class ScreenLogicProtocol(asyncio.Protocol):
     """asyncio.Protocol for handling connection to a ScreenLogic protocol adapter."""
 
-    def __init__(self, loop, connection_lost_callback: Callable = None) -> None:
+    def __init__(
+        self,
+        loop,
+        connection_lost_callback: Callable = None,
+        retry_policy: RetryPolicy = None,
+        metrics: "MetricsCollector" = None,
+        push_depth: int = COM_PUSH_DEPTH,
+    ) -> None:
         self._loop: asyncio.BaseEventLoop = loop
         self._connection_lost_callback = connection_lost_callback
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._dispatcher = PushDispatcher(loop, push_depth)
+        self.metrics = metrics
+        self.capture: "CaptureWriter | None" = None
         self._futures = self.FutureManager(self._loop)
         self._callbacks = {}
         self._connected = False
@@ -26,7 +43,7 @@ class ScreenLogicProtocol(asyncio.Protocol):
         self._closed: asyncio.Future = None
         self._last_request: float = None
         self._last_response: float = None
-        self._buff = bytearray()
+        self._framer = MessageFramer()
 
         self._keepalive_awaitable: Callable[[any, any], Awaitable[any]] = None
         self._keepalive_interval: int = None
@@ -45,6 +62,26 @@ class ScreenLogicProtocol(asyncio.Protocol):
     def is_closing(self):
         return self._closing
 
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """Timeouts and retry delays for requests sent with this protocol."""
+        return self._retry_policy
+
+    @property
+    def metrics(self) -> "MetricsCollector | None":
+        """Collector of statistics on this connection's messages, if enabled."""
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics: "MetricsCollector | None") -> None:
+        self._metrics = metrics
+        self._dispatcher.metrics = metrics
+
+    @property
+    def dispatcher(self) -> PushDispatcher:
+        """Queues of unsolicited messages waiting for their handlers."""
+        return self._dispatcher
+
     @property
     def last_request(self):
         """Monotonic time for the last message sent."""
@@ -66,7 +103,14 @@ class ScreenLogicProtocol(asyncio.Protocol):
         """Send a message via the transport."""
         _LOGGER.debug("Sending: %i, %i, %s", messageID, messageCode, messageData)
         if not self.transport.is_closing():
-            self.transport.write(makeMessage(messageID, messageCode, messageData))
+            message = makeMessage(messageID, messageCode, messageData)
+            self.transport.write(message)
+            if self.metrics is not None:
+                self.metrics.record_sent(messageCode, len(message))
+            if self.capture is not None:
+                from ..capture import SENT
+
+                self.capture.record(SENT, messageID, messageCode, messageData)
 
         self._last_request = time.monotonic()
 
@@ -95,48 +139,47 @@ class ScreenLogicProtocol(asyncio.Protocol):
         if self._closing:
             return
 
-        def complete_messages(data: bytes) -> list[tuple[int, int, bytes]]:
-            """Return only complete ScreenLogic messages."""
-
-            # Some pool configurations can require SL messages larger than can
-            # come through in a single call to data_received(), so lets wait until
-            # we have at least enough data to make a complete message before we
-            # process and pass it on. Conversely, multiple SL messages may come in
-            # a single call to data_received() so we collect all complete messages
-            # before sending on.
-
-            self._buff.extend(data)
-            complete = []
-            while len(self._buff) >= HEADER_LENGTH:
-                dataLen = struct.unpack_from("<I", self._buff, 4)[0]
-                totalLen = HEADER_LENGTH + dataLen
-                if len(self._buff) >= totalLen:
-                    out = bytearray()
-                    for _ in range(totalLen):
-                        out.append(self._buff.pop(0))
-                    complete.append(takeMessage(bytes(out)))
-                else:
-                    break
-            if len(self._buff) > 0:
-                _LOGGER.debug(
-                    f"Returning {len(complete)} messages with {len(self._buff)} bytes in the buffer"
-                )
-                _LOGGER.debug(f"Buffer: {self._buff}")
-            return complete
-
-        for message in complete_messages(data):
+        # Some pool configurations can require SL messages larger than can
+        # come through in a single call to data_received(), so partial messages
+        # are held by the framer until the rest of their data arrives. Conversely,
+        # multiple SL messages may come in a single call to data_received() so we
+        # collect all complete messages before sending on.
+        messages = self._framer.feed(data)
+        if len(self._framer) > 0:
+            _LOGGER.debug(
+                f"Returning {len(messages)} messages with {len(self._framer)} bytes in the buffer"
+            )
+
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.record_frames(len(messages))
+
+        if (capture := self.capture) is not None:
+            from ..capture import RECEIVED
+
+            for message in messages:
+                capture.record(RECEIVED, *message)
+
+        for message in messages:
 
             if self._futures.mark_done(message):
                 _LOGGER.debug("Received: %i, %i, %s", *message)
+                if metrics is not None:
+                    metrics.record_received(
+                        message[1], HEADER_LENGTH + len(message[2])
+                    )
             else:
+                if metrics is not None:
+                    metrics.record_received(
+                        message[1], HEADER_LENGTH + len(message[2]), pushed=True
+                    )
                 _LOGGER.debug("Received async message: %i, %i, %s", *message)
                 # Unsolicited message received. See if there's a callback registered
-                # for the message code and create a task for it.
+                # for the message code and queue the message for it.
                 _, msgCode, msgData = message
                 if msgCode in self._callbacks:
                     handler, args = self._callbacks[msgCode]
-                    _LOGGER.debug(f"Calling {handler}")
-                    self._loop.create_task(handler(msgData, *args))
+                    self._dispatcher.dispatch(msgCode, msgData, handler, args)
 
     def connection_lost(self, exc) -> None:
         """Called when connection is closed/lost."""
@@ -149,6 +192,7 @@ class ScreenLogicProtocol(asyncio.Protocol):
             self._stop_keepalive = None
 
         self._loop.create_task(self._futures.all_done(True))
+        self._dispatcher.clear()
 
         self._closed.set_result(True)
         if self._connection_lost_callback is not None:
@@ -178,7 +222,8 @@ class ScreenLogicProtocol(asyncio.Protocol):
         Register callback for async ScreenLogic message.
 
         Registers an async callback function to call for the specified message code.
-        Callback will be scheduled to run with loop.create_task()
+        Messages are handed to the callback one at a time per message code, through
+        the protocol's PushDispatcher.
         """
         _LOGGER.debug(
             f"Registering async handler {handler} for message code {messageCode}"
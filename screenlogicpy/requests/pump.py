@@ -1,20 +1,32 @@
 import struct
 
-from ..const.common import DEVICE_TYPE, STATE_TYPE, UNIT
 from ..const.data import ATTR, DEVICE, VALUE, UNKNOWN
 from ..const.msg import CODE
+from ..metrics import timed_decode
+from .metadata import setValue
 from .protocol import ScreenLogicProtocol
 from .request import async_make_request
-from .utility import getSome
+
+# Pump status layouts
+PUMP_HEADER = struct.Struct("<7I")
+PUMP_PRESETS = struct.Struct("<24I")  # 8 x (device id, setpoint, is rpm)
+
+# Stands in for described values until they are set. Never modified.
+_PENDING: dict = {}
 
 
 async def async_request_pump_status(
-    protocol: ScreenLogicProtocol, data: dict, pump_index: int, max_retries: int
+    protocol: ScreenLogicProtocol,
+    data: dict,
+    pump_index: int,
+    max_retries: int,
+    last: bytes | None = None,
 ) -> bytes:
     if result := await async_make_request(
         protocol, CODE.PUMPSTATUS_QUERY, struct.pack("<II", 0, pump_index), max_retries
     ):
-        decode_pump_status(result, data, pump_index)
+        if result != last:
+            timed_decode(protocol.metrics, decode_pump_status, result, data, pump_index)
         return result
 
 
@@ -23,66 +35,57 @@ def decode_pump_status(buff: bytes, data: dict, pump_index: int) -> None:
 
     pump_indexed: dict = pump.setdefault(pump_index, {})
 
-    pump_indexed[VALUE.TYPE], offset = getSome("I", buff, 0)
-    pump_state, offset = getSome("I", buff, offset)
-    pump_indexed_state: dict = pump_indexed.setdefault(
-        VALUE.STATE, {ATTR.NAME: "", ATTR.VALUE: 0}
-    )
+    (
+        pump_type,  # 0
+        pump_state,  # 4
+        curW,  # 8
+        curR,  # 12
+        unknown16,  # 16
+        curG,  # 20 GPM may read 255 when unsupported.
+        unknown24,  # 24
+    ) = PUMP_HEADER.unpack_from(buff, 0)
+    presets = PUMP_PRESETS.unpack_from(buff, PUMP_HEADER.size)
+
+    pump_indexed[VALUE.TYPE] = pump_type
+
     # Filter wild values from pump state
-    if not pump_state & 0x80000000:
-        pump_indexed_state[ATTR.VALUE] = pump_state
+    if pump_state & 0x80000000:
+        pump_state = pump_indexed.get(VALUE.STATE, _PENDING).get(ATTR.VALUE, 0)
 
-    curW, offset = getSome("I", buff, offset)
-    pump_indexed[VALUE.WATTS_NOW] = {}  # Need to find value when unsupported.
+    # Hold the key order of described values until the pump name is known.
+    pump_indexed.setdefault(VALUE.STATE, _PENDING)
 
-    curR, offset = getSome("I", buff, offset)
-    pump_indexed[VALUE.RPM_NOW] = {}  # Need to find value when unsupported.
+    # Need to find value when unsupported.
+    pump_indexed.setdefault(VALUE.WATTS_NOW, _PENDING)
 
-    pump_indexed[UNKNOWN(offset)], offset = getSome("I", buff, offset)
+    # Need to find value when unsupported.
+    pump_indexed.setdefault(VALUE.RPM_NOW, _PENDING)
 
-    curG, offset = getSome("I", buff, offset)  # GPM may read 255 when unsupported.
-    pump_indexed[VALUE.GPM_NOW] = {}
+    pump_indexed[UNKNOWN(16)] = unknown16
 
-    pump_indexed[UNKNOWN(offset)], offset = getSome("I", buff, offset)
+    pump_indexed.setdefault(VALUE.GPM_NOW, _PENDING)
+
+    pump_indexed[UNKNOWN(24)] = unknown24
 
     pump_indexed_preset: dict = pump_indexed.setdefault(VALUE.PRESET, {})
     name = "Default"
     for i in range(8):
+        device_id, setpoint, is_rpm = presets[i * 3 : i * 3 + 3]
         pump_indexed_preset_indexed: dict = pump_indexed_preset.setdefault(i, {})
-        pump_indexed_preset_indexed[ATTR.DEVICE_ID], offset = getSome("I", buff, offset)
+        pump_indexed_preset_indexed[ATTR.DEVICE_ID] = device_id
         if DEVICE.CIRCUIT in data:
             for circuit in data[DEVICE.CIRCUIT].values():
-                if (
-                    pump_indexed_preset_indexed[ATTR.DEVICE_ID]
-                    == circuit[ATTR.DEVICE_ID]
-                    and name == "Default"
-                ):
+                if device_id == circuit[ATTR.DEVICE_ID] and name == "Default":
                     name = circuit[ATTR.NAME]
                     break
-        pump_indexed_preset_indexed[ATTR.SETPOINT], offset = getSome("I", buff, offset)
-        pump_indexed_preset_indexed[ATTR.IS_RPM], offset = getSome("I", buff, offset)
+        pump_indexed_preset_indexed[ATTR.SETPOINT] = setpoint
+        pump_indexed_preset_indexed[ATTR.IS_RPM] = is_rpm
 
     name = name.strip().strip(",") + " Pump"
-    pump_indexed_state[ATTR.NAME] = name
-
-    pump_indexed[VALUE.WATTS_NOW] = {
-        ATTR.NAME: f"{name} Watts Now",
-        ATTR.VALUE: curW,
-        ATTR.UNIT: UNIT.WATT,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.POWER,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    pump_indexed[VALUE.RPM_NOW] = {
-        ATTR.NAME: f"{name} RPM Now",
-        ATTR.VALUE: curR,
-        ATTR.UNIT: UNIT.REVOLUTIONS_PER_MINUTE,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    pump_indexed[VALUE.GPM_NOW] = {
-        ATTR.NAME: f"{name} GPM Now",
-        ATTR.VALUE: curG,
-        ATTR.UNIT: UNIT.GALLONS_PER_MINUTE,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
+    setValue(pump_indexed, (DEVICE.PUMP, None, VALUE.STATE), pump_state, name)
+
+    setValue(pump_indexed, (DEVICE.PUMP, None, VALUE.WATTS_NOW), curW, name)
+
+    setValue(pump_indexed, (DEVICE.PUMP, None, VALUE.RPM_NOW), curR, name)
+
+    setValue(pump_indexed, (DEVICE.PUMP, None, VALUE.GPM_NOW), curG, name)
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+import struct
+from typing import Callable
+
+from ..const.common import DATA_REQUEST
+from ..const.msg import CODE
+from ..metrics import MetricsCollector, timed_decode
+
+
+@dataclass(frozen=True)
+class DataQuery:
+    """A data request that can be sent alongside others and decoded later."""
+
+    request: str
+    code: int
+    payload: bytes
+    decode: Callable
+    index: int | None = None
+
+    def apply(
+        self, raw: bytes, data: dict, metrics: MetricsCollector | None = None
+    ) -> None:
+        """Decode a response to this query into data."""
+        if self.index is None:
+            timed_decode(metrics, self.decode, raw, data)
+        else:
+            timed_decode(metrics, self.decode, raw, data, self.index)
+
+
+# Each query imports its decoder, so only the decoders of requests made are loaded.
+
+
+def config_query() -> DataQuery:
+    from .config import decode_pool_config
+
+    return DataQuery(
+        DATA_REQUEST.CONFIG,
+        CODE.CTRLCONFIG_QUERY,
+        struct.pack("<2I", 0, 0),
+        decode_pool_config,
+    )
+
+
+def status_query() -> DataQuery:
+    from .status import decode_pool_status
+
+    return DataQuery(
+        DATA_REQUEST.STATUS,
+        CODE.POOLSTATUS_QUERY,
+        struct.pack("<I", 0),
+        decode_pool_status,
+    )
+
+
+def pump_query(pump_index: int) -> DataQuery:
+    from .pump import decode_pump_status
+
+    return DataQuery(
+        DATA_REQUEST.PUMPS,
+        CODE.PUMPSTATUS_QUERY,
+        struct.pack("<II", 0, pump_index),
+        decode_pump_status,
+        pump_index,
+    )
+
+
+def chemistry_query() -> DataQuery:
+    from .chemistry import decode_chemistry
+
+    return DataQuery(
+        DATA_REQUEST.CHEMISTRY,
+        CODE.CHEMISTRY_QUERY,
+        struct.pack("<I", 0),
+        decode_chemistry,
+    )
+
+
+def scg_query() -> DataQuery:
+    from .scg import decode_scg_config
+
+    return DataQuery(
+        DATA_REQUEST.SCG,
+        CODE.SCGCONFIG_QUERY,
+        struct.pack("<I", 0),
+        decode_scg_config,
+    )
+
+
+def date_time_query() -> DataQuery:
+    from .datetime import decode_date_time
+
+    return DataQuery(
+        DATA_REQUEST.DATE_TIME,
+        CODE.GET_DATETIME_QUERY,
+        b"",
+        decode_date_time,
+    )
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 
 from ..const.common import (
     ScreenLogicConnectionError,
@@ -7,7 +8,7 @@ from ..const.common import (
     ScreenLogicRequestError,
     ScreenLogicResponseError,
 )
-from ..const.msg import CODE, COM_MAX_RETRIES, COM_RETRY_WAIT, COM_TIMEOUT
+from ..const.msg import CODE, COM_MAX_RETRIES
 from .protocol import ScreenLogicProtocol
 from .utility import asyncio_timeout
 
@@ -20,6 +21,8 @@ async def async_make_request(
     requestData: bytes = b"",
     max_retries: int = COM_MAX_RETRIES,
 ) -> bytes:
+    policy = protocol.retry_policy
+    metrics = protocol.metrics
     for attempt in range(0, max_retries + 1):
         if not protocol.is_connected:
             raise ScreenLogicConnectionError(
@@ -27,10 +30,16 @@ async def async_make_request(
             )
 
         request = protocol.await_send_message(requestCode, requestData)
+        sent = time.monotonic()
+        if metrics is not None:
+            metrics.record_request(requestCode, attempt)
         try:
-            async with asyncio_timeout(COM_TIMEOUT):
+            async with asyncio_timeout(policy.get_timeout(requestCode)):
                 await request
         except asyncio.TimeoutError:
+            policy.record_timeout(requestCode)
+            if metrics is not None:
+                metrics.record_timeout(requestCode)
             last_error = ScreenLogicConnectionError(
                 f"Timeout waiting for response to message code '{requestCode}'"
             )
@@ -43,7 +52,13 @@ async def async_make_request(
             return
 
         if not request.cancelled():
+            latency = time.monotonic() - sent
+            policy.record_response(requestCode, latency)
             _, responseCode, responseData = request.result()
+            if metrics is not None:
+                metrics.record_response(
+                    requestCode, latency, responseCode != requestCode + 1
+                )
 
             if responseCode == requestCode + 1:
                 return responseData
@@ -67,10 +82,10 @@ async def async_make_request(
         if attempt == max_retries:
             raise last_error
 
-        retry_delay = COM_RETRY_WAIT * (attempt + 1)
+        retry_delay = policy.get_retry_delay(requestCode, attempt)
 
         _LOGGER.debug(
-            last_error.msg + ". Will retry %i more time(s) in %i seconds",
+            last_error.msg + ". Will retry %i more time(s) in %.2f seconds",
             max_retries - attempt,
             retry_delay,
         )
@@ -0,0 +1,135 @@
+"""Response timeouts and retry delays for requests to a ScreenLogic protocol adapter."""
+
+import random
+from typing import Callable
+
+from ..const.msg import (
+    CODE,
+    COM_MAX_RETRY_WAIT,
+    COM_MAX_TIMEOUT,
+    COM_MIN_TIMEOUT,
+    COM_RETRY_BASE_WAIT,
+    COM_RETRY_WAIT,
+    COM_TIMEOUT,
+)
+
+# Weights of each new round trip sample in the smoothed round trip time and its
+# deviation, as used for TCP retransmission timeouts (RFC 6298).
+RTT_ALPHA = 1 / 8
+RTT_BETA = 1 / 4
+RTT_DEVIATIONS = 4
+
+# Requests with responses much larger than most are given proportionally longer to
+# respond. Their round trip times are scaled down before being measured.
+RETRY_CODE_SCALE = {
+    CODE.CTRLCONFIG_QUERY: 4.0,
+    CODE.EQUIPMENT_QUERY: 4.0,
+}
+
+
+class RetryPolicy:
+    """
+    Fixed response timeout with a retry delay that grows linearly.
+
+    Subclasses may measure the responses and timeouts of requests to adjust the
+    values they return.
+    """
+
+    def __init__(
+        self, timeout: float = COM_TIMEOUT, retry_wait: float = COM_RETRY_WAIT
+    ) -> None:
+        self._timeout = timeout
+        self._retry_wait = retry_wait
+
+    def get_timeout(self, code: int) -> float:
+        """Seconds to wait for the response to a request."""
+        return self._timeout
+
+    def get_retry_delay(self, code: int, attempt: int) -> float:
+        """Seconds to wait before retrying a request after a failed 'attempt'."""
+        return self._retry_wait * (attempt + 1)
+
+    def record_response(self, code: int, rtt: float) -> None:
+        """Record the round trip time of an answered request."""
+
+    def record_timeout(self, code: int) -> None:
+        """Record that a request timed out."""
+
+
+class AdaptiveRetryPolicy(RetryPolicy):
+    """
+    Response timeout derived from measured round trip times.
+
+    The timeout is the smoothed round trip time plus four times its deviation,
+    limited to between 'min_timeout' and 'max_timeout', and doubles after each
+    timeout until a response is received. 'initial_timeout' is used until a round
+    trip has been measured. Timeouts for the codes in 'code_scale' are multiplied
+    by its value.
+
+    Retry delays double with each attempt up to 'max_delay'. Each delay is a random
+    time between half of that and all of it, so that clients do not retry in step.
+    """
+
+    def __init__(
+        self,
+        initial_timeout: float = COM_TIMEOUT,
+        min_timeout: float = COM_MIN_TIMEOUT,
+        max_timeout: float = COM_MAX_TIMEOUT,
+        base_delay: float = COM_RETRY_BASE_WAIT,
+        max_delay: float = COM_MAX_RETRY_WAIT,
+        code_scale: dict[int, float] | None = None,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        if not 0 < min_timeout <= initial_timeout <= max_timeout:
+            raise ValueError(
+                f"Invalid timeouts: {min_timeout} <= {initial_timeout} <= {max_timeout}"
+            )
+        if not 0 <= base_delay <= max_delay:
+            raise ValueError(f"Invalid retry delays: {base_delay}, {max_delay}")
+        super().__init__(initial_timeout, base_delay)
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout
+        self._max_delay = max_delay
+        self._code_scale = RETRY_CODE_SCALE if code_scale is None else code_scale
+        self._rng = rng
+        self._srtt: float | None = None
+        self._rttvar: float | None = None
+        self._backoff = 1
+
+    @property
+    def srtt(self) -> float | None:
+        """Smoothed round trip time in seconds, or None if none were measured."""
+        return self._srtt
+
+    @property
+    def rttvar(self) -> float | None:
+        """Smoothed deviation of the round trip time in seconds."""
+        return self._rttvar
+
+    def get_timeout(self, code: int) -> float:
+        if self._srtt is None:
+            timeout = self._timeout
+        else:
+            timeout = self._srtt + RTT_DEVIATIONS * self._rttvar
+        timeout = min(
+            max(timeout * self._backoff, self._min_timeout), self._max_timeout
+        )
+        return timeout * self._code_scale.get(code, 1)
+
+    def get_retry_delay(self, code: int, attempt: int) -> float:
+        delay = min(self._retry_wait * 2**attempt, self._max_delay)
+        return delay / 2 + self._rng() * delay / 2
+
+    def record_response(self, code: int, rtt: float) -> None:
+        rtt /= self._code_scale.get(code, 1)
+        if self._srtt is None:
+            self._srtt = rtt
+            self._rttvar = rtt / 2
+        else:
+            self._rttvar += RTT_BETA * (abs(self._srtt - rtt) - self._rttvar)
+            self._srtt += RTT_ALPHA * (rtt - self._srtt)
+        self._backoff = 1
+
+    def record_timeout(self, code: int) -> None:
+        if self._backoff * self._min_timeout < self._max_timeout:
+            self._backoff *= 2
@@ -1,88 +1,139 @@
 # import json
 import struct
 
-from ..const.common import (
-    DEVICE_TYPE,
-    ON_OFF,
-    STATE_TYPE,
-    UNIT,
-)
+from ..const.common import ON_OFF
 from ..const.msg import CODE
 from ..const.data import ATTR, DEVICE, GROUP, VALUE, UNKNOWN
-from ..device_const.system import BODY_TYPE, CONTROLLER_STATE
-from ..device_const.heat import HEAT_MODE, HEAT_STATE
+from ..device_const.system import BODY_TYPE
+from ..diff import NO_CHANGES, ChangeSink
+from ..metrics import timed_decode
+from .metadata import setValue
 from .protocol import ScreenLogicProtocol
 from .request import async_make_request
-from .utility import getSome, getTemperatureUnit
+from .utility import getTemperatureUnit
+
+# Pool status layouts
+STATUS_HEADER = struct.Struct("<I8BiI")  # state..air temperature, body count
+STATUS_BODY = struct.Struct("<I5i")
+STATUS_CIRCUIT_COUNT = struct.Struct("<I")
+STATUS_CIRCUIT = struct.Struct("<2I4B")
+STATUS_CHEMISTRY = struct.Struct("<7i")
+
+CONTROLLER_SENSOR = (DEVICE.CONTROLLER, GROUP.SENSOR)
 
 
 async def async_request_pool_status(
-    protocol: ScreenLogicProtocol, data: dict, max_retries: int
+    protocol: ScreenLogicProtocol,
+    data: dict,
+    max_retries: int,
+    last: bytes | None = None,
 ) -> bytes:
     if result := await async_make_request(
         protocol, CODE.POOLSTATUS_QUERY, struct.pack("<I", 0), max_retries
     ):
-        decode_pool_status(result, data)
+        if result != last:
+            timed_decode(protocol.metrics, decode_pool_status, result, data)
         return result
 
 
-def decode_pool_status(buff: bytes, data: dict) -> None:
+def status_structure(buff: bytes) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """
+    Return the body types and circuit IDs listed in a pool status payload.
+
+    A change in either means the pool configuration has changed.
+    """
+    bodiesCount = min(STATUS_HEADER.unpack_from(buff, 0)[-1], 2)
+    offset = STATUS_HEADER.size
+    body_types = tuple(
+        STATUS_BODY.unpack_from(buff, offset + i * STATUS_BODY.size)[0]
+        for i in range(bodiesCount)
+    )
+    offset += bodiesCount * STATUS_BODY.size
+    (circuitCount,) = STATUS_CIRCUIT_COUNT.unpack_from(buff, offset)
+    offset += STATUS_CIRCUIT_COUNT.size
+    circuit_ids = tuple(
+        STATUS_CIRCUIT.unpack_from(buff, offset + i * STATUS_CIRCUIT.size)[0]
+        for i in range(circuitCount)
+    )
+    return body_types, circuit_ids
+
+
+def decode_pool_status(
+    buff: bytes, data: dict, changes: ChangeSink = NO_CHANGES
+) -> None:
     controller: dict = data.setdefault(DEVICE.CONTROLLER, {})
 
     controller_sensor: dict = controller.setdefault(GROUP.SENSOR, {})
+    sensor_changes = changes.at(*CONTROLLER_SENSOR)
+
+    (
+        state,  # byte offset 0
+        freezeMode,  # 4
+        remotes,  # 5
+        poolDelay,  # 6
+        spaDelay,  # 7
+        cleanerDelay,  # 8
+        unknown9,  # 9
+        unknown10,  # 10
+        unknown11,  # 11
+        airTemp,  # 12
+        bodiesCount,  # 16
+    ) = STATUS_HEADER.unpack_from(buff, 0)
+    offset = STATUS_HEADER.size
+
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.STATE),
+        state,
+        changes=sensor_changes,
+    )
 
-    state, offset = getSome("I", buff, 0)  # byte offset 0
-    controller_sensor[VALUE.STATE] = {
-        ATTR.NAME: "Controller State",
-        ATTR.VALUE: state,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ENUM,
-        ATTR.ENUM_OPTIONS: [state.title for state in CONTROLLER_STATE],
-    }
-
-    freezeMode, offset = getSome("B", buff, offset)  # byte offset 4
-    controller_sensor[VALUE.FREEZE_MODE] = {
-        ATTR.NAME: "Freeze Mode",
-        ATTR.VALUE: ON_OFF.from_bool(freezeMode & 0x08).value,
-    }
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.FREEZE_MODE),
+        ON_OFF.from_bool(freezeMode & 0x08).value,
+        changes=sensor_changes,
+    )
 
     controller_config: dict = controller.setdefault(GROUP.CONFIGURATION, {})
+    config_changes = changes.at(DEVICE.CONTROLLER, GROUP.CONFIGURATION)
 
-    controller_config[VALUE.REMOTES], offset = getSome("B", buff, offset)  # 5
+    config_changes.set(controller_config, VALUE.REMOTES, remotes)
 
-    poolDelay, offset = getSome("B", buff, offset)  # 6
-    controller_sensor[VALUE.POOL_DELAY] = {
-        ATTR.NAME: "Pool Delay",
-        ATTR.VALUE: poolDelay,
-    }
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.POOL_DELAY),
+        poolDelay,
+        changes=sensor_changes,
+    )
 
-    spaDelay, offset = getSome("B", buff, offset)  # 7
-    controller_sensor[VALUE.SPA_DELAY] = {
-        ATTR.NAME: "Spa Delay",
-        ATTR.VALUE: spaDelay,
-    }
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.SPA_DELAY),
+        spaDelay,
+        changes=sensor_changes,
+    )
 
-    cleanerDelay, offset = getSome("B", buff, offset)  # 8
-    controller_sensor[VALUE.CLEANER_DELAY] = {
-        ATTR.NAME: "Cleaner Delay",
-        ATTR.VALUE: cleanerDelay,
-    }
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.CLEANER_DELAY),
+        cleanerDelay,
+        changes=sensor_changes,
+    )
 
-    controller_config[UNKNOWN(offset)], offset = getSome("B", buff, offset)  # 9
-    controller_config[UNKNOWN(offset)], offset = getSome("B", buff, offset)  # 10
-    controller_config[UNKNOWN(offset)], offset = getSome("B", buff, offset)  # 11
+    config_changes.set(controller_config, UNKNOWN(9), unknown9)
+    config_changes.set(controller_config, UNKNOWN(10), unknown10)
+    config_changes.set(controller_config, UNKNOWN(11), unknown11)
 
     temperature_unit = getTemperatureUnit(data)
 
-    airTemp, offset = getSome("i", buff, offset)  # 12
-    controller_sensor[VALUE.AIR_TEMPERATURE] = {
-        ATTR.NAME: "Air Temperature",
-        ATTR.VALUE: airTemp,
-        ATTR.UNIT: temperature_unit,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.TEMPERATURE,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    bodiesCount, offset = getSome("I", buff, offset)  # 16
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.AIR_TEMPERATURE),
+        airTemp,
+        temperature_unit,
+        changes=sensor_changes,
+    )
 
     # Should this default to 2?
     bodiesCount = min(bodiesCount, 2)
@@ -95,137 +146,178 @@ def decode_pool_status(buff: bytes, data: dict) -> None:
 
     for i in range(bodiesCount):
         body_indexed: dict = body.setdefault(i, {})
-
-        bodyType, offset = getSome("I", buff, offset)
+        body_changes = changes.at(DEVICE.BODY, i)
+
+        (
+            bodyType,
+            lastTemp,
+            heatStatus,
+            heatSetPoint,
+            coolSetPoint,
+            heatMode,
+        ) = STATUS_BODY.unpack_from(buff, offset)
+        offset += STATUS_BODY.size
 
         body_type = BODY_TYPE.parse(bodyType)
-        body_indexed[ATTR.BODY_TYPE] = body_type.value
+        body_changes.set(body_indexed, ATTR.BODY_TYPE, body_type.value)
 
         if body_setpoints:
             if body_type_setpoints := body_setpoints.get(body_type.value):
-                body_indexed[ATTR.MIN_SETPOINT] = body_type_setpoints[ATTR.MIN_SETPOINT]
-                body_indexed[ATTR.MAX_SETPOINT] = body_type_setpoints[ATTR.MAX_SETPOINT]
-
-        body_indexed[ATTR.NAME] = body_name = body_type.title
-
-        lastTemp, offset = getSome("i", buff, offset)
-        body_indexed[VALUE.LAST_TEMPERATURE] = {
-            ATTR.NAME: f"Last {body_name} Temperature",
-            ATTR.VALUE: lastTemp,
-            ATTR.UNIT: temperature_unit,
-            ATTR.DEVICE_TYPE: DEVICE_TYPE.TEMPERATURE,
-            ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-        }
-
-        heatStatus, offset = getSome("i", buff, offset)
-        body_indexed[VALUE.HEAT_STATE] = {
-            ATTR.NAME: f"{body_name} Heat",
-            ATTR.VALUE: heatStatus,
-            ATTR.DEVICE_TYPE: DEVICE_TYPE.ENUM,
-            ATTR.ENUM_OPTIONS: [hs.title for hs in HEAT_STATE],
-        }
-
-        heatSetPoint, offset = getSome("i", buff, offset)
-        body_indexed[VALUE.HEAT_SETPOINT] = {
-            ATTR.NAME: f"{body_name} Heat Set Point",
-            ATTR.VALUE: heatSetPoint,
-            ATTR.UNIT: temperature_unit,
-            ATTR.DEVICE_TYPE: DEVICE_TYPE.TEMPERATURE,
-        }
-
-        coolSetPoint, offset = getSome("i", buff, offset)
-        body_indexed[VALUE.COOL_SETPOINT] = {
-            ATTR.NAME: f"{body_name} Cool Set Point",
-            ATTR.VALUE: coolSetPoint,
-            ATTR.UNIT: temperature_unit,
-            ATTR.DEVICE_TYPE: DEVICE_TYPE.TEMPERATURE,
-        }
-
-        heatMode, offset = getSome("i", buff, offset)
-        body_indexed[VALUE.HEAT_MODE] = {
-            ATTR.NAME: f"{body_name} Heat Mode",
-            ATTR.VALUE: heatMode,
-            ATTR.DEVICE_TYPE: DEVICE_TYPE.ENUM,
-            ATTR.ENUM_OPTIONS: [hm.title for hm in HEAT_MODE],
-        }
-
-    circuitCount, offset = getSome("I", buff, offset)
+                body_changes.set(
+                    body_indexed,
+                    ATTR.MIN_SETPOINT,
+                    body_type_setpoints[ATTR.MIN_SETPOINT],
+                )
+                body_changes.set(
+                    body_indexed,
+                    ATTR.MAX_SETPOINT,
+                    body_type_setpoints[ATTR.MAX_SETPOINT],
+                )
+
+        body_name = body_type.title
+        body_changes.set(body_indexed, ATTR.NAME, body_name)
+
+        setValue(
+            body_indexed,
+            (DEVICE.BODY, None, VALUE.LAST_TEMPERATURE),
+            lastTemp,
+            body_name,
+            temperature_unit,
+            changes=body_changes,
+        )
+
+        setValue(
+            body_indexed,
+            (DEVICE.BODY, None, VALUE.HEAT_STATE),
+            heatStatus,
+            body_name,
+            temperature_unit,
+            changes=body_changes,
+        )
+
+        setValue(
+            body_indexed,
+            (DEVICE.BODY, None, VALUE.HEAT_SETPOINT),
+            heatSetPoint,
+            body_name,
+            temperature_unit,
+            changes=body_changes,
+        )
+
+        setValue(
+            body_indexed,
+            (DEVICE.BODY, None, VALUE.COOL_SETPOINT),
+            coolSetPoint,
+            body_name,
+            temperature_unit,
+            changes=body_changes,
+        )
+
+        setValue(
+            body_indexed,
+            (DEVICE.BODY, None, VALUE.HEAT_MODE),
+            heatMode,
+            body_name,
+            temperature_unit,
+            changes=body_changes,
+        )
+
+    (circuitCount,) = STATUS_CIRCUIT_COUNT.unpack_from(buff, offset)
+    offset += STATUS_CIRCUIT_COUNT.size
 
     circuit: dict = data.setdefault(DEVICE.CIRCUIT, {})
 
     for i in range(circuitCount):
-        circuit_id, offset = getSome("I", buff, offset)
+        (
+            circuit_id,
+            circuit_state,
+            color_set,
+            color_position,
+            color_stagger,
+            delay,
+        ) = STATUS_CIRCUIT.unpack_from(buff, offset)
+        offset += STATUS_CIRCUIT.size
 
         circuit_indexed: dict = circuit.setdefault(circuit_id, {})
+        circuit_changes = changes.at(DEVICE.CIRCUIT, circuit_id)
 
         if ATTR.CIRCUIT_ID not in circuit_indexed:
-            circuit_indexed[ATTR.CIRCUIT_ID] = circuit_id
-
-        circuit_indexed[ATTR.VALUE], offset = getSome("I", buff, offset)
-
-        color_set, offset = getSome("B", buff, offset)
-        color_position, offset = getSome("B", buff, offset)
-        color_stagger, offset = getSome("B", buff, offset)
-        circuit_indexed[GROUP.COLOR] = {
-            ATTR.COLOR_SET: color_set,
-            ATTR.COLOR_POSITION: color_position,
-            ATTR.COLOR_STAGGER: color_stagger,
-        }
+            circuit_changes.set(circuit_indexed, ATTR.CIRCUIT_ID, circuit_id)
+
+        circuit_changes.set(circuit_indexed, ATTR.VALUE, circuit_state)
+
+        circuit_changes.set(
+            circuit_indexed,
+            GROUP.COLOR,
+            {
+                ATTR.COLOR_SET: color_set,
+                ATTR.COLOR_POSITION: color_position,
+                ATTR.COLOR_STAGGER: color_stagger,
+            },
+        )
 
         circuit_indexed_config: dict = circuit_indexed.setdefault(
             GROUP.CONFIGURATION, {}
         )
-        circuit_indexed_config[ATTR.DELAY], offset = getSome("B", buff, offset)
-
-    pH, offset = getSome("i", buff, offset)
-    controller_sensor[VALUE.PH] = {
-        ATTR.NAME: "pH",
-        ATTR.VALUE: (pH / 100),
-        ATTR.UNIT: UNIT.PH,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    orp, offset = getSome("i", buff, offset)
-    controller_sensor[VALUE.ORP] = {
-        ATTR.NAME: "ORP",
-        ATTR.VALUE: orp,
-        ATTR.UNIT: UNIT.MILLIVOLT,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    saturation, offset = getSome("i", buff, offset)
-    controller_sensor[VALUE.SATURATION] = {
-        ATTR.NAME: "Saturation Index",
-        ATTR.VALUE: (saturation / 100),
-        ATTR.UNIT: UNIT.SATURATION_INDEX,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    saltPPM, offset = getSome("i", buff, offset)
-    controller_sensor[VALUE.SALT_PPM] = {
-        ATTR.NAME: "Salt",
-        ATTR.VALUE: (saltPPM * 50),
-        ATTR.UNIT: UNIT.PARTS_PER_MILLION,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    pHTank, offset = getSome("i", buff, offset)
-    controller_sensor[VALUE.PH_SUPPLY_LEVEL] = {
-        ATTR.NAME: "pH Supply Level",
-        ATTR.VALUE: pHTank,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    orpTank, offset = getSome("i", buff, offset)
-    controller_sensor[VALUE.ORP_SUPPLY_LEVEL] = {
-        ATTR.NAME: "ORP Supply Level",
-        ATTR.VALUE: orpTank,
-        ATTR.STATE_TYPE: STATE_TYPE.MEASUREMENT,
-    }
-
-    alert, offset = getSome("i", buff, offset)
-    controller_sensor[VALUE.ACTIVE_ALERT] = {
-        ATTR.NAME: "Active Alert",
-        ATTR.VALUE: alert,
-        ATTR.DEVICE_TYPE: DEVICE_TYPE.ALARM,
-    }
+        circuit_changes.at(GROUP.CONFIGURATION).set(
+            circuit_indexed_config, ATTR.DELAY, delay
+        )
+
+    (
+        pH,
+        orp,
+        saturation,
+        saltPPM,
+        pHTank,
+        orpTank,
+        alert,
+    ) = STATUS_CHEMISTRY.unpack_from(buff, offset)
+
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.PH),
+        (pH / 100),
+        changes=sensor_changes,
+    )
+
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.ORP),
+        orp,
+        changes=sensor_changes,
+    )
+
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.SATURATION),
+        (saturation / 100),
+        changes=sensor_changes,
+    )
+
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.SALT_PPM),
+        (saltPPM * 50),
+        changes=sensor_changes,
+    )
+
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.PH_SUPPLY_LEVEL),
+        pHTank,
+        changes=sensor_changes,
+    )
+
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.ORP_SUPPLY_LEVEL),
+        orpTank,
+        changes=sensor_changes,
+    )
+
+    setValue(
+        controller_sensor,
+        (*CONTROLLER_SENSOR, VALUE.ACTIVE_ALERT),
+        alert,
+        changes=sensor_changes,
+    )
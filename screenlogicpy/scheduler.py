@@ -0,0 +1,209 @@
+"""Poll only the ScreenLogic data that push messages have not kept fresh."""
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import time
+from typing import Callable
+
+from .const.common import DATA_REQUEST, ScreenLogicException
+from .const.msg import CODE
+from .gateway import ScreenLogicGateway
+from .requests.status import status_structure
+
+# Seconds to wait before polling again after a failed poll.
+SCHEDULER_RETRY_WAIT = 5
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PollInterval:
+    """
+    How often a category of data is polled.
+
+    A category is polled once it has not been refreshed, by a poll or a push, for
+    'max_interval' seconds. A poll triggered by a change elsewhere waits until it
+    has not been refreshed for 'min_interval' seconds. A 'max_interval' of None
+    means the category is only polled when triggered.
+    """
+
+    min_interval: float
+    max_interval: float | None
+
+    def __post_init__(self):
+        if self.min_interval < 0 or (
+            self.max_interval is not None and self.max_interval < self.min_interval
+        ):
+            raise ValueError(f"Invalid poll interval: {self}")
+
+
+DEFAULT_POLL_INTERVALS = {
+    DATA_REQUEST.STATUS: PollInterval(10, 60),
+    DATA_REQUEST.PUMPS: PollInterval(10, 30),
+    DATA_REQUEST.CHEMISTRY: PollInterval(10, 60),
+    DATA_REQUEST.SCG: PollInterval(10, 60),
+    DATA_REQUEST.DATE_TIME: PollInterval(60, 3600),
+    DATA_REQUEST.CONFIG: PollInterval(60, None),
+}
+
+# Pushed messages that refresh a category.
+PUSH_CATEGORIES = {
+    CODE.STATUS_CHANGED: DATA_REQUEST.STATUS,
+    CODE.CHEMISTRY_CHANGED: DATA_REQUEST.CHEMISTRY,
+}
+
+
+class PollScheduler:
+    """
+    Class for polling a gateway's data by category as each becomes stale.
+
+    Status and chemistry are refreshed by push messages once async_start() has
+    subscribed to them. The pool configuration is polled when a status message
+    lists different bodies or circuits than the one before it.
+    """
+
+    def __init__(
+        self,
+        gateway: ScreenLogicGateway,
+        intervals: dict[str, PollInterval] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._gateway = gateway
+        self._intervals = {**DEFAULT_POLL_INTERVALS, **(intervals or {})}
+        self._clock = clock
+        self._refreshed: dict[str, float] = {}
+        self._triggered: set[str] = set()
+        self._structure = None
+        self._unsubs: list[Callable] = []
+        self._wake = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._pollers = {
+            DATA_REQUEST.STATUS: gateway.async_get_status,
+            DATA_REQUEST.PUMPS: gateway.async_get_pumps,
+            DATA_REQUEST.CHEMISTRY: gateway.async_get_chemistry,
+            DATA_REQUEST.SCG: gateway.async_get_scg,
+            DATA_REQUEST.DATE_TIME: gateway.async_get_datetime,
+            DATA_REQUEST.CONFIG: gateway.async_get_config,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def last_refreshed(self, category: str) -> float | None:
+        """Clock time of the last poll or push for a category."""
+        return self._refreshed.get(category)
+
+    def mark_refreshed(self, category: str, now: float | None = None) -> None:
+        """Record that a category's data is current."""
+        self._refreshed[category] = self._clock() if now is None else now
+        self._triggered.discard(category)
+        if category == DATA_REQUEST.STATUS:
+            self._check_structure()
+
+    def trigger(self, category: str) -> None:
+        """Poll a category as soon as its minimum interval allows."""
+        self._triggered.add(category)
+        self._wake.set()
+
+    def next_due(self, category: str) -> float | None:
+        """Clock time a category is next due, or None if it is not scheduled."""
+        interval = self._intervals[category]
+        if (last := self._refreshed.get(category)) is None:
+            if interval.max_interval is None and category not in self._triggered:
+                return None
+            return float("-inf")
+        if category in self._triggered:
+            return last + interval.min_interval
+        if interval.max_interval is None:
+            return None
+        return last + interval.max_interval
+
+    def stale_categories(self, now: float | None = None) -> list[str]:
+        """Return the categories due for a poll."""
+        now = self._clock() if now is None else now
+        return [
+            category
+            for category in self._pollers
+            if (due := self.next_due(category)) is not None and due <= now
+        ]
+
+    async def async_poll_stale(self) -> list[str]:
+        """
+        Poll each category that is due, configuration first.
+
+        Returns the categories polled.
+        """
+        stale = self.stale_categories()
+        if DATA_REQUEST.CONFIG in stale:
+            stale.remove(DATA_REQUEST.CONFIG)
+            stale.insert(0, DATA_REQUEST.CONFIG)
+        for category in stale:
+            _LOGGER.debug("Polling stale %s data", category)
+            await self._pollers[category]()
+            self.mark_refreshed(category)
+        return stale
+
+    async def async_start(self) -> None:
+        """Subscribe to push messages and poll in the background."""
+        if self._task is not None:
+            return
+        self._structure = self._current_structure()
+        for code, category in PUSH_CATEGORIES.items():
+            if unsub := await self._gateway.async_subscribe_client(
+                lambda category=category: self._on_push(category), code
+            ):
+                self._unsubs.append(unsub)
+        self._stop.clear()
+        self._task = asyncio.create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Stop polling and unsubscribe from push messages."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._task is not None:
+            self._stop.set()
+            self._wake.set()
+            await self._task
+            self._task = None
+
+    def _on_push(self, category: str) -> None:
+        self.mark_refreshed(category)
+        self._wake.set()
+
+    async def _async_run(self) -> None:
+        while not self._stop.is_set():
+            min_delay = 0
+            try:
+                await self.async_poll_stale()
+            except ScreenLogicException as ex:
+                _LOGGER.debug("Scheduled poll failed: %s", ex)
+                min_delay = SCHEDULER_RETRY_WAIT
+            due = [
+                due
+                for category in self._pollers
+                if (due := self.next_due(category)) is not None
+            ]
+            delay = max(min(due) - self._clock(), min_delay) if due else None
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _current_structure(self):
+        if status := self._gateway.get_debug().get(DATA_REQUEST.STATUS):
+            return status_structure(status)
+        return None
+
+    def _check_structure(self) -> None:
+        structure = self._current_structure()
+        if structure is None:
+            return
+        if self._structure is not None and structure != self._structure:
+            _LOGGER.debug("Bodies or circuits changed. Configuration is due.")
+            self.trigger(DATA_REQUEST.CONFIG)
+        self._structure = structure
@@ -0,0 +1,497 @@
+"""Store long sensor history on disk in memory-mapped segment files."""
+
+from array import array
+import asyncio
+from dataclasses import dataclass
+from functools import partial
+import logging
+import mmap
+import os
+import re
+import struct
+import time
+from typing import Callable, Iterator
+
+from .const.common import DATA_REQUEST, ScreenLogicError
+from .const.data import DEVICE, VALUE
+from .requests.chemistry import CHEMISTRY_DATA, CHEMISTRY_HEADER
+from .requests.pump import PUMP_HEADER
+from .requests.scg import SCG_CONFIG
+from .requests.status import STATUS_BODY, STATUS_HEADER
+
+# Stored in int columns for values a payload does not have, such as the second body
+# of a single body pool.
+INT_MISSING = -(2**31)
+
+# Rows per segment file. About a month of status polled every 30 seconds.
+SEGMENT_ROWS = 86400
+
+# Magic, row struct format, row capacity, row count, first and last timestamp.
+SEGMENT_HEADER = struct.Struct("<8s16sIIdd")
+SEGMENT_MAGIC = b"SLPYSEG1"
+
+_TIMESTAMP = struct.Struct("<d")
+_FILENAME = re.compile(r"^(?P<request>[a-z_]+)-(?P<sequence>\d{8})\.seg$")
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _status_row(buff: bytes, index: int | None) -> tuple:
+    air_temperature, bodies = STATUS_HEADER.unpack_from(buff, 0)[-2:]
+    temperatures = [INT_MISSING, INT_MISSING]
+    for i in range(min(bodies, 2)):
+        temperatures[i] = STATUS_BODY.unpack_from(
+            buff, STATUS_HEADER.size + i * STATUS_BODY.size
+        )[1]
+    return (air_temperature, *temperatures)
+
+
+def _chemistry_row(buff: bytes, index: int | None) -> tuple:
+    values = CHEMISTRY_DATA.unpack_from(buff, CHEMISTRY_HEADER.size)
+    saturation = values[10]
+    return (
+        values[0] / 100,
+        values[1],
+        (saturation - 256) / 100 if saturation & 0x80 else saturation / 100,
+        values[8],
+        values[9],
+    )
+
+
+def _pump_row(buff: bytes, index: int | None) -> tuple:
+    _, _, watts, rpm, _, gpm, _ = PUMP_HEADER.unpack_from(buff, 0)
+    return (index, watts, rpm, gpm)
+
+
+def _scg_row(buff: bytes, index: int | None) -> tuple:
+    return (SCG_CONFIG.unpack_from(buff, 0)[4] * 50,)
+
+
+@dataclass(frozen=True)
+class SegmentLayout:
+    """
+    The columns stored for a data request.
+
+    'extract' reads the column values straight from a response payload, scaled as
+    the decoders scale them, without decoding the rest of it.
+    """
+
+    columns: tuple[str, ...]
+    formats: str
+    extract: Callable[[bytes, int | None], tuple]
+
+    @property
+    def row(self) -> struct.Struct:
+        """Struct of a row, which is a timestamp followed by the columns."""
+        return struct.Struct(f"<d{self.formats}")
+
+
+SEGMENT_LAYOUTS = {
+    DATA_REQUEST.STATUS: SegmentLayout(
+        (
+            VALUE.AIR_TEMPERATURE,
+            f"{DEVICE.BODY}_0_{VALUE.LAST_TEMPERATURE}",
+            f"{DEVICE.BODY}_1_{VALUE.LAST_TEMPERATURE}",
+        ),
+        "3i",
+        _status_row,
+    ),
+    DATA_REQUEST.CHEMISTRY: SegmentLayout(
+        (
+            VALUE.PH_NOW,
+            VALUE.ORP_NOW,
+            VALUE.SATURATION,
+            VALUE.PH_SUPPLY_LEVEL,
+            VALUE.ORP_SUPPLY_LEVEL,
+        ),
+        "fifii",
+        _chemistry_row,
+    ),
+    DATA_REQUEST.PUMPS: SegmentLayout(
+        (DEVICE.PUMP, VALUE.WATTS_NOW, VALUE.RPM_NOW, VALUE.GPM_NOW),
+        "B3i",
+        _pump_row,
+    ),
+    DATA_REQUEST.SCG: SegmentLayout((VALUE.SALT_PPM,), "i", _scg_row),
+}
+
+
+class Segment:
+    """
+    One memory-mapped file of fixed width rows in timestamp order.
+
+    A new segment is created with room for 'capacity' rows. Its header keeps the row
+    count and the first and last timestamps, so an existing segment opens without
+    reading its rows.
+    """
+
+    def __init__(
+        self, path: str, row: struct.Struct, capacity: int = None, writable=False
+    ) -> None:
+        self.path = path
+        self._row = row
+        if capacity is not None:
+            with open(path, "wb") as fp:
+                fp.write(
+                    SEGMENT_HEADER.pack(
+                        SEGMENT_MAGIC, row.format.encode(), capacity, 0, 0.0, 0.0
+                    )
+                )
+                fp.truncate(SEGMENT_HEADER.size + capacity * row.size)
+            writable = True
+        self._writable = writable
+        with open(path, "r+b" if writable else "rb") as fp:
+            self._mm = mmap.mmap(
+                fp.fileno(),
+                0,
+                access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ,
+            )
+        magic, row_format, self.capacity, self.count, self.first, self.last = (
+            SEGMENT_HEADER.unpack_from(self._mm, 0)
+        )
+        if magic != SEGMENT_MAGIC or row_format.rstrip(b"\x00").decode() != row.format:
+            self._mm.close()
+            raise ScreenLogicError(f"{path} is not a segment of rows {row.format}")
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    def append(self, timestamp: float, values: tuple) -> None:
+        self._row.pack_into(
+            self._mm,
+            SEGMENT_HEADER.size + self.count * self._row.size,
+            timestamp,
+            *values,
+        )
+        if not self.count:
+            self.first = timestamp
+        self.count += 1
+        self.last = timestamp
+        SEGMENT_HEADER.pack_into(
+            self._mm,
+            0,
+            SEGMENT_MAGIC,
+            self._row.format.encode(),
+            self.capacity,
+            self.count,
+            self.first,
+            self.last,
+        )
+
+    def _timestamp(self, i: int) -> float:
+        return _TIMESTAMP.unpack_from(
+            self._mm, SEGMENT_HEADER.size + i * self._row.size
+        )[0]
+
+    def _search(self, timestamp: float) -> int:
+        """Return the index of the first row at or after 'timestamp'."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamp(mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def rows(self, start: float = None, end: float = None) -> Iterator[tuple]:
+        """Yield the rows with timestamps from 'start' up to but excluding 'end'."""
+        first = 0 if start is None else self._search(start)
+        last = self.count if end is None else self._search(end)
+        if first < last:
+            yield from self._row.iter_unpack(
+                self._mm[
+                    SEGMENT_HEADER.size
+                    + first * self._row.size : SEGMENT_HEADER.size
+                    + last * self._row.size
+                ]
+            )
+
+    def flush(self) -> None:
+        self._mm.flush()
+
+    def close(self) -> None:
+        if self._mm.closed:
+            return
+        if self._writable:
+            self._mm.flush()
+        self._mm.close()
+
+
+class SegmentStore:
+    """
+    Class for storing sensor history on disk, in segment files per data request.
+
+    Given to a gateway, the columns of SEGMENT_LAYOUTS are appended from every
+    status, chemistry, pump and chlorinator payload received, polled or pushed.
+    Files are named '<request>-<sequence>.seg' in 'directory'. Once a segment has
+    'segment_rows' rows the next one is started, and if 'max_segments' is set the
+    oldest segments of a request beyond it are deleted.
+
+    Only the segment being appended to stays mapped. The first and last timestamps
+    of every segment are indexed, so a time range query maps only the segments
+    that overlap it. Rows of a request are kept in timestamp order: a timestamp
+    earlier than the last one stored, as after the system clock is set back, is
+    stored as the last one.
+
+    Appended from a running event loop, segment files are created, closed and
+    deleted in the loop's default executor, and the rows received meanwhile wait
+    in memory. Use async_close() there to wait for them before closing.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_rows: int = SEGMENT_ROWS,
+        max_segments: int = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if segment_rows < 1 or (max_segments is not None and max_segments < 1):
+            raise ValueError("Invalid segment size or count")
+        self._directory = directory
+        self._segment_rows = segment_rows
+        self._max_segments = max_segments
+        self._clock = clock
+        # (sequence, first timestamp, last timestamp) of each closed segment.
+        self._index: dict[str, list[tuple[int, float, float]]] = {}
+        self._active: dict[str, tuple[int, Segment]] = {}
+        self._last: dict[str, float] = {}
+        # Rows of requests whose next segment is being opened in the executor.
+        self._pending: dict[str, list[tuple[float, tuple]]] = {}
+        self._jobs: set[asyncio.Future] = set()
+        os.makedirs(directory, exist_ok=True)
+        for filename in sorted(os.listdir(directory)):
+            if (match := _FILENAME.match(filename)) is None:
+                continue
+            request = match["request"]
+            if (layout := SEGMENT_LAYOUTS.get(request)) is None:
+                continue
+            segment = Segment(os.path.join(directory, filename), layout.row)
+            self._index.setdefault(request, []).append(
+                (int(match["sequence"]), segment.first, segment.last)
+            )
+            if segment.count:
+                self._last[request] = max(
+                    self._last.get(request, segment.last), segment.last
+                )
+            segment.close()
+
+    def __enter__(self) -> "SegmentStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def _path(self, request: str, sequence: int) -> str:
+        return os.path.join(self._directory, f"{request}-{sequence:08d}.seg")
+
+    def _open_segment(
+        self,
+        request: str,
+        layout: SegmentLayout,
+        active: tuple[int, Segment] | None,
+        last_indexed: tuple[int, float, float] | None,
+    ) -> tuple[int, Segment, bool]:
+        """
+        Open the segment to append to after the full 'active' one.
+
+        Without an active segment, the last indexed segment of an earlier run is
+        continued if it has room. Returns the sequence, the segment and if it was
+        continued. Blocks on file I/O.
+        """
+        if active is not None:
+            sequence = active[0] + 1
+        elif last_indexed is not None:
+            sequence = last_indexed[0]
+            segment = Segment(self._path(request, sequence), layout.row, writable=True)
+            if not segment.is_full:
+                return sequence, segment, True
+            segment.close()
+            sequence += 1
+        else:
+            sequence = 0
+        segment = Segment(self._path(request, sequence), layout.row, self._segment_rows)
+        return sequence, segment, False
+
+    def _activate(
+        self,
+        request: str,
+        active: tuple[int, Segment] | None,
+        sequence: int,
+        segment: Segment,
+        continued: bool,
+    ) -> list[str]:
+        """Make 'segment' the one appended to. Returns the paths of expired segments."""
+        indexed = self._index.setdefault(request, [])
+        if active is not None:
+            indexed.append((active[0], active[1].first, active[1].last))
+        elif continued:
+            indexed.pop()
+        self._active[request] = (sequence, segment)
+        expired = []
+        if self._max_segments is not None:
+            while indexed and len(indexed) + 1 > self._max_segments:
+                expired.append(self._path(request, indexed.pop(0)[0]))
+        return expired
+
+    @staticmethod
+    def _retire(segment: Segment | None, expired: list[str]) -> None:
+        """Close a full segment and delete expired ones. Blocks on file I/O."""
+        if segment is not None:
+            segment.close()
+        for path in expired:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _submit(self, loop: asyncio.AbstractEventLoop, func, *args) -> asyncio.Future:
+        job = loop.run_in_executor(None, func, *args)
+        self._jobs.add(job)
+        job.add_done_callback(self._jobs.discard)
+        return job
+
+    def _append_row(self, request: str, layout: SegmentLayout, row: tuple) -> None:
+        if (pending := self._pending.get(request)) is not None:
+            pending.append(row)
+            return
+        active = self._active.get(request)
+        if active is not None and not active[1].is_full:
+            active[1].append(*row)
+            return
+        last_indexed = indexed[-1] if (indexed := self._index.get(request)) else None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            opened = self._open_segment(request, layout, active, last_indexed)
+            expired = self._activate(request, active, *opened)
+            self._retire(active[1] if active is not None else None, expired)
+            opened[1].append(*row)
+            return
+        self._pending[request] = [row]
+        self._submit(
+            loop, self._open_segment, request, layout, active, last_indexed
+        ).add_done_callback(partial(self._segment_opened, request, layout, active))
+
+    def _segment_opened(
+        self,
+        request: str,
+        layout: SegmentLayout,
+        active: tuple[int, Segment] | None,
+        job: asyncio.Future,
+    ) -> None:
+        rows = self._pending.pop(request, None)
+        if job.cancelled() or job.exception() is not None:
+            _LOGGER.error(
+                f"Error opening a {request} segment, {len(rows or ())} rows lost",
+                exc_info=None if job.cancelled() else job.exception(),
+            )
+            return
+        loop = asyncio.get_running_loop()
+        if rows is None:
+            # Closed while the segment was being opened.
+            self._submit(loop, self._retire, job.result()[1], [])
+            return
+        expired = self._activate(request, active, *job.result())
+        if active is not None or expired:
+            self._submit(
+                loop, self._retire, active[1] if active is not None else None, expired
+            )
+        for row in rows:
+            self._append_row(request, layout, row)
+
+    def append(
+        self, request: str, raw: bytes, index: int = None, timestamp: float = None
+    ) -> None:
+        """
+        Append a row from the response payload of a data request.
+
+        'index' is the pump index of pump status. Payloads of other requests are
+        ignored.
+        """
+        if (layout := SEGMENT_LAYOUTS.get(request)) is None:
+            return
+        values = layout.extract(raw, index)
+        if timestamp is None:
+            timestamp = self._clock()
+        if (last := self._last.get(request)) is not None and timestamp < last:
+            timestamp = last
+        self._last[request] = timestamp
+        self._append_row(request, layout, (timestamp, values))
+
+    def query(
+        self, request: str, start: float = None, end: float = None
+    ) -> Iterator[tuple]:
+        """
+        Yield the rows stored for a data request in timestamp order.
+
+        Rows are (timestamp, *columns) tuples, from 'start' up to but excluding
+        'end'.
+        """
+        if (layout := SEGMENT_LAYOUTS.get(request)) is None:
+            raise ValueError(f"No segments for data request: {request}")
+        for sequence, first, last in list(self._index.get(request, ())):
+            if (end is not None and first >= end) or (
+                start is not None and last < start
+            ):
+                continue
+            segment = Segment(self._path(request, sequence), layout.row)
+            try:
+                yield from segment.rows(start, end)
+            finally:
+                segment.close()
+        if (active := self._active.get(request)) is not None:
+            yield from active[1].rows(start, end)
+
+    def column(
+        self,
+        request: str,
+        column: str,
+        start: float = None,
+        end: float = None,
+        pump: int = None,
+    ) -> tuple[array, array]:
+        """
+        Return array.array('d') timestamps and values of one column.
+
+        'pump' limits pump status rows to one pump.
+        """
+        columns = SEGMENT_LAYOUTS[request].columns
+        position = columns.index(column) + 1
+        timestamps = array("d")
+        values = array("d")
+        for row in self.query(request, start, end):
+            if pump is not None and row[1] != pump:
+                continue
+            if row[position] != INT_MISSING:
+                timestamps.append(row[0])
+                values.append(row[position])
+        return timestamps, values
+
+    def flush(self) -> None:
+        """Write the segments being appended to out to disk."""
+        for _, segment in self._active.values():
+            segment.flush()
+
+    def close(self) -> None:
+        """
+        Close the segments being appended to.
+
+        Rows still waiting for a segment to be opened are dropped.
+        """
+        self._pending.clear()
+        for request, (sequence, segment) in self._active.items():
+            self._index[request].append((sequence, segment.first, segment.last))
+            segment.close()
+        self._active.clear()
+
+    async def async_close(self) -> None:
+        """Wait for segment files being opened or closed, then close."""
+        while self._jobs:
+            await asyncio.wait(list(self._jobs))
+        self.close()
@@ -0,0 +1,421 @@
+"""Compact point-in-time snapshots of ScreenLogic gateway data."""
+
+from collections.abc import Iterator, Mapping
+import copy
+import time
+from typing import Any
+
+from .const.data import ATTR, DEVICE, GROUP, VALUE, UNKNOWN
+
+
+def _v(*keypath) -> tuple:
+    """Key path to the 'value' of a described entry."""
+    return (*keypath, ATTR.VALUE)
+
+
+class _DeviceState:
+    """
+    Per-poll values of one device.
+
+    Subclasses list their values in _FIELDS as (slot, key path) pairs, with key paths
+    relative to the device's dict in the gateway data. Values are stored in slots, so
+    an instance holds no names, units or other descriptive data.
+    """
+
+    __slots__ = ()
+    _FIELDS: tuple[tuple[str, tuple], ...] = ()
+
+    @classmethod
+    def from_data(cls, device_data: dict):
+        state = cls.__new__(cls)
+        for slot, keypath in cls._FIELDS:
+            setattr(state, slot, _lookup(device_data, keypath))
+        return state
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{slot}={getattr(self, slot)!r}" for slot in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__
+        )
+
+
+class ControllerState(_DeviceState):
+    _FIELDS = (
+        ("state", _v(GROUP.SENSOR, VALUE.STATE)),
+        ("freeze_mode", _v(GROUP.SENSOR, VALUE.FREEZE_MODE)),
+        ("pool_delay", _v(GROUP.SENSOR, VALUE.POOL_DELAY)),
+        ("spa_delay", _v(GROUP.SENSOR, VALUE.SPA_DELAY)),
+        ("cleaner_delay", _v(GROUP.SENSOR, VALUE.CLEANER_DELAY)),
+        ("air_temperature", _v(GROUP.SENSOR, VALUE.AIR_TEMPERATURE)),
+        ("ph", _v(GROUP.SENSOR, VALUE.PH)),
+        ("orp", _v(GROUP.SENSOR, VALUE.ORP)),
+        ("saturation", _v(GROUP.SENSOR, VALUE.SATURATION)),
+        ("salt_ppm", _v(GROUP.SENSOR, VALUE.SALT_PPM)),
+        ("ph_supply_level", _v(GROUP.SENSOR, VALUE.PH_SUPPLY_LEVEL)),
+        ("orp_supply_level", _v(GROUP.SENSOR, VALUE.ORP_SUPPLY_LEVEL)),
+        ("active_alert", _v(GROUP.SENSOR, VALUE.ACTIVE_ALERT)),
+        ("remotes", (GROUP.CONFIGURATION, VALUE.REMOTES)),
+        ("unknown9", (GROUP.CONFIGURATION, UNKNOWN(9))),
+        ("unknown10", (GROUP.CONFIGURATION, UNKNOWN(10))),
+        ("unknown11", (GROUP.CONFIGURATION, UNKNOWN(11))),
+        ("timestamp", (GROUP.DATE_TIME, VALUE.TIMESTAMP)),
+        ("timestamp_host", (GROUP.DATE_TIME, VALUE.TIMESTAMP_HOST)),
+        ("auto_dst", _v(GROUP.DATE_TIME, VALUE.AUTO_DST)),
+    )
+    __slots__ = tuple(slot for slot, _ in _FIELDS)
+
+
+class BodyState(_DeviceState):
+    _FIELDS = (
+        ("last_temperature", _v(VALUE.LAST_TEMPERATURE)),
+        ("heat_state", _v(VALUE.HEAT_STATE)),
+        ("heat_setpoint", _v(VALUE.HEAT_SETPOINT)),
+        ("cool_setpoint", _v(VALUE.COOL_SETPOINT)),
+        ("heat_mode", _v(VALUE.HEAT_MODE)),
+    )
+    __slots__ = tuple(slot for slot, _ in _FIELDS)
+
+
+class CircuitState(_DeviceState):
+    _FIELDS = (
+        ("value", (ATTR.VALUE,)),
+        ("color_set", (GROUP.COLOR, ATTR.COLOR_SET)),
+        ("color_position", (GROUP.COLOR, ATTR.COLOR_POSITION)),
+        ("color_stagger", (GROUP.COLOR, ATTR.COLOR_STAGGER)),
+        ("delay", (GROUP.CONFIGURATION, ATTR.DELAY)),
+    )
+    __slots__ = tuple(slot for slot, _ in _FIELDS)
+
+
+class PumpState(_DeviceState):
+    _FIELDS = (
+        ("type", (VALUE.TYPE,)),
+        ("state", _v(VALUE.STATE)),
+        ("watts_now", _v(VALUE.WATTS_NOW)),
+        ("rpm_now", _v(VALUE.RPM_NOW)),
+        ("gpm_now", _v(VALUE.GPM_NOW)),
+        ("unknown16", (UNKNOWN(16),)),
+        ("unknown24", (UNKNOWN(24),)),
+        *(
+            (f"preset{i}_{attr}", (VALUE.PRESET, i, attr))
+            for i in range(8)
+            for attr in (ATTR.DEVICE_ID, ATTR.SETPOINT, ATTR.IS_RPM)
+        ),
+    )
+    __slots__ = tuple(slot for slot, _ in _FIELDS)
+
+
+class ChemState(_DeviceState):
+    _FIELDS = (
+        ("unknown0", (UNKNOWN(0),)),
+        ("unknown4", (UNKNOWN(4),)),
+        ("ph_now", _v(GROUP.SENSOR, VALUE.PH_NOW)),
+        ("orp_now", _v(GROUP.SENSOR, VALUE.ORP_NOW)),
+        ("ph_supply_level", _v(GROUP.SENSOR, VALUE.PH_SUPPLY_LEVEL)),
+        ("orp_supply_level", _v(GROUP.SENSOR, VALUE.ORP_SUPPLY_LEVEL)),
+        ("saturation", _v(GROUP.SENSOR, VALUE.SATURATION)),
+        ("ph_probe_water_temp", _v(GROUP.SENSOR, VALUE.PH_PROBE_WATER_TEMP)),
+        ("ph_setpoint", _v(GROUP.CONFIGURATION, VALUE.PH_SETPOINT)),
+        ("orp_setpoint", _v(GROUP.CONFIGURATION, VALUE.ORP_SETPOINT)),
+        ("calcium_hardness", _v(GROUP.CONFIGURATION, VALUE.CALCIUM_HARDNESS)),
+        ("cya", _v(GROUP.CONFIGURATION, VALUE.CYA)),
+        ("total_alkalinity", _v(GROUP.CONFIGURATION, VALUE.TOTAL_ALKALINITY)),
+        ("salt_tds_ppm", _v(GROUP.CONFIGURATION, VALUE.SALT_TDS_PPM)),
+        ("probe_is_celsius", (GROUP.CONFIGURATION, VALUE.PROBE_IS_CELSIUS)),
+        ("config_flags", (GROUP.CONFIGURATION, VALUE.FLAGS)),
+        ("ph_last_dose_time", _v(GROUP.DOSE_STATUS, VALUE.PH_LAST_DOSE_TIME)),
+        ("orp_last_dose_time", _v(GROUP.DOSE_STATUS, VALUE.ORP_LAST_DOSE_TIME)),
+        ("ph_last_dose_volume", _v(GROUP.DOSE_STATUS, VALUE.PH_LAST_DOSE_VOLUME)),
+        ("orp_last_dose_volume", _v(GROUP.DOSE_STATUS, VALUE.ORP_LAST_DOSE_VOLUME)),
+        ("dose_flags", (GROUP.DOSE_STATUS, VALUE.FLAGS)),
+        ("ph_dosing_state", _v(GROUP.DOSE_STATUS, VALUE.PH_DOSING_STATE)),
+        ("orp_dosing_state", _v(GROUP.DOSE_STATUS, VALUE.ORP_DOSING_STATE)),
+        ("alarm_flags", (GROUP.ALARM, VALUE.FLAGS)),
+        ("flow_alarm", _v(GROUP.ALARM, VALUE.FLOW_ALARM)),
+        ("ph_high_alarm", _v(GROUP.ALARM, VALUE.PH_HIGH_ALARM)),
+        ("ph_low_alarm", _v(GROUP.ALARM, VALUE.PH_LOW_ALARM)),
+        ("orp_high_alarm", _v(GROUP.ALARM, VALUE.ORP_HIGH_ALARM)),
+        ("orp_low_alarm", _v(GROUP.ALARM, VALUE.ORP_LOW_ALARM)),
+        ("ph_supply_alarm", _v(GROUP.ALARM, VALUE.PH_SUPPLY_ALARM)),
+        ("orp_supply_alarm", _v(GROUP.ALARM, VALUE.ORP_SUPPLY_ALARM)),
+        ("probe_fault_alarm", _v(GROUP.ALARM, VALUE.PROBE_FAULT_ALARM)),
+        ("alert_flags", (GROUP.ALERT, VALUE.FLAGS)),
+        ("ph_lockout", _v(GROUP.ALERT, VALUE.PH_LOCKOUT)),
+        ("ph_limit", _v(GROUP.ALERT, VALUE.PH_LIMIT)),
+        ("orp_limit", _v(GROUP.ALERT, VALUE.ORP_LIMIT)),
+        ("firmware", _v(VALUE.FIRMWARE)),
+        ("firmware_major", (VALUE.FIRMWARE, ATTR.MAJOR)),
+        ("firmware_minor", (VALUE.FIRMWARE, ATTR.MINOR)),
+        ("balance_flags", (GROUP.WATER_BALANCE, VALUE.FLAGS)),
+        ("corrosive", _v(GROUP.WATER_BALANCE, VALUE.CORROSIVE)),
+        ("scaling", _v(GROUP.WATER_BALANCE, VALUE.SCALING)),
+        ("unknown44", (UNKNOWN(44),)),
+        ("unknown45", (UNKNOWN(45),)),
+        ("unknown46", (UNKNOWN(46),)),
+    )
+    __slots__ = tuple(slot for slot, _ in _FIELDS)
+
+
+class ScgState(_DeviceState):
+    _FIELDS = (
+        ("scg_present", (VALUE.SCG_PRESENT,)),
+        ("state", _v(GROUP.SENSOR, VALUE.STATE)),
+        ("salt_ppm", _v(GROUP.SENSOR, VALUE.SALT_PPM)),
+        ("pool_setpoint", _v(GROUP.CONFIGURATION, VALUE.POOL_SETPOINT)),
+        ("spa_setpoint", _v(GROUP.CONFIGURATION, VALUE.SPA_SETPOINT)),
+        ("super_chlor_timer", _v(GROUP.CONFIGURATION, VALUE.SUPER_CHLOR_TIMER)),
+        ("flags", (VALUE.FLAGS,)),
+        ("super_chlorinate", _v(VALUE.SUPER_CHLORINATE)),
+    )
+    __slots__ = tuple(slot for slot, _ in _FIELDS)
+
+
+# Devices with a single state, and devices with one state per index.
+SINGLE_DEVICE_STATES = {
+    DEVICE.CONTROLLER: ControllerState,
+    DEVICE.INTELLICHEM: ChemState,
+    DEVICE.SCG: ScgState,
+}
+INDEXED_DEVICE_STATES = {
+    DEVICE.BODY: BodyState,
+    DEVICE.CIRCUIT: CircuitState,
+    DEVICE.PUMP: PumpState,
+}
+
+
+def metadata_key(data: dict, *extra) -> tuple:
+    """
+    Return the parts of 'data' that snapshot metadata depends on.
+
+    Names and units are fixed by the pool configuration, except for pump names, which
+    follow the pump presets, and the temperature units. Pass anything else that should
+    invalidate metadata, such as the raw configuration response, in 'extra'.
+    """
+    controller_config = data.get(DEVICE.CONTROLLER, {}).get(GROUP.CONFIGURATION, {})
+    probe_temp = (
+        data.get(DEVICE.INTELLICHEM, {})
+        .get(GROUP.SENSOR, {})
+        .get(VALUE.PH_PROBE_WATER_TEMP, {})
+    )
+    return (
+        *extra,
+        controller_config.get(VALUE.IS_CELSIUS, {}).get(ATTR.VALUE),
+        probe_temp.get(ATTR.UNIT),
+        tuple(data),
+        *(
+            tuple(data.get(device, {}))
+            for device in (DEVICE.BODY, DEVICE.CIRCUIT, DEVICE.PUMP)
+        ),
+        tuple(
+            pump.get(VALUE.STATE, {}).get(ATTR.NAME)
+            for pump in data.get(DEVICE.PUMP, {}).values()
+        ),
+    )
+
+
+class SnapshotMetadata:
+    """
+    Descriptive data shared by all snapshots taken with the same configuration.
+
+    Holds a copy of the gateway data as a template, the layout of device states,
+    and the key paths in the template that are answered from a snapshot's states.
+    """
+
+    __slots__ = ("key", "template", "layout", "_locations", "_branches")
+
+    def __init__(self, data: dict, key: tuple | None = None) -> None:
+        self.key = key if key is not None else metadata_key(data)
+        self.template = copy.deepcopy(data)
+        layout = []
+        for device, state_cls in SINGLE_DEVICE_STATES.items():
+            if device in data:
+                layout.append(((device,), state_cls))
+        for device, state_cls in INDEXED_DEVICE_STATES.items():
+            for index in data.get(device, {}):
+                layout.append(((device, index), state_cls))
+
+        self._locations: dict[tuple, tuple[int, str]] = {}
+        self._branches: set[tuple] = set()
+        used_layout = []
+        for device_path, state_cls in layout:
+            device_data = self._template_at(device_path)
+            # Only values present in the template are taken from states.
+            paths = [
+                ((*device_path, *keypath), slot)
+                for slot, keypath in state_cls._FIELDS
+                if _lookup(device_data, keypath) is not None
+            ]
+            if not paths:
+                continue
+            for path, slot in paths:
+                self._locations[path] = (len(used_layout), slot)
+                for end in range(len(path)):
+                    self._branches.add(path[:end])
+            used_layout.append((device_path, state_cls))
+        self.layout: tuple[tuple[tuple, type[_DeviceState]], ...] = tuple(used_layout)
+
+    def _template_at(self, keypath: tuple):
+        return _lookup(self.template, keypath)
+
+
+def _lookup(data, keypath: tuple):
+    """Walk 'keypath' the way ScreenLogicGateway.get_data() does."""
+    current = data
+    for key in keypath:
+        if isinstance(current, dict):
+            current = current.get(key)
+        elif isinstance(current, list) and key in range(len(current)):
+            current = current[key]
+        else:
+            return None
+        if current is None:
+            return None
+    return current
+
+
+class ScreenLogicSnapshot:
+    """
+    Point-in-time values of a ScreenLogic system.
+
+    Per-poll values are held in slotted device states. Names, units, enum options and
+    configuration are shared through SnapshotMetadata and are only combined with the
+    values when read through get_data().
+    """
+
+    __slots__ = ("metadata", "taken", "_states")
+
+    def __init__(
+        self,
+        metadata: SnapshotMetadata,
+        states: tuple[_DeviceState, ...],
+        taken: float | None = None,
+    ) -> None:
+        self.metadata = metadata
+        self.taken = taken if taken is not None else time.time()
+        self._states = states
+
+    @classmethod
+    def capture(
+        cls, data: dict, metadata: SnapshotMetadata | None = None
+    ) -> "ScreenLogicSnapshot":
+        """Take a snapshot of 'data', reusing 'metadata' if provided."""
+        if metadata is None:
+            metadata = SnapshotMetadata(data)
+        states = tuple(
+            state_cls.from_data(_lookup(data, device_path) or {})
+            for device_path, state_cls in metadata.layout
+        )
+        return cls(metadata, states)
+
+    @property
+    def controller(self) -> ControllerState | None:
+        return self._single(DEVICE.CONTROLLER)
+
+    @property
+    def chemistry(self) -> ChemState | None:
+        return self._single(DEVICE.INTELLICHEM)
+
+    @property
+    def scg(self) -> ScgState | None:
+        return self._single(DEVICE.SCG)
+
+    @property
+    def bodies(self) -> dict[int, BodyState]:
+        return self._indexed(DEVICE.BODY)
+
+    @property
+    def circuits(self) -> dict[int, CircuitState]:
+        return self._indexed(DEVICE.CIRCUIT)
+
+    @property
+    def pumps(self) -> dict[int, PumpState]:
+        return self._indexed(DEVICE.PUMP)
+
+    def get_data(self, *keypath, strict: bool = False):
+        """
+        Return a data value from a key path.
+
+        Behaves like ScreenLogicGateway.get_data(). Dicts are returned as read-only
+        mappings that look up this snapshot's values as they are accessed.
+        """
+        value = self._resolve(keypath)
+        if value is None and strict:
+            raise KeyError(f"'{keypath}' not found")
+        return value
+
+    def get_value(self, *keypath, strict: bool = False):
+        """Returns the 'value' key of the dict at the end of the key path."""
+        return self.get_data(*keypath, ATTR.VALUE, strict=strict)
+
+    def get_name(self, *keypath, strict: bool = False):
+        """Returns the 'name' key of the dict at the end of the key path."""
+        return self.get_data(*keypath, ATTR.NAME, strict=strict)
+
+    def as_dict(self) -> dict:
+        """Return the snapshot as a nested dict in the gateway data format."""
+        return SnapshotView(self, (), self.metadata.template).as_dict()
+
+    def _resolve(self, keypath: tuple):
+        if (location := self.metadata._locations.get(keypath)) is not None:
+            position, slot = location
+            return getattr(self._states[position], slot)
+        value = self.metadata._template_at(keypath)
+        if isinstance(value, dict) and keypath in self.metadata._branches:
+            return SnapshotView(self, keypath, value)
+        return value
+
+    def _single(self, device: str):
+        for position, (device_path, _) in enumerate(self.metadata.layout):
+            if device_path == (device,):
+                return self._states[position]
+        return None
+
+    def _indexed(self, device: str) -> dict:
+        return {
+            device_path[1]: self._states[position]
+            for position, (device_path, _) in enumerate(self.metadata.layout)
+            if len(device_path) == 2 and device_path[0] == device
+        }
+
+
+class SnapshotView(Mapping):
+    """Read-only dict view of part of a snapshot."""
+
+    __slots__ = ("_snapshot", "_keypath", "_template")
+
+    def __init__(
+        self, snapshot: ScreenLogicSnapshot, keypath: tuple, template: dict
+    ) -> None:
+        self._snapshot = snapshot
+        self._keypath = keypath
+        self._template = template
+
+    def __getitem__(self, key) -> Any:
+        if key not in self._template:
+            raise KeyError(key)
+        return self._snapshot._resolve((*self._keypath, key))
+
+    def __iter__(self) -> Iterator:
+        return iter(self._template)
+
+    def __len__(self) -> int:
+        return len(self._template)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+    def as_dict(self) -> dict:
+        """Return this view as a nested dict."""
+        return {
+            key: (
+                value.as_dict()
+                if isinstance(value, SnapshotView)
+                else copy.deepcopy(value)
+            )
+            for key, value in self.items()
+        }
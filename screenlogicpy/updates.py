@@ -0,0 +1,176 @@
+"""Stream pushed ScreenLogic updates through async iterators."""
+
+import asyncio
+from collections import deque
+from functools import partial
+import time
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+from .client import DECODED_CODES
+from .const.common import OVERFLOW, ScreenLogicError
+from .const.msg import UPDATE_QUEUE_SIZE
+from .diff import DataChange
+
+if TYPE_CHECKING:
+    from .gateway import ScreenLogicGateway
+    from .snapshot import ScreenLogicSnapshot
+
+class PushUpdate(NamedTuple):
+    """
+    A pushed message applied to the gateway data.
+
+    'changes' lists the values the message changed, or is None for message codes
+    that are not decoded. 'snapshot' is the data after the message, for streams
+    of snapshots.
+    """
+
+    code: int
+    received: float
+    changes: list[DataChange] | None
+    snapshot: "ScreenLogicSnapshot | None" = None
+
+
+def merge_updates(older: PushUpdate, newer: PushUpdate) -> PushUpdate:
+    """
+    Return one update with the effect of 'older' followed by 'newer'.
+
+    Each changed value keeps its old value from the first change and its new value
+    from the last. Values changed back to where they started are left out.
+    """
+    if older.changes is None or newer.changes is None:
+        changes = newer.changes
+    else:
+        merged = {change.path: change for change in older.changes}
+        for change in newer.changes:
+            if (first := merged.get(change.path)) is not None:
+                change = DataChange(change.path, first.old, change.new)
+            merged[change.path] = change
+        changes = [change for change in merged.values() if change.old != change.new]
+    return newer._replace(changes=changes)
+
+
+class UpdateStream:
+    """
+    Async iterator of the pushed updates a gateway receives.
+
+    The stream subscribes to 'codes' when iteration starts, and ends once closed.
+    Updates wait in a queue of at most 'maxsize' until the consumer takes them,
+    and 'overflow' decides what happens when a consumer falls that far behind, so
+    a slow consumer holds a bounded amount of memory. With
+    OVERFLOW.COALESCE_LATEST, an update waiting for a message code absorbs each new
+    update for that code, so a consumer only sees the net changes since it last
+    looked.
+
+    Decoded message codes yield only when they change something, unless
+    'snapshots' is True, in which case every message yields a snapshot of the
+    data.
+    """
+
+    def __init__(
+        self,
+        gateway: "ScreenLogicGateway",
+        codes: tuple[int, ...] = DECODED_CODES,
+        snapshots: bool = False,
+        maxsize: int = UPDATE_QUEUE_SIZE,
+        overflow: str = OVERFLOW.DROP_OLDEST,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError(f"Invalid queue size: {maxsize}")
+        if overflow not in (OVERFLOW.DROP_OLDEST, OVERFLOW.COALESCE_LATEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._gateway = gateway
+        self._codes = tuple(codes)
+        self._snapshots = snapshots
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._queue: deque[PushUpdate] = deque()
+        self._ready = asyncio.Event()
+        self._unsubscribes: list[Callable] = []
+        self._subscribed = False
+        self._closed = False
+        self._dropped = 0
+
+    def __aiter__(self) -> "UpdateStream":
+        return self
+
+    async def __anext__(self) -> PushUpdate:
+        if not self._subscribed and not self._closed:
+            await self.async_subscribe()
+        while not self._queue:
+            if self._closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+    async def __aenter__(self) -> "UpdateStream":
+        await self.async_subscribe()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @property
+    def dropped(self) -> int:
+        """Number of updates discarded because the queue was full."""
+        return self._dropped
+
+    @property
+    def pending(self) -> int:
+        """Number of updates waiting to be taken."""
+        return len(self._queue)
+
+    async def async_subscribe(self) -> None:
+        """Subscribe to the stream's message codes, if not already subscribed."""
+        if self._subscribed:
+            return
+        if self._closed:
+            raise ScreenLogicError("Update stream is closed.")
+        for code in self._codes:
+            unsubscribe = await self._gateway.async_subscribe_client(
+                partial(self._put, code),
+                code,
+                not self._snapshots and code in DECODED_CODES,
+            )
+            if unsubscribe is None:
+                self._unsubscribe()
+                raise ScreenLogicError(
+                    "Not connected to ScreenLogic gateway. Must connect to gateway before streaming updates."
+                )
+            self._unsubscribes.append(unsubscribe)
+        self._subscribed = True
+
+    async def aclose(self) -> None:
+        """Unsubscribe and end iteration once the waiting updates are taken."""
+        self._closed = True
+        self._unsubscribe()
+        self._ready.set()
+
+    def _unsubscribe(self) -> None:
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._unsubscribes.clear()
+
+    def _put(self, code: int, changes: list[DataChange] = None) -> None:
+        if self._closed:
+            return
+        update = PushUpdate(
+            code,
+            time.time(),
+            changes,
+            self._gateway.take_snapshot() if self._snapshots else None,
+        )
+        if self._overflow == OVERFLOW.COALESCE_LATEST:
+            for i, waiting in enumerate(self._queue):
+                if waiting.code == code:
+                    del self._queue[i]
+                    update = merge_updates(waiting, update)
+                    break
+            if update.changes == [] and not self._snapshots:
+                # The changes cancelled out.
+                return
+        if len(self._queue) >= self._maxsize:
+            self._queue.popleft()
+            self._dropped += 1
+        self._queue.append(update)
+        self._ready.set()
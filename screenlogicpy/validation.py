@@ -1,4 +1,7 @@
-from .const import BODY_TYPE, COLOR_MODE, HEAT_MODE
+import copy
+
+from .device_const.heat import HEAT_MODE
+from .device_const.system import BODY_TYPE, COLOR_MODE
 
 
 class DataValidationKey:
@@ -48,8 +51,8 @@ class DataValidation:
     _config_bounds = {
         DV_KEY.BODY: {0, 1},
         DV_KEY.CIRCUIT: {500, 505},
-        DV_KEY.COLOR_MODE: set(COLOR_MODE.NAME_FOR_NUM.keys()),
-        DV_KEY.HEAT_MODE: set(HEAT_MODE.NAME_FOR_NUM.keys()),
+        DV_KEY.COLOR_MODE: {mode.value for mode in COLOR_MODE},
+        DV_KEY.HEAT_MODE: {mode.value for mode in HEAT_MODE},
         DV_KEY.HEAT_TEMP: {
             0: (40, 104),
             1: (40, 104),
@@ -63,6 +66,8 @@ class DataValidation:
     }
 
     def __init__(self) -> None:
+        # Updates apply to this instance only.
+        self._config_bounds = copy.deepcopy(self._config_bounds)
         self._data_bounds = {
             **self._static_bounds,
             **self._app_bounds,
@@ -2,16 +2,18 @@ import asyncio
 from enum import IntEnum
 from dataclasses import dataclass
 from datetime import datetime
+import logging
 import struct
-from typing import Any
+from typing import Any, Iterable
 
-from screenlogicpy.const.msg import CODE, HEADER_LENGTH
+from screenlogicpy.capture import RECEIVED, CaptureRecord
+from screenlogicpy.const.msg import CODE
 from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.requests.framer import MessageFramer
 from screenlogicpy.requests.utility import (
     encodeMessageString,
     encodeMessageTime,
     makeMessage,
-    takeMessage,
     getSome,
     getString,
 )
@@ -20,6 +22,8 @@ from tests.const_data import (
     FAKE_GATEWAY_MAC,
 )
 
+_LOGGER = logging.getLogger(__name__)
+
 
 @dataclass
 class SLMessage:
@@ -28,6 +32,15 @@ class SLMessage:
     data: bytes = b""
 
 
+# Messages the protocol adapter sends without a request.
+PUSH_CODES = (
+    CODE.WEATHER_FORECAST_CHANGED,
+    CODE.STATUS_CHANGED,
+    CODE.COLOR_UPDATE,
+    CODE.CHEMISTRY_CHANGED,
+)
+
+
 class CONNECTION_STATE(IntEnum):
     NO_CONNECTION = 0
     PRIMED = 1
@@ -38,8 +51,9 @@ class FakeTCPProtocolAdapter(asyncio.Protocol):
     def __init__(self, responses: ScreenLogicResponseCollection) -> None:
         self.responses = responses
         self._cs = CONNECTION_STATE.NO_CONNECTION
-        self._buff = bytearray()
-        print("TCP up")
+        self._framer = MessageFramer()
+        self.is_client = False
+        _LOGGER.debug("TCP up")
 
         self.unconnected_response_map = {
             CODE.CHALLENGE_QUERY: self.handle_challenge_request,
@@ -69,38 +83,40 @@ class FakeTCPProtocolAdapter(asyncio.Protocol):
 
     def connection_made(self, transport: asyncio.Transport) -> None:
         self.transport = transport
-        print("TCP Connected.")
+        _LOGGER.debug("TCP Connected.")
 
     def data_received(self, data: bytes) -> None:
-        print("Pentair data received!")
+        _LOGGER.debug("Pentair data received!")
         self.process_data(data)
 
     def process_data(self, data: bytes) -> bytes:
         if self._cs == CONNECTION_STATE.NO_CONNECTION:
             if data == b"CONNECTSERVERHOST\r\n\r\n":
-                print("Adapter primmed!")
+                _LOGGER.debug("Adapter primmed!")
                 self._cs = CONNECTION_STATE.PRIMED
                 return None
             # Adapter not primed. Go away.
             self.transport.close()
 
-        self._buff.extend(data)
-
-        # Take complete messages
-        while len(self._buff) >= HEADER_LENGTH:
-            dataLen = struct.unpack_from("<I", self._buff, 4)[0]
-            nextMsgLen = HEADER_LENGTH + dataLen
-            if len(self._buff) >= nextMsgLen:
-                out = bytearray()
-                for _ in range(nextMsgLen):
-                    out.append(self._buff.pop(0))
-                self.process_message(SLMessage(*takeMessage(bytes(out))))
-                print(f"{len(self._buff)} left in buffer")
-            else:
-                break
+        for message in self._framer.feed(data):
+            self.process_message(SLMessage(*message))
+        _LOGGER.debug(f"{len(self._framer)} left in buffer")
+
+    def push_records(self, records: Iterable[CaptureRecord]) -> int:
+        """Send the pushed messages of captured records. Returns how many."""
+        pushed = 0
+        for record in records:
+            if record.direction == RECEIVED and record.msgCode in PUSH_CODES:
+                self.send(SLMessage(record.msgID, record.msgCode, record.payload))
+                pushed += 1
+        return pushed
+
+    def send(self, msg: SLMessage) -> None:
+        """Write a message to the connection."""
+        self.transport.write(makeMessage(msg.id, msg.code, msg.data))
 
     def process_message(self, msg: SLMessage) -> None:
-        print(f"Received msg {msg.code}, {msg.data}")
+        _LOGGER.debug(f"Received msg {msg.code}, {msg.data}")
 
         def get_response(msg: SLMessage) -> SLMessage | None:
             if self._cs == CONNECTION_STATE.CONNECTED:
@@ -120,8 +136,8 @@ class FakeTCPProtocolAdapter(asyncio.Protocol):
             self.transport.close()
 
         if (resp := get_response(msg)) is not None:
-            print(f"Sent msg {resp.code}, {resp.data}")
-            self.transport.write(makeMessage(resp.id, resp.code, resp.data))
+            _LOGGER.debug(f"Sent msg {resp.code}, {resp.data}")
+            self.send(resp)
 
     def handle_challenge_request(self, msg: SLMessage) -> SLMessage:
         return SLMessage(
@@ -168,7 +184,7 @@ class FakeTCPProtocolAdapter(asyncio.Protocol):
             if not 0 <= pump_num <= 7:
                 raise ValueError("Invalid pump number")
         except Exception as ex:
-            print(ex)
+            _LOGGER.debug(ex)
             return SLMessage(msg.id, CODE.ERROR_BAD_PARAMETER)
         return SLMessage(msg.id, msg.code + 1, self.responses.pumps[pump_num].raw)
 
@@ -197,9 +213,11 @@ class FakeTCPProtocolAdapter(asyncio.Protocol):
         return default_response(msg)
 
     def handle_add_client_request(self, msg: SLMessage) -> SLMessage:
+        self.is_client = True
         return default_response(msg)
 
     def handle_remove_client_request(self, msg: SLMessage) -> SLMessage:
+        self.is_client = False
         return default_response(msg)
 
     def handle_ping_request(self, msg: SLMessage) -> SLMessage:
@@ -222,16 +240,16 @@ class FakeTCPProtocolAdapter(asyncio.Protocol):
 class FakeUDPProtocolAdapter(asyncio.DatagramProtocol):
     def __init__(self, discovery_response: bytes) -> None:
         self.discovery_response = discovery_response
-        print("UDP up)")
+        _LOGGER.debug("UDP up")
 
     def connection_made(self, transport: asyncio.DatagramTransport) -> None:
-        print("Connection")
+        _LOGGER.debug("Connection")
         self.transport = transport
 
     def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
-        print("Received datagram.")
+        _LOGGER.debug("Received datagram.")
         if struct.unpack("<8b", data) == (1, 0, 0, 0, 0, 0, 0, 0):
-            print("Pentair discovery!", addr, self.discovery_response)
+            _LOGGER.debug(f"Pentair discovery! {addr} {self.discovery_response}")
             self.transport.sendto(self.discovery_response, addr)
 
 
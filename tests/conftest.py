@@ -91,7 +91,8 @@ async def MockDiscoveryAdapter(discovery_response: bytes):
         lambda: FakeUDPProtocolAdapter(discovery_response),
         sock=_udp_sock,
     )
-    return protocol
+    yield protocol
+    transport.close()
 
 
 async def stub_async_connect(
@@ -0,0 +1,356 @@
+"""Simulated ScreenLogic protocol adapters for load tests and benchmarks."""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import itertools
+import logging
+import random
+import struct
+
+from screenlogicpy.const.common import (
+    SL_GATEWAY_IP,
+    SL_GATEWAY_NAME,
+    SL_GATEWAY_PORT,
+    SL_GATEWAY_SUBTYPE,
+    SL_GATEWAY_TYPE,
+)
+from screenlogicpy.const.msg import CODE
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.requests.chemistry import CHEMISTRY_HEADER
+from screenlogicpy.requests.status import (
+    STATUS_BODY,
+    STATUS_CIRCUIT,
+    STATUS_CIRCUIT_COUNT,
+    STATUS_HEADER,
+)
+from screenlogicpy.requests.utility import encodeMessageString, makeMessage
+
+from tests.adapter import CONNECTION_STATE, FakeTCPProtocolAdapter, SLMessage
+from tests.const_data import (
+    FAKE_GATEWAY_ADDRESS,
+    FAKE_GATEWAY_NAME,
+    FAKE_GATEWAY_SUB_TYPE,
+    FAKE_GATEWAY_TYPE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Protocol adapter initiated message IDs use the upper half of the ID range.
+_PUSH_IDS = range(32767, 65536)
+
+_AIR_TEMPERATURE = struct.Struct("<i")
+_AIR_TEMPERATURE_OFFSET = 12
+_CHEMISTRY_VALUE = struct.Struct(">H")
+_COLOR_UPDATE = struct.Struct("<3I")
+
+# Color modes stepped through by simulated light shows, and their names.
+COLOR_SHOWS = (
+    (5, "Party"),
+    (6, "Romance"),
+    (7, "Caribbean"),
+    (8, "American"),
+    (9, "Sunset"),
+    (10, "Royal"),
+)
+
+
+@dataclass(frozen=True)
+class AdapterFaults:
+    """
+    Misbehaviour of a simulated protocol adapter.
+
+    Each request is answered after 'latency' seconds plus up to 'jitter' more, or
+    not at all for a 'drop_rate' fraction of requests after login. Messages are
+    written in chunks of at most 'fragment' bytes if it is set. With 'slow_loris'
+    set, chunks are written that many seconds apart, 'fragment' bytes or 16 at a
+    time.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    drop_rate: float = 0.0
+    fragment: int | None = None
+    slow_loris: float = 0.0
+
+    def __post_init__(self):
+        if (
+            self.latency < 0
+            or self.jitter < 0
+            or not 0 <= self.drop_rate <= 1
+            or (self.fragment is not None and self.fragment < 1)
+            or self.slow_loris < 0
+        ):
+            raise ValueError(f"Invalid adapter faults: {self}")
+
+
+@dataclass(frozen=True)
+class PushTraffic:
+    """
+    Unsolicited messages sent by a simulated protocol adapter to its clients.
+
+    A status change is pushed every 'status_interval' seconds and a chemistry
+    reading every 'chemistry_interval' seconds. Every 'color_interval' seconds a
+    light show runs, pushing 'color_steps' color updates 'color_step_interval'
+    seconds apart. An interval of None disables that kind of message. Each kind
+    starts at a random offset into its interval.
+    """
+
+    status_interval: float | None = 1.0
+    chemistry_interval: float | None = 5.0
+    color_interval: float | None = 10.0
+    color_steps: int = 8
+    color_step_interval: float = 0.05
+
+
+class SimulatedAdapter(FakeTCPProtocolAdapter):
+    """
+    Fake protocol adapter with a drifting state, push traffic and faults.
+
+    Status and chemistry responses report the current simulated state, which the
+    pushed messages change. Pushes are only sent once a client has been added.
+    """
+
+    def __init__(
+        self,
+        responses: ScreenLogicResponseCollection,
+        faults: AdapterFaults = AdapterFaults(),
+        traffic: PushTraffic | None = PushTraffic(),
+        rng: random.Random = None,
+    ) -> None:
+        super().__init__(responses)
+        self.faults = faults
+        self.traffic = traffic
+        self.rng = rng if rng is not None else random.Random()
+        self.status = bytearray(responses.status.raw)
+        self.chemistry = (
+            bytearray(responses.chemistry.raw) if responses.chemistry else None
+        )
+        self.answered = 0
+        self.dropped = 0
+        self.pushed = 0
+        self._push_ids = itertools.cycle(_PUSH_IDS)
+        self._outbox: deque[bytes] = deque()
+        self._tasks: list[asyncio.Task] = []
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        super().connection_made(transport)
+        if (traffic := self.traffic) is None:
+            return
+        for interval, push in (
+            (traffic.status_interval, self.push_status),
+            (traffic.chemistry_interval, self.push_chemistry),
+            (traffic.color_interval, self.async_push_color_show),
+        ):
+            if interval is not None:
+                self._tasks.append(
+                    asyncio.get_running_loop().create_task(
+                        self._async_every(interval, push)
+                    )
+                )
+
+    def connection_lost(self, exc) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        self._outbox.clear()
+
+    async def _async_every(self, interval: float, push) -> None:
+        await asyncio.sleep(self.rng.random() * interval)
+        while True:
+            if self.is_client:
+                if asyncio.iscoroutinefunction(push):
+                    await push()
+                else:
+                    push()
+            await asyncio.sleep(interval)
+
+    def process_message(self, msg: SLMessage) -> None:
+        faults = self.faults
+        if (
+            self._cs == CONNECTION_STATE.CONNECTED
+            and faults.drop_rate
+            and self.rng.random() < faults.drop_rate
+        ):
+            self.dropped += 1
+            return
+        self.answered += 1
+        delay = faults.latency + self.rng.random() * faults.jitter
+        if delay:
+            asyncio.get_running_loop().call_later(delay, super().process_message, msg)
+        else:
+            super().process_message(msg)
+
+    def send(self, msg: SLMessage) -> None:
+        if self.transport.is_closing():
+            return
+        message = makeMessage(msg.id, msg.code, msg.data)
+        faults = self.faults
+        if faults.fragment is None and not faults.slow_loris:
+            self.transport.write(message)
+            return
+        size = faults.fragment or 16
+        chunks = [message[i : i + size] for i in range(0, len(message), size)]
+        if not faults.slow_loris:
+            for chunk in chunks:
+                self.transport.write(chunk)
+            return
+        # Chunks of one message must not interleave with those of another.
+        idle = not self._outbox
+        self._outbox.extend(chunks)
+        if idle:
+            self._write_next_chunk()
+
+    def _write_next_chunk(self) -> None:
+        if not self._outbox or self.transport.is_closing():
+            return
+        self.transport.write(self._outbox.popleft())
+        if self._outbox:
+            asyncio.get_running_loop().call_later(
+                self.faults.slow_loris, self._write_next_chunk
+            )
+
+    def push(self, code: int, data: bytes) -> None:
+        self.pushed += 1
+        self.send(SLMessage(next(self._push_ids), code, data))
+
+    def push_status(self) -> None:
+        """Drift the air and water temperatures, sometimes toggle a circuit, push."""
+        status = self.status
+        (air_temperature,) = _AIR_TEMPERATURE.unpack_from(
+            status, _AIR_TEMPERATURE_OFFSET
+        )
+        _AIR_TEMPERATURE.pack_into(
+            status,
+            _AIR_TEMPERATURE_OFFSET,
+            air_temperature + self.rng.choice((-1, 0, 1)),
+        )
+        bodies = STATUS_HEADER.unpack_from(status, 0)[-1]
+        for i in range(bodies):
+            offset = STATUS_HEADER.size + i * STATUS_BODY.size + 4
+            (temperature,) = _AIR_TEMPERATURE.unpack_from(status, offset)
+            _AIR_TEMPERATURE.pack_into(
+                status, offset, temperature + self.rng.choice((-1, 0, 0, 1))
+            )
+        offset = STATUS_HEADER.size + bodies * STATUS_BODY.size
+        (circuits,) = STATUS_CIRCUIT_COUNT.unpack_from(status, offset)
+        if circuits and self.rng.random() < 0.2:
+            offset += (
+                STATUS_CIRCUIT_COUNT.size
+                + self.rng.randrange(circuits) * STATUS_CIRCUIT.size
+                + 4
+            )
+            (state,) = struct.unpack_from("<I", status, offset)
+            struct.pack_into("<I", status, offset, int(not state))
+        self.push(CODE.STATUS_CHANGED, bytes(status))
+
+    def push_chemistry(self) -> None:
+        """Drift the pH and ORP readings, and push them."""
+        if self.chemistry is None:
+            return
+        for offset, step, low, high in (
+            (CHEMISTRY_HEADER.size, 1, 680, 820),
+            (CHEMISTRY_HEADER.size + 2, 5, 550, 850),
+        ):
+            (value,) = _CHEMISTRY_VALUE.unpack_from(self.chemistry, offset)
+            value = min(max(value + self.rng.choice((-step, 0, step)), low), high)
+            _CHEMISTRY_VALUE.pack_into(self.chemistry, offset, value)
+        self.push(CODE.CHEMISTRY_CHANGED, bytes(self.chemistry))
+
+    async def async_push_color_show(self) -> None:
+        """Push the color updates of a light show, from start to finish."""
+        mode, name = self.rng.choice(COLOR_SHOWS)
+        steps = self.traffic.color_steps
+        for progress in range(steps + 1):
+            self.push(
+                CODE.COLOR_UPDATE,
+                _COLOR_UPDATE.pack(mode, progress, steps) + encodeMessageString(name),
+            )
+            if progress < steps:
+                await asyncio.sleep(self.traffic.color_step_interval)
+
+    def handle_status_request(self, msg: SLMessage) -> SLMessage:
+        return SLMessage(msg.id, msg.code + 1, bytes(self.status))
+
+    def handle_chemistry_status_request(self, msg: SLMessage) -> SLMessage:
+        if self.chemistry is None:
+            return super().handle_chemistry_status_request(msg)
+        return SLMessage(msg.id, msg.code + 1, bytes(self.chemistry))
+
+
+class AdapterFleet:
+    """
+    Class for serving many simulated protocol adapters on localhost.
+
+    Each adapter listens on its own port and answers with one of 'collections',
+    taken in turn. Every connection gets its own SimulatedAdapter, seeded from
+    'seed' so runs can be repeated.
+    """
+
+    def __init__(
+        self,
+        collections: list[ScreenLogicResponseCollection],
+        faults: AdapterFaults = AdapterFaults(),
+        traffic: PushTraffic | None = PushTraffic(),
+        seed: int = None,
+        host: str = FAKE_GATEWAY_ADDRESS,
+    ) -> None:
+        if not collections:
+            raise ValueError("No response collections to serve")
+        self._collections = collections
+        self.faults = faults
+        self.traffic = traffic
+        self._rng = random.Random(seed)
+        self._host = host
+        self._servers: list[asyncio.AbstractServer] = []
+        self.adapters: list[SimulatedAdapter] = []
+
+    @property
+    def connect_info(self) -> list[dict]:
+        """Connection info of each adapter, as discovery would return it."""
+        return [
+            {
+                SL_GATEWAY_IP: self._host,
+                SL_GATEWAY_PORT: server.sockets[0].getsockname()[1],
+                SL_GATEWAY_TYPE: FAKE_GATEWAY_TYPE,
+                SL_GATEWAY_SUBTYPE: FAKE_GATEWAY_SUB_TYPE,
+                SL_GATEWAY_NAME: f"{FAKE_GATEWAY_NAME} #{i}",
+            }
+            for i, server in enumerate(self._servers)
+        ]
+
+    def _adapter(self, responses: ScreenLogicResponseCollection) -> SimulatedAdapter:
+        adapter = SimulatedAdapter(
+            responses,
+            self.faults,
+            self.traffic,
+            random.Random(self._rng.getrandbits(64)),
+        )
+        self.adapters.append(adapter)
+        return adapter
+
+    async def async_start(self, count: int) -> list[dict]:
+        """Start 'count' more adapters and return the connection info of all."""
+        loop = asyncio.get_running_loop()
+        for _ in range(count):
+            responses = self._collections[len(self._servers) % len(self._collections)]
+            self._servers.append(
+                await loop.create_server(
+                    lambda responses=responses: self._adapter(responses),
+                    self._host,
+                    0,
+                )
+            )
+        _LOGGER.debug(f"{len(self._servers)} simulated adapters listening")
+        return self.connect_info
+
+    async def async_stop(self) -> None:
+        """Stop listening and close every connection."""
+        for server in self._servers:
+            server.close()
+        for adapter in self.adapters:
+            adapter.transport.close()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+        self.adapters.clear()
@@ -0,0 +1,100 @@
+import pytest
+from unittest.mock import call, patch
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.common import ScreenLogicResponseError
+
+
+@pytest.mark.asyncio
+async def test_batch_sends_commands_then_refreshes_once(
+    MockConnectedGateway: ScreenLogicGateway,
+):
+    gateway = MockConnectedGateway
+
+    with (
+        patch(
+            "screenlogicpy.requests.button.async_make_request", return_value=b""
+        ) as mock_button,
+        patch(
+            "screenlogicpy.requests.heat.async_make_request", return_value=b""
+        ) as mock_heat,
+        patch.object(gateway, "async_get_status") as mock_status,
+    ):
+        async with gateway.batch(pacing=0) as batch:
+            batch.set_circuit(502, 1).set_circuit(503, 1)
+            batch.set_heat_temp(0, 84)
+            batch.set_circuit(502, 0)
+
+        assert [command.name for command in batch.commands] == [
+            "set_circuit",
+            "set_circuit",
+            "set_heat_temp",
+        ]
+        mock_button.assert_has_awaits(
+            [
+                call(
+                    gateway._protocol,
+                    12530,
+                    b"\x00\x00\x00\x00\xf6\x01\x00\x00\x00\x00\x00\x00",
+                    1,
+                ),
+                call(
+                    gateway._protocol,
+                    12530,
+                    b"\x00\x00\x00\x00\xf7\x01\x00\x00\x01\x00\x00\x00",
+                    1,
+                ),
+            ]
+        )
+        mock_heat.assert_awaited_once_with(
+            gateway._protocol,
+            12528,
+            b"\x00\x00\x00\x00\x00\x00\x00\x00T\x00\x00\x00",
+            1,
+        )
+        mock_status.assert_awaited_once()
+
+    result = batch.result
+    assert result.ok
+    assert all(command.latency is not None for command in result.commands)
+    assert result.refresh_latency is not None
+
+
+def test_batch_validates_up_front(MockConnectedGateway: ScreenLogicGateway):
+    batch = MockConnectedGateway.batch()
+
+    with pytest.raises(ValueError):
+        batch.set_circuit(999, 1)
+    with pytest.raises(ValueError):
+        batch.set_circuit(502, 2)
+    with pytest.raises(ValueError):
+        batch.set_heat_temp(0, 200)
+    with pytest.raises(ValueError):
+        batch.set_heat_mode(5, 3)
+    with pytest.raises(ValueError):
+        batch.set_color_lights(99)
+    assert batch.commands == []
+
+
+@pytest.mark.asyncio
+async def test_batch_stops_at_failed_command(MockConnectedGateway: ScreenLogicGateway):
+    gateway = MockConnectedGateway
+    batch = gateway.batch(pacing=0)
+    batch.set_circuit(502, 1).set_heat_mode(1, 3).set_color_lights(7)
+
+    with (
+        patch.object(
+            gateway,
+            "_async_connected_request",
+            side_effect=[None, ScreenLogicResponseError("Failed")],
+        ) as mock_request,
+        patch.object(gateway, "async_get_status") as mock_status,
+    ):
+        result = await batch.async_send()
+
+    assert mock_request.await_count == 2
+    mock_status.assert_awaited_once()
+    assert not result.ok
+    assert result.commands[0].sent
+    assert isinstance(result.commands[1].error, ScreenLogicResponseError)
+    assert result.commands[2].latency is None
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import pytest
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.cache import ConfigCache
+from screenlogicpy.const.common import DATA_REQUEST
+from screenlogicpy.const.data import DEVICE
+from screenlogicpy.const.msg import CODE
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.metrics import MetricsCollector
+
+from .const_data import FAKE_CONNECT_INFO, FAKE_GATEWAY_MAC
+
+FIRMWARE = "POOL: 5.2 Build 738.0 Rel"
+
+
+def test_config_cache(tmp_path, response_collection: ScreenLogicResponseCollection):
+    cache = ConfigCache(str(tmp_path / "cache"))
+    assert cache.load(FAKE_GATEWAY_MAC, FIRMWARE) is None
+    assert cache.path(FAKE_GATEWAY_MAC, FIRMWARE).endswith(
+        "slpy-config-00_00_00_00_00_00_POOL_5.2_Build_738.0_Rel.json"
+    )
+
+    raw = {
+        DATA_REQUEST.VERSION: response_collection.version.raw,
+        DATA_REQUEST.CONFIG: response_collection.config.raw,
+    }
+    cache.save(FAKE_GATEWAY_MAC, FIRMWARE, raw)
+    assert cache.load(FAKE_GATEWAY_MAC, FIRMWARE) == raw
+    assert cache.load(FAKE_GATEWAY_MAC, "POOL: 5.2 Build 740.0 Rel") is None
+
+    with open(cache.path(FAKE_GATEWAY_MAC, FIRMWARE), "w") as fp:
+        fp.write("{")
+    assert cache.load(FAKE_GATEWAY_MAC, FIRMWARE) is None
+
+    cache.remove(FAKE_GATEWAY_MAC, FIRMWARE)
+    assert cache.load(FAKE_GATEWAY_MAC, FIRMWARE) is None
+
+
+@pytest.mark.asyncio
+async def test_gateway_config_cache(tmp_path, MockProtocolAdapter: asyncio.Server):
+    cache = ConfigCache(str(tmp_path))
+    gateway = ScreenLogicGateway(config_cache=cache)
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    await gateway.async_disconnect()
+    assert cache.load(FAKE_GATEWAY_MAC, FIRMWARE) is not None
+
+    metrics = MetricsCollector()
+    gateway = ScreenLogicGateway(
+        config_cache=ConfigCache(str(tmp_path), refresh_jitter=0), metrics=metrics
+    )
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    assert metrics.code_stats(CODE.CTRLCONFIG_QUERY).requests == 0
+    assert gateway.get_data(DEVICE.CIRCUIT)
+
+    # The cached config is refreshed in the background.
+    await gateway._config_refresh
+    assert metrics.code_stats(CODE.CTRLCONFIG_QUERY).requests == 1
+    assert not gateway.has_changed(DATA_REQUEST.CONFIG)
+    await gateway.async_disconnect()
+
+    # A file written by a newer version is a cache miss, and the config is fetched.
+    path = cache.path(FAKE_GATEWAY_MAC, FIRMWARE)
+    with open(path, encoding="utf-8") as fp:
+        data = json.load(fp)
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump({**data, "__format": 99}, fp)
+    assert cache.load(FAKE_GATEWAY_MAC, FIRMWARE) is None
+    metrics.reset()
+    gateway = ScreenLogicGateway(config_cache=cache, metrics=metrics)
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    assert metrics.code_stats(CODE.CTRLCONFIG_QUERY).requests == 1
+    assert gateway.get_data(DEVICE.CIRCUIT)
+    await gateway.async_disconnect()
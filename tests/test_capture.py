@@ -0,0 +1,178 @@
+import asyncio
+import io
+import pytest
+import threading
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.capture import (
+    CAPTURE_MAGIC,
+    RECEIVED,
+    SENT,
+    CaptureRecord,
+    CaptureWriter,
+    capture_response_collection,
+    read_capture,
+    replay_capture,
+)
+from screenlogicpy.const.common import DATA_REQUEST, ScreenLogicError
+from screenlogicpy.const.data import DEVICE
+from screenlogicpy.const.msg import CODE
+from screenlogicpy.data import ScreenLogicResponseCollection
+
+from .adapter import FakeTCPProtocolAdapter
+from .const_data import FAKE_CONNECT_INFO, FAKE_GATEWAY_ADDRESS, FAKE_GATEWAY_PORT
+
+
+def test_capture_round_trip(tmp_path):
+    path = tmp_path / "site.slcap"
+    with CaptureWriter(path) as capture:
+        capture.record(SENT, 1, CODE.POOLSTATUS_QUERY, b"\x00\x00\x00\x00", 10.0)
+        capture.record(RECEIVED, 1, CODE.POOLSTATUS_QUERY + 1, b"status", 10.5)
+    # Appending to an existing capture does not repeat the header.
+    with CaptureWriter(path) as capture:
+        capture.record(RECEIVED, 32767, CODE.STATUS_CHANGED, timestamp=11.0)
+        assert capture.records == 1
+
+    assert list(read_capture(path)) == [
+        CaptureRecord(10.0, SENT, 1, CODE.POOLSTATUS_QUERY, b"\x00\x00\x00\x00"),
+        CaptureRecord(10.5, RECEIVED, 1, CODE.POOLSTATUS_QUERY + 1, b"status"),
+        CaptureRecord(11.0, RECEIVED, 32767, CODE.STATUS_CHANGED, b""),
+    ]
+
+    # A record cut short while writing is dropped.
+    with open(path, "r+b") as fp:
+        fp.truncate(path.stat().st_size - 1)
+    assert len(list(read_capture(path))) == 2
+
+    with pytest.raises(ScreenLogicError):
+        list(read_capture(io.BytesIO(b"not a capture")))
+
+
+def test_replay_capture(response_collection: ScreenLogicResponseCollection):
+    buffer = io.BytesIO()
+    capture = CaptureWriter(buffer)
+    capture.record(
+        RECEIVED, 4, CODE.CTRLCONFIG_QUERY + 1, response_collection.config.raw
+    )
+    capture.record(SENT, 5, CODE.PUMPSTATUS_QUERY, b"\x00\x00\x00\x00\x01\x00\x00\x00")
+    capture.record(RECEIVED, 6, CODE.STATUS_CHANGED, response_collection.status.raw)
+    capture.record(
+        RECEIVED, 5, CODE.PUMPSTATUS_QUERY + 1, response_collection.pumps[1].raw
+    )
+    capture.record(RECEIVED, 7, CODE.PING_QUERY + 1)
+    assert buffer.getvalue().startswith(CAPTURE_MAGIC)
+
+    buffer.seek(0)
+    data = {}
+    replayed = [
+        (request, index)
+        for _, request, index in replay_capture(read_capture(buffer), data)
+    ]
+    assert replayed == [
+        (DATA_REQUEST.CONFIG, None),
+        (DATA_REQUEST.STATUS, None),
+        (DATA_REQUEST.PUMPS, 1),
+    ]
+    assert data[DEVICE.PUMP][1] == response_collection.decoded_complete[DEVICE.PUMP][1]
+
+
+@pytest.mark.asyncio
+async def test_capture_writes_off_loop():
+    loop_thread = threading.current_thread()
+    writers = []
+
+    class File(io.BytesIO):
+        def write(self, data):
+            writers.append(threading.current_thread())
+            return super().write(data)
+
+    buffer = File()
+    # The capture header is written off the loop too.
+    capture = CaptureWriter(buffer)
+    for msgID in range(100):
+        capture.record(RECEIVED, msgID, CODE.STATUS_CHANGED, bytes(64))
+    await capture.async_close()
+
+    assert writers and loop_thread not in writers
+    buffer.seek(0)
+    assert [record.msgID for record in read_capture(buffer)] == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_capture_close_while_writing(tmp_path, caplog):
+    path = tmp_path / "site.slcap"
+    capture = CaptureWriter(path)
+    capture.record(RECEIVED, 1, CODE.STATUS_CHANGED)
+    # The writes queued on the executor find the capture closed.
+    capture.close()
+    capture.record(RECEIVED, 2, CODE.STATUS_CHANGED)
+    await asyncio.sleep(0.1)
+    assert "Error writing capture" not in caplog.text
+    assert [record.msgID for record in read_capture(path)] == [1]
+
+    capture = CaptureWriter(path)
+    capture.record(RECEIVED, 3, CODE.STATUS_CHANGED)
+    await capture.async_close()
+    assert capture._writing is None
+    assert [record.msgID for record in read_capture(path)] == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_gateway_capture_replay(
+    tmp_path, response_collection: ScreenLogicResponseCollection
+):
+    adapters: list[FakeTCPProtocolAdapter] = []
+
+    def adapter_factory(responses):
+        def create():
+            adapters.append(FakeTCPProtocolAdapter(responses))
+            return adapters[-1]
+
+        return create
+
+    loop = asyncio.get_running_loop()
+    path = tmp_path / "site.slcap"
+    server = await loop.create_server(
+        adapter_factory(response_collection),
+        FAKE_GATEWAY_ADDRESS,
+        FAKE_GATEWAY_PORT,
+        reuse_address=True,
+    )
+    with CaptureWriter(path) as capture:
+        gateway = ScreenLogicGateway(capture=capture)
+        await gateway.async_connect(**FAKE_CONNECT_INFO)
+        await gateway.async_update()
+        expected = gateway.get_data()
+        await gateway.async_disconnect()
+    server.close()
+    await server.wait_closed()
+
+    records = list(read_capture(path))
+    assert records[0].direction == SENT
+    assert records[0].msgCode == CODE.VERSION_QUERY
+
+    # The capture serves a new fake adapter which answers like the original one.
+    replayed = capture_response_collection(records)
+    assert replayed.config.raw == response_collection.config.raw
+    assert [pump.raw for pump in replayed.pumps] == [
+        pump.raw for pump in response_collection.pumps
+    ]
+    server = await loop.create_server(
+        adapter_factory(replayed),
+        FAKE_GATEWAY_ADDRESS,
+        FAKE_GATEWAY_PORT,
+        reuse_address=True,
+    )
+    gateway = ScreenLogicGateway()
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    await gateway.async_update()
+    assert gateway.get_data(DEVICE.PUMP) == expected[DEVICE.PUMP]
+
+    # Captured pushes are sent to the connected gateway.
+    pushed = asyncio.Event()
+    await gateway.async_subscribe_client(pushed.set, CODE.STATUS_CHANGED)
+    status = CaptureRecord(0, RECEIVED, 32767, CODE.STATUS_CHANGED, replayed.status.raw)
+    assert adapters[-1].push_records([status]) == 1
+    await asyncio.wait_for(pushed.wait(), 1)
+    await gateway.async_disconnect()
+    server.close()
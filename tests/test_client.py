@@ -1,4 +1,5 @@
 import asyncio
+import copy
 import pytest
 import random
 import struct
@@ -6,8 +7,10 @@ from unittest.mock import patch
 
 from screenlogicpy import ScreenLogicGateway
 from screenlogicpy.client import ClientManager
+from screenlogicpy.const.data import ATTR, DEVICE, GROUP, VALUE
 from screenlogicpy.const.msg import CODE
 from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.diff import DataChange
 from .const_data import (
     FAKE_CONNECT_INFO,
 )
@@ -190,3 +193,39 @@ async def test_keepalive(MockProtocolAdapter):
         mockPingRequest.assert_awaited_once_with(gateway._protocol, 16, max_retries=0)
         unsub()
     await gateway.async_disconnect()
+
+
+@pytest.mark.asyncio()
+async def test_notify_changes(response_collection: ScreenLogicResponseCollection):
+    status = response_collection.status.raw
+    air_temp = struct.unpack_from("<i", status, 12)[0]
+    changed_status = status[:12] + struct.pack("<i", air_temp + 5) + status[16:]
+    air_temp_path = (
+        DEVICE.CONTROLLER,
+        GROUP.SENSOR,
+        VALUE.AIR_TEMPERATURE,
+        ATTR.VALUE,
+    )
+
+    received = []
+    plain_hits = 0
+
+    def changes_callback(changes):
+        received.append(changes)
+
+    def plain_callback():
+        nonlocal plain_hits
+        plain_hits += 1
+
+    cm = ClientManager(None)
+    cm._listeners = {CODE.STATUS_CHANGED: {changes_callback, plain_callback}}
+    cm._change_listeners = {CODE.STATUS_CHANGED: {changes_callback}}
+
+    data = copy.deepcopy(response_collection.decoded_complete)
+    await cm._async_common_callback(status, CODE.STATUS_CHANGED, data)
+    assert received == []
+    assert plain_hits == 1
+
+    await cm._async_common_callback(changed_status, CODE.STATUS_CHANGED, data)
+    assert received == [[DataChange(air_temp_path, air_temp, air_temp + 5)]]
+    assert plain_hits == 2
@@ -1,12 +1,23 @@
+from dataclasses import asdict
 from datetime import datetime
+from glob import glob
+import json
 from unittest.mock import MagicMock, mock_open, patch
 
+import pytest
+
+from screenlogicpy.const.common import ScreenLogicError
 from screenlogicpy.data import (
+    FORMAT_KEY,
+    SL_DATA_FORMAT,
+    T_KEY,
     ScreenLogicResponseCollection,
     ScreenLogicResponseSet,
     build_response_collection,
     export_response_collection,
     import_response_collection,
+    read_sl_data_json,
+    write_sl_data_json,
 )
 from screenlogicpy.requests.gateway import decode_version
 from screenlogicpy.requests.config import decode_pool_config
@@ -256,3 +267,45 @@ def test_data_import_export_response_collection():
         rc = import_response_collection("filename")
     mo2.assert_called_once_with("filename", "r", encoding="utf-8")
     assert rc == TEST_RC
+
+
+def test_data_read_format_1_and_2(tmp_path):
+    for file in sorted(glob("slpy*.json", root_dir="tests/data/")):
+        rc = import_response_collection(f"tests/data/{file}")
+        assert isinstance(rc.config.raw, bytes)
+
+        export_response_collection(rc, tmp_path / file)
+        with open(tmp_path / file, encoding="utf-8") as fp:
+            exported = json.load(fp)
+        assert exported[FORMAT_KEY] == SL_DATA_FORMAT
+        assert exported["config"]["raw"]["hex"] == rc.config.raw.hex()
+        assert import_response_collection(tmp_path / file) == rc
+
+
+def test_data_read_format_2_by_line(tmp_path):
+    filename = tmp_path / "slpy-lines.json"
+    export_response_collection(TEST_RC, filename)
+    lines = filename.read_text(encoding="utf-8").splitlines()
+    # The format line, one line per response and the closing brace.
+    assert len(lines) == len(asdict(TEST_RC)) + 2
+
+    with patch("screenlogicpy.data.json.loads", wraps=json.loads) as loads:
+        assert import_response_collection(filename) == TEST_RC
+    assert loads.call_count == len(asdict(TEST_RC))
+
+    # An empty file is just the format line and the closing brace.
+    write_sl_data_json(filename, {})
+    assert read_sl_data_json(filename) == {}
+
+
+def test_data_read_rejects_code(tmp_path):
+    filename = tmp_path / "slpy-bad.json"
+    filename.write_text(
+        json.dumps({"raw": {T_KEY: "<class 'bytes'>", "repr": "__import__('os')"}})
+    )
+    with pytest.raises(ValueError):
+        read_sl_data_json(filename)
+
+    filename.write_text(json.dumps({FORMAT_KEY: SL_DATA_FORMAT + 1}))
+    with pytest.raises(ScreenLogicError):
+        read_sl_data_json(filename)
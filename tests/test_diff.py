@@ -0,0 +1,99 @@
+import copy
+
+import pytest
+
+from screenlogicpy.const.data import ATTR, DEVICE, GROUP, VALUE
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.diff import (
+    NO_CHANGES,
+    ChangeSink,
+    DataChange,
+    diff_data,
+    flatten_data,
+)
+from screenlogicpy.requests.chemistry import decode_chemistry
+from screenlogicpy.requests.status import decode_pool_status
+
+
+def test_flatten_data():
+    data = {
+        DEVICE.CONTROLLER: {
+            GROUP.SENSOR: {
+                VALUE.AIR_TEMPERATURE: {ATTR.NAME: "Air Temperature", ATTR.VALUE: 70}
+            },
+        },
+        DEVICE.CIRCUIT: {500: {ATTR.VALUE: 1, ATTR.ENUM_OPTIONS: ["Off", "On"]}},
+    }
+    assert flatten_data(data, ((DEVICE.CIRCUIT,), (DEVICE.PUMP,))) == {
+        (DEVICE.CIRCUIT, 500, ATTR.VALUE): 1,
+        (DEVICE.CIRCUIT, 500, ATTR.ENUM_OPTIONS): ["Off", "On"],
+    }
+    assert (
+        flatten_data(data)[
+            (DEVICE.CONTROLLER, GROUP.SENSOR, VALUE.AIR_TEMPERATURE, ATTR.NAME)
+        ]
+        == "Air Temperature"
+    )
+
+
+def test_diff_data():
+    old = {("a",): 1, ("b",): 2, ("c",): 3}
+    new = {("a",): 1, ("b",): 4, ("d",): 5}
+    assert diff_data(old, new) == [
+        DataChange(("b",), 2, 4),
+        DataChange(("d",), None, 5),
+        DataChange(("c",), 3, None),
+    ]
+    assert diff_data(new, dict(new)) == []
+
+
+def test_change_sink():
+    changes = []
+    sink = ChangeSink(changes, ("a",))
+    data = {"b": 1, "c": {"d": 1}}
+    sink.set(data, "b", 1)
+    sink.set(data, "b", 2)
+    sink.set(data, "e", None)
+    sink.set(data, "c", {"d": 2, "f": 3})
+    sink.at("c").record("d", 2, 2)
+    assert changes == [
+        DataChange(("a", "b"), 1, 2),
+        DataChange(("a", "e"), None, None),
+        DataChange(("a", "c", "d"), 1, 2),
+        DataChange(("a", "c", "f"), None, 3),
+    ]
+
+    NO_CHANGES.at("c").set(data, "b", 5)
+    assert data["b"] == 5
+    assert NO_CHANGES.changes is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "decoder, request_name, offset, keypaths",
+    [
+        (
+            decode_pool_status,
+            "status",
+            12,
+            ((DEVICE.CONTROLLER,), (DEVICE.BODY,), (DEVICE.CIRCUIT,)),
+        ),
+        (decode_chemistry, "chemistry", 4, ((DEVICE.INTELLICHEM,),)),
+    ],
+)
+async def test_decoders_record_changes(
+    response_collection: ScreenLogicResponseCollection,
+    decoder,
+    request_name,
+    offset,
+    keypaths,
+):
+    raw = getattr(response_collection, request_name).raw
+    changed = raw[:offset] + bytes([raw[offset] ^ 1]) + raw[offset + 1 :]
+    data = copy.deepcopy(response_collection.decoded_complete)
+    for payload in (raw, changed, raw):
+        before = flatten_data(data, keypaths)
+        changes = []
+        decoder(payload, data, ChangeSink(changes))
+        assert sorted(changes) == sorted(diff_data(before, flatten_data(data, keypaths)))
+    assert changes
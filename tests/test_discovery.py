@@ -1,9 +1,11 @@
+import asyncio
 import pytest
 import struct
+import time
 from typing import Any
 from unittest.mock import patch
 
-from screenlogicpy import ScreenLogicError
+from screenlogicpy import ScreenLogicError, ScreenLogicGateway
 from screenlogicpy.const.common import (
     SL_GATEWAY_IP,
     SL_GATEWAY_NAME,
@@ -11,13 +13,23 @@ from screenlogicpy.const.common import (
     SL_GATEWAY_SUBTYPE,
     SL_GATEWAY_TYPE,
 )
-from screenlogicpy.discovery import async_discover, process_discovery_response
+from screenlogicpy.discovery import (
+    DISCOVERY_ADDRESS,
+    create_broadcast_socket,
+    DISCOVERY_CACHE,
+    DiscoveryService,
+    async_discover,
+    gateway_name_matches_mac,
+    get_broadcast_addresses,
+    process_discovery_response,
+)
 
 from .adapter import FakeUDPProtocolAdapter
 from .const_data import (
     FAKE_CONNECT_INFO,
     FAKE_GATEWAY_ADDRESS,
     FAKE_GATEWAY_CHK,
+    FAKE_GATEWAY_MAC,
     FAKE_GATEWAY_NAME,
     FAKE_GATEWAY_PORT,
     FAKE_GATEWAY_TYPE,
@@ -103,3 +115,114 @@ async def test_discovery_async_discover_error(
     ):
         await async_discover()
         assert "WARNING  screenlogicpy.discovery:discovery.py" in caplog.text
+
+
+def test_discovery_broadcast_addresses():
+    addresses = get_broadcast_addresses()
+    assert addresses[-1] == DISCOVERY_ADDRESS
+    assert len(addresses) == len(set(addresses))
+
+
+def test_discovery_gateway_name_matches_mac():
+    assert gateway_name_matches_mac("Pentair: AB-CD-EF", "00:11:22:ab:cd:ef")
+    assert not gateway_name_matches_mac("Pentair: AB-CD-EF", "00:11:22:ab:cd:ee")
+    assert gateway_name_matches_mac("Pentair: AB-CD-EF", "00-C0-33-AB-CD-EF")
+    assert not gateway_name_matches_mac("Pentair: AB-CD-EF", "00-C0-33-AB-CD-EE")
+
+
+@pytest.mark.asyncio
+async def test_discovery_returns_early(MockDiscoveryAdapter: FakeUDPProtocolAdapter):
+    DISCOVERY_CACHE.clear()
+    start = time.monotonic()
+    # A gateway answering several broadcasts is listed once.
+    hosts = await async_discover(
+        expected=1, timeout=5, addresses=[FAKE_GATEWAY_ADDRESS, FAKE_GATEWAY_ADDRESS]
+    )
+    assert hosts == [FAKE_CONNECT_INFO]
+    hosts = await async_discover(
+        mac=FAKE_GATEWAY_MAC, timeout=5, addresses=[FAKE_GATEWAY_ADDRESS]
+    )
+    assert hosts == [FAKE_CONNECT_INFO]
+    assert time.monotonic() - start < 1
+    MockDiscoveryAdapter.transport.close()
+
+    # Answers are cached for later lookups.
+    assert await async_discover(expected=1, max_age=60) == [FAKE_CONNECT_INFO]
+    assert await async_discover(mac=FAKE_GATEWAY_MAC, max_age=60) == [
+        FAKE_CONNECT_INFO
+    ]
+    assert (
+        await async_discover(
+            expected=2, max_age=60, timeout=0.1, addresses=[FAKE_GATEWAY_ADDRESS]
+        )
+        == []
+    )
+
+
+@pytest.mark.asyncio
+async def test_discovery_service(MockDiscoveryAdapter: FakeUDPProtocolAdapter):
+    service = DiscoveryService(
+        interval=60, timeout=0.5, addresses=[FAKE_GATEWAY_ADDRESS]
+    )
+    assert service.resolve(FAKE_GATEWAY_MAC) is None
+    await service.async_start()
+    assert service.is_running
+    while not service.hosts:
+        await asyncio.sleep(0.01)
+    await service.async_stop()
+    assert not service.is_running
+    assert service.resolve(FAKE_GATEWAY_MAC) == FAKE_CONNECT_INFO
+    assert service.resolve(FAKE_GATEWAY_MAC.replace(":", "-")) == FAKE_CONNECT_INFO
+
+    service.update([{**FAKE_CONNECT_INFO, SL_GATEWAY_IP: "127.0.0.2"}])
+    assert service.resolve(FAKE_GATEWAY_MAC)[SL_GATEWAY_IP] == "127.0.0.2"
+    assert await service.async_resolve(FAKE_GATEWAY_MAC) == FAKE_CONNECT_INFO
+
+
+@pytest.mark.asyncio
+async def test_discovery_service_resolve_cached(
+    MockDiscoveryAdapter: FakeUDPProtocolAdapter,
+):
+    DISCOVERY_CACHE.clear()
+    service = DiscoveryService(timeout=5, addresses=[FAKE_GATEWAY_ADDRESS])
+    with patch(
+        "screenlogicpy.discovery.create_broadcast_socket",
+        wraps=create_broadcast_socket,
+    ) as mock_socket:
+        assert await service.async_resolve(FAKE_GATEWAY_MAC) == FAKE_CONNECT_INFO
+        assert mock_socket.call_count == 1
+
+        # The second lookup is answered from the last discovery.
+        assert await service.async_resolve(FAKE_GATEWAY_MAC) == FAKE_CONNECT_INFO
+        assert mock_socket.call_count == 1
+
+        assert (
+            await service.async_resolve(FAKE_GATEWAY_MAC, max_age=0)
+            == FAKE_CONNECT_INFO
+        )
+        assert mock_socket.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_discovery_service_gateway_moved(
+    MockDiscoveryAdapter: FakeUDPProtocolAdapter,
+    MockProtocolAdapter: asyncio.Server,
+):
+    service = DiscoveryService(timeout=5, addresses=[FAKE_GATEWAY_ADDRESS])
+    gateway = ScreenLogicGateway(discovery=service)
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    await gateway.async_disconnect()
+
+    # A failed connection to the old address looks the protocol adapter up again.
+    gateway._port = FAKE_GATEWAY_PORT + 1
+    assert await gateway.async_connect()
+    assert gateway.ip == FAKE_GATEWAY_ADDRESS
+    assert gateway.port == FAKE_GATEWAY_PORT
+    await gateway.async_disconnect()
+
+    # Reconnects go straight to the address last discovered.
+    gateway._port = FAKE_GATEWAY_PORT + 1
+    MockDiscoveryAdapter.transport.close()
+    assert await gateway.async_connect()
+    assert gateway.port == FAKE_GATEWAY_PORT
+    await gateway.async_disconnect()
@@ -0,0 +1,132 @@
+import asyncio
+import pytest
+import pytest_asyncio
+import socket
+from unittest.mock import AsyncMock, patch
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.common import ScreenLogicConnectionError
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.fleet import GatewayPool
+
+from .adapter import FakeTCPProtocolAdapter
+from .const_data import FAKE_GATEWAY_ADDRESS
+
+SITE_COUNT = 3
+
+
+@pytest_asyncio.fixture()
+async def MockProtocolAdapters(response_collection: ScreenLogicResponseCollection):
+    event_loop = asyncio.get_running_loop()
+    servers = [
+        await event_loop.create_server(
+            lambda: FakeTCPProtocolAdapter(response_collection),
+            FAKE_GATEWAY_ADDRESS,
+            0,
+        )
+        for _ in range(SITE_COUNT)
+    ]
+    yield [server.sockets[0].getsockname()[1] for server in servers]
+    for server in servers:
+        server.close()
+
+
+def closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((FAKE_GATEWAY_ADDRESS, 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_pool_update_all(
+    MockProtocolAdapters: list[int],
+    response_collection: ScreenLogicResponseCollection,
+):
+    pool = GatewayPool(max_concurrent=2)
+    for i, port in enumerate(MockProtocolAdapters):
+        pool.add_site(f"site{i}", FAKE_GATEWAY_ADDRESS, port)
+    pool.add_site("offline", FAKE_GATEWAY_ADDRESS, closed_port())
+
+    errors = await pool.async_update_all()
+
+    assert list(errors) == ["offline"]
+    assert isinstance(errors["offline"], ScreenLogicConnectionError)
+    health = pool.health
+    assert health.total == SITE_COUNT + 1
+    assert health.connected == SITE_COUNT
+    assert health.failing == ["offline"]
+    assert health.sites["offline"].consecutive_failures == 1
+    assert health.sites["site0"].successes == 1
+    assert (
+        pool.get_gateway("site1").get_data()["pump"]
+        == response_collection.decoded_complete["pump"]
+    )
+
+    await pool.async_stop()
+    assert pool.health.connected == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_login_failure(MockProtocolAdapters: list[int]):
+    pool = GatewayPool()
+    for i, port in enumerate(MockProtocolAdapters):
+        pool.add_site(f"site{i}", FAKE_GATEWAY_ADDRESS, port)
+
+    with patch.object(
+        pool.get_gateway("site0"), "async_connect", AsyncMock(return_value=False)
+    ):
+        errors = await pool.async_connect_all()
+
+    assert list(errors) == ["site0"]
+    assert isinstance(errors["site0"], ScreenLogicConnectionError)
+    health = pool.health
+    assert health.connected == SITE_COUNT - 1
+    assert health.failing == ["site0"]
+    assert health.sites["site0"].successes == 0
+    await pool.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_limits(MockProtocolAdapters: list[int]):
+    pool = GatewayPool(max_concurrent=2, max_per_site=1)
+    for i, port in enumerate(MockProtocolAdapters):
+        pool.add_site(f"site{i}", FAKE_GATEWAY_ADDRESS, port)
+    await pool.async_connect_all()
+
+    in_flight = {}
+    most_in_flight = 0
+
+    async def slow(gateway: ScreenLogicGateway):
+        nonlocal most_in_flight
+        in_flight[gateway] = in_flight.get(gateway, 0) + 1
+        most_in_flight = max(most_in_flight, sum(in_flight.values()))
+        assert in_flight[gateway] == 1
+        await asyncio.sleep(0.01)
+        in_flight[gateway] -= 1
+
+    await asyncio.gather(
+        *(pool.async_call(site, slow) for site in pool.sites for _ in range(2))
+    )
+    assert most_in_flight == 2
+    await pool.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_polling_is_staggered(MockProtocolAdapters: list[int]):
+    pool = GatewayPool(poll_interval=0.3)
+    for i, port in enumerate(MockProtocolAdapters):
+        pool.add_site(f"site{i}", FAKE_GATEWAY_ADDRESS, port)
+
+    offsets = sorted(site.offset for site in pool._sites.values())
+    assert offsets[0] == 0
+    assert all(b - a > 0.05 for a, b in zip(offsets, offsets[1:]))
+
+    await pool.async_start()
+    assert pool.is_running
+    await asyncio.sleep(1.2)
+    await pool.async_stop()
+
+    assert not pool.is_running
+    for health in pool.health.sites.values():
+        assert health.successes >= 1
+        assert health.failures == 0
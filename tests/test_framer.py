@@ -0,0 +1,59 @@
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.requests.framer import MessageFramer
+from screenlogicpy.requests.utility import makeMessage
+
+
+def test_framer_single_message():
+    framer = MessageFramer()
+    assert framer.feed(makeMessage(1, 12527, b"status")) == [(1, 12527, b"status")]
+    assert len(framer) == 0
+
+
+def test_framer_multiple_messages_and_partial(
+    response_collection: ScreenLogicResponseCollection,
+):
+    chem = response_collection.chemistry.raw
+    scg = response_collection.scg.raw
+    stream = makeMessage(27, 12593, chem) + makeMessage(28, 12573, scg)
+    split = len(stream) - 5
+
+    framer = MessageFramer()
+    assert framer.feed(stream[:split]) == [(27, 12593, chem)]
+    assert len(framer) == len(makeMessage(28, 12573, scg)) - 5
+    assert framer.feed(stream[split:]) == [(28, 12573, scg)]
+    assert len(framer) == 0
+
+
+def test_framer_byte_at_a_time(response_collection: ScreenLogicResponseCollection):
+    config = response_collection.config.raw
+    stream = makeMessage(3, 12533, config) + makeMessage(4, 17, b"")
+
+    framer = MessageFramer(size=16)
+    received = []
+    for i in range(len(stream)):
+        received.extend(framer.feed(stream[i : i + 1]))
+
+    assert received == [(3, 12533, config), (4, 17, b"")]
+    assert len(framer) == 0
+    # Buffer returns to its initial size once a large message has been framed.
+    assert framer.capacity == 16
+
+
+def test_framer_grows_for_large_message():
+    payload = bytes(range(256)) * 64
+    stream = makeMessage(5, 12533, payload)
+
+    framer = MessageFramer(size=64)
+    assert framer.feed(stream[:100]) == []
+    assert framer.feed(stream[100:9000]) == []
+    assert framer.capacity >= 9000
+    assert framer.feed(stream[9000:]) == [(5, 12533, payload)]
+
+
+def test_framer_clear():
+    framer = MessageFramer()
+    framer.feed(makeMessage(6, 12527, b"partial")[:10])
+    assert len(framer) == 10
+    framer.clear()
+    assert len(framer) == 0
+    assert framer.feed(makeMessage(7, 17)) == [(7, 17, b"")]
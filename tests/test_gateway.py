@@ -5,7 +5,9 @@ from unittest.mock import call, patch
 from screenlogicpy import ScreenLogicGateway
 from screenlogicpy.client import ClientManager
 from screenlogicpy.const.data import ATTR, DEVICE, GROUP, VALUE
+from screenlogicpy.const.msg import CODE
 from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.metrics import MetricsCollector
 
 from .const_data import (
     FAKE_CONNECT_INFO,
@@ -419,3 +421,288 @@ async def test_gateway_register_async_message_handler(
 
     assert MSG_CODE in gateway._protocol._callbacks
     assert gateway._protocol._callbacks[MSG_CODE] == (callback, (1,))
+
+
+@pytest.mark.asyncio
+async def test_gateway_pipelined_update(
+    MockConnectedGateway: ScreenLogicGateway,
+    response_collection: ScreenLogicResponseCollection,
+):
+    gateway = MockConnectedGateway
+    gateway.set_max_in_flight(3)
+    responses = {
+        12526: response_collection.status.raw,
+        12592: response_collection.chemistry.raw,
+        12572: response_collection.scg.raw,
+        8110: response_collection.date_time.raw,
+    }
+    in_flight = 0
+    most_in_flight = 0
+
+    async def make_request(protocol, code, payload, max_retries):
+        nonlocal in_flight, most_in_flight
+        in_flight += 1
+        most_in_flight = max(most_in_flight, in_flight)
+        # Answer later requests first.
+        await asyncio.sleep(0.01 if code == 12526 else 0)
+        in_flight -= 1
+        if code == 12584:
+            return response_collection.pumps[payload[4]].raw
+        return responses[code]
+
+    with patch(
+        "screenlogicpy.requests.pipeline.async_make_request",
+        side_effect=make_request,
+    ) as mock_request:
+        await gateway.async_update()
+
+        assert [c.args[1] for c in mock_request.await_args_list] == [
+            12526,
+            12584,
+            12584,
+            12592,
+            12572,
+            8110,
+        ]
+    assert most_in_flight == 3
+    assert gateway.get_debug()["status"] == response_collection.status.raw
+    assert gateway.get_debug()["pumps"][1] == response_collection.pumps[1].raw
+    assert gateway.get_debug()["date_time"] == response_collection.date_time.raw
+    data = gateway.get_data()
+    date_time = data[DEVICE.CONTROLLER][GROUP.DATE_TIME]
+    date_time[VALUE.TIMESTAMP_HOST] = response_collection.decoded_complete[
+        DEVICE.CONTROLLER
+    ][GROUP.DATE_TIME][VALUE.TIMESTAMP_HOST]
+    assert data == response_collection.decoded_complete
+
+
+def test_gateway_max_in_flight():
+    gateway = ScreenLogicGateway()
+    assert gateway.max_in_flight == 1
+    gateway.set_max_in_flight(4)
+    assert gateway.max_in_flight == 4
+    with pytest.raises(ValueError):
+        gateway.set_max_in_flight(0)
+
+
+@pytest.mark.asyncio
+async def test_gateway_skips_unchanged_payloads(
+    MockConnectedGateway: ScreenLogicGateway,
+    response_collection: ScreenLogicResponseCollection,
+):
+    gateway = MockConnectedGateway
+    status = response_collection.status.raw
+    changed_status = status[:4] + bytes([status[4] ^ 1]) + status[5:]
+
+    with (
+        patch(
+            "screenlogicpy.requests.status.async_make_request",
+            side_effect=[status, status, changed_status],
+        ),
+        patch("screenlogicpy.requests.status.decode_pool_status") as mock_decode,
+    ):
+        await gateway.async_get_status()
+        assert mock_decode.call_count == 1
+        assert gateway.has_changed("status")
+        generation = gateway.generation
+
+        await gateway.async_get_status()
+        assert mock_decode.call_count == 1
+        assert not gateway.has_changed("status")
+        assert gateway.generation == generation
+
+        await gateway.async_get_status()
+        assert mock_decode.call_count == 2
+        assert gateway.has_changed("status")
+        assert gateway.generation == generation + 1
+        assert gateway.get_debug()["status"] == changed_status
+
+
+@pytest.mark.asyncio
+async def test_gateway_config_change_decodes_again(
+    MockConnectedGateway: ScreenLogicGateway,
+    response_collection: ScreenLogicResponseCollection,
+):
+    gateway = MockConnectedGateway
+    config = response_collection.config.raw
+
+    with (
+        patch(
+            "screenlogicpy.requests.status.async_make_request",
+            return_value=response_collection.status.raw,
+        ),
+        patch(
+            "screenlogicpy.requests.config.async_make_request",
+            side_effect=[config, config[:-1] + bytes([config[-1] ^ 1])],
+        ),
+        patch("screenlogicpy.requests.status.decode_pool_status") as mock_decode,
+    ):
+        await gateway.async_get_config()
+        await gateway.async_get_status()
+        await gateway.async_get_status()
+        assert mock_decode.call_count == 1
+
+        await gateway.async_get_config()
+        assert gateway.has_changed("config")
+        await gateway.async_get_status()
+        assert mock_decode.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_gateway_pushed_status_updates_last(
+    MockConnectedGateway: ScreenLogicGateway,
+    response_collection: ScreenLogicResponseCollection,
+):
+    gateway = MockConnectedGateway
+    status = response_collection.status.raw
+    client_manager = gateway._client_manager
+    client_manager._listeners[CODE.STATUS_CHANGED] = set()
+
+    with (
+        patch(
+            "screenlogicpy.requests.status.async_make_request",
+            return_value=status,
+        ),
+        patch("screenlogicpy.requests.status.decode_pool_status") as mock_decode,
+    ):
+        await client_manager._async_common_callback(
+            status, CODE.STATUS_CHANGED, gateway._data
+        )
+        await client_manager._async_common_callback(
+            status, CODE.STATUS_CHANGED, gateway._data
+        )
+        assert mock_decode.call_count == 1
+
+        await gateway.async_get_status()
+        assert mock_decode.call_count == 1
+        assert gateway.get_debug()["status"] == status
+
+
+@pytest.mark.asyncio
+async def test_gateway_coalesces_identical_requests(
+    MockConnectedGateway: ScreenLogicGateway,
+    response_collection: ScreenLogicResponseCollection,
+):
+    gateway = MockConnectedGateway
+
+    async def make_request(protocol, code, payload, max_retries):
+        await asyncio.sleep(0.01)
+        if code == 12584:
+            return response_collection.pumps[payload[4]].raw
+        return response_collection.status.raw
+
+    with patch(
+        "screenlogicpy.requests.status.async_make_request",
+        side_effect=make_request,
+    ) as mock_status, patch(
+        "screenlogicpy.requests.pump.async_make_request",
+        side_effect=make_request,
+    ) as mock_pump, patch(
+        "screenlogicpy.requests.status.decode_pool_status"
+    ) as mock_decode:
+        await asyncio.gather(
+            gateway.async_get_status(),
+            gateway.async_get_status(),
+            gateway.async_get_status(),
+            gateway.async_get_pumps(),
+            gateway.async_get_pumps(),
+        )
+
+        mock_status.assert_awaited_once()
+        mock_decode.assert_called_once()
+        assert mock_pump.await_count == 2
+        assert gateway.coalesced_requests == {12526: 2, 12584: 2}
+
+        # Requests made after the first completes are sent again.
+        await gateway.async_get_status()
+        assert mock_status.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_gateway_pipelined_update_coalesces(
+    MockConnectedGateway: ScreenLogicGateway,
+    response_collection: ScreenLogicResponseCollection,
+):
+    gateway = MockConnectedGateway
+    gateway.set_max_in_flight(4)
+    responses = {
+        12526: response_collection.status.raw,
+        12592: response_collection.chemistry.raw,
+        12572: response_collection.scg.raw,
+        8110: response_collection.date_time.raw,
+    }
+
+    async def make_request(protocol, code, payload, max_retries):
+        await asyncio.sleep(0.01)
+        if code == 12584:
+            return response_collection.pumps[payload[4]].raw
+        return responses[code]
+
+    with patch(
+        "screenlogicpy.requests.pipeline.async_make_request",
+        side_effect=make_request,
+    ) as mock_pipelined, patch(
+        "screenlogicpy.requests.status.async_make_request",
+        side_effect=make_request,
+    ) as mock_status:
+        # A status request made during an update waits for the update's.
+        await asyncio.gather(gateway.async_update(), gateway.async_get_status())
+        assert mock_pipelined.await_count == 6
+        mock_status.assert_not_awaited()
+
+        # An update started during a status request waits for it.
+        await asyncio.gather(gateway.async_get_status(), gateway.async_update())
+        assert mock_pipelined.await_count == 11
+        mock_status.assert_awaited_once()
+        assert gateway.coalesced_requests == {12526: 2}
+        assert not gateway._in_flight
+
+
+@pytest.mark.asyncio
+async def test_gateway_reconnect_keeps_config(MockProtocolAdapter: asyncio.Server):
+    metrics = MetricsCollector()
+    gateway = ScreenLogicGateway(metrics=metrics)
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    await gateway.async_update()
+    await gateway.async_disconnect()
+    metrics.reset()
+
+    await gateway.async_connect()
+    assert gateway.version == "POOL: 5.2 Build 738.0 Rel"
+    assert metrics.code_stats(CODE.POOLSTATUS_QUERY).requests == 1
+    assert metrics.code_stats(CODE.VERSION_QUERY).requests == 0
+    assert metrics.code_stats(CODE.CTRLCONFIG_QUERY).requests == 0
+    await gateway.async_disconnect()
+
+    # Different bodies or circuits in the status mean the configuration changed.
+    metrics.reset()
+    with patch(
+        "screenlogicpy.requests.status.status_structure", side_effect=[((0,), ()), ((1,), ())]
+    ):
+        await gateway.async_connect()
+    assert metrics.code_stats(CODE.VERSION_QUERY).requests == 1
+    assert metrics.code_stats(CODE.CTRLCONFIG_QUERY).requests == 1
+    await gateway.async_disconnect()
+
+
+@pytest.mark.asyncio
+async def test_gateway_reconnect_during_status_request(
+    MockProtocolAdapter: asyncio.Server,
+):
+    gateway = ScreenLogicGateway()
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    await gateway.async_update()
+
+    # The status request in flight reconnects, and revalidates the cached
+    # configuration with a status request of its own.
+    gateway._transport.close()
+    await asyncio.sleep(0)
+    await asyncio.wait_for(gateway.async_get_status(), 5)
+    assert gateway.is_connected
+    assert not gateway._in_flight
+    await gateway.async_disconnect()
+
+
+def test_gateway_connect_settle():
+    with pytest.raises(ValueError):
+        ScreenLogicGateway(connect_settle=-1)
@@ -0,0 +1,90 @@
+import asyncio
+from array import array
+import pytest
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.common import DATA_REQUEST
+from screenlogicpy.const.data import DEVICE, GROUP, VALUE
+from screenlogicpy.const.msg import CODE
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.history import HistoryStore, HistoryTier, RingBuffer
+
+from .const_data import FAKE_CONNECT_INFO
+
+AIR_TEMPERATURE = (DEVICE.CONTROLLER, GROUP.SENSOR, VALUE.AIR_TEMPERATURE)
+
+
+def test_ring_buffer():
+    buffer = RingBuffer(3)
+    assert buffer.samples() == (array("d"), array("d"))
+    for i in range(5):
+        buffer.append(float(i), i * 10.0)
+
+    assert len(buffer) == buffer.capacity == 3
+    timestamps, values = buffer.samples()
+    assert timestamps == array("d", [2, 3, 4])
+    assert values == array("d", [20, 30, 40])
+    assert buffer.samples(since=3.5) == (array("d", [4]), array("d", [40]))
+    assert memoryview(values).format == "d"
+
+
+def test_history_tiers(response_collection: ScreenLogicResponseCollection):
+    data = response_collection.decoded_complete
+    history = HistoryStore(
+        (HistoryTier("raw", 0, 100), HistoryTier("1m", 60, 10)), clock=lambda: 0
+    )
+    air = data[DEVICE.CONTROLLER][GROUP.SENSOR][VALUE.AIR_TEMPERATURE]
+    air_temperature = air["value"]
+    for timestamp in (0, 30, 60, 90, 120):
+        history.record(DATA_REQUEST.STATUS, data, timestamp=timestamp)
+        air["value"] += 1
+    air["value"] = air_temperature
+
+    _, values = history.query(*AIR_TEMPERATURE)
+    assert list(values) == [air_temperature + i for i in range(5)]
+    # The interval starting at 120 is not complete.
+    assert history.query(*AIR_TEMPERATURE, tier="1m") == (
+        array("d", [0, 60]),
+        array("d", [air_temperature + 0.5, air_temperature + 2.5]),
+    )
+    assert (DEVICE.BODY, 0, VALUE.LAST_TEMPERATURE) in history.keypaths()
+
+    history.record(DATA_REQUEST.PUMPS, data, 1)
+    assert (DEVICE.PUMP, 1, VALUE.RPM_NOW) in history.keypaths()
+    assert (DEVICE.PUMP, 0, VALUE.RPM_NOW) not in history.keypaths()
+
+    with pytest.raises(KeyError):
+        history.query(DEVICE.PUMP, 7, VALUE.RPM_NOW)
+    with pytest.raises(ValueError):
+        history.query(*AIR_TEMPERATURE, tier="1d")
+    with pytest.raises(ValueError):
+        HistoryStore((HistoryTier("raw", 0, 1), HistoryTier("raw", 60, 1)))
+
+
+@pytest.mark.asyncio
+async def test_gateway_history(
+    MockProtocolAdapter: asyncio.Server,
+    response_collection: ScreenLogicResponseCollection,
+):
+    history = HistoryStore()
+    gateway = ScreenLogicGateway(history=history)
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    await gateway.async_update()
+    await gateway.async_get_status()
+
+    _, values = history.query(*AIR_TEMPERATURE)
+    assert list(values) == [gateway.get_value(*AIR_TEMPERATURE)] * 2
+    assert len(history.query(DEVICE.PUMP, 0, VALUE.WATTS_NOW)[1]) == 1
+    # The controller's salt reading is kept apart from the chlorinator's.
+    _, values = history.query(DEVICE.CONTROLLER, GROUP.SENSOR, VALUE.SALT_PPM)
+    assert list(values) == [
+        gateway.get_value(DEVICE.CONTROLLER, GROUP.SENSOR, VALUE.SALT_PPM)
+    ] * 2
+
+    # Pushed status is recorded too.
+    gateway._client_manager._listeners[CODE.STATUS_CHANGED] = set()
+    await gateway._client_manager._async_common_callback(
+        response_collection.status.raw, CODE.STATUS_CHANGED, gateway._data
+    )
+    assert len(history.query(*AIR_TEMPERATURE)[1]) == 3
+    await gateway.async_disconnect()
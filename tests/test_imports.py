@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+import pytest
+
+import screenlogicpy
+
+
+def loaded_modules(statement: str) -> set[str]:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; {statement}; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_lazy_imports():
+    assert "screenlogicpy.gateway" not in loaded_modules("import screenlogicpy")
+
+    modules = loaded_modules("from screenlogicpy import async_discover")
+    assert "screenlogicpy.discovery" in modules
+    assert "screenlogicpy.requests.status" not in modules
+
+    modules = loaded_modules("from screenlogicpy import ScreenLogicGateway")
+    assert "screenlogicpy.gateway" in modules
+    for module in (
+        "cli",
+        "data",
+        "batch",
+        "cache",
+        "snapshot",
+        "discovery",
+        "capture",
+        "metrics",
+        "updates",
+        "requests.pipeline",
+        "requests.protocol",
+        "requests.status",
+        "requests.config",
+        "requests.pump",
+        "requests.chemistry",
+        "requests.scg",
+    ):
+        assert f"screenlogicpy.{module}" not in modules
+
+
+def test_lazy_attributes():
+    from screenlogicpy.gateway import ScreenLogicGateway
+
+    assert screenlogicpy.ScreenLogicGateway is ScreenLogicGateway
+    assert "async_discover" in dir(screenlogicpy)
+    with pytest.raises(AttributeError):
+        screenlogicpy.missing
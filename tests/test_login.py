@@ -66,6 +66,18 @@ async def test_login_async_gateway_connect(MockProtocolAdapter):
     assert protocol.is_connected
 
 
+@pytest.mark.asyncio
+async def test_login_async_gateway_connect_settle(MockProtocolAdapter):
+    transport, protocol = await async_create_connection(
+        FAKE_GATEWAY_ADDRESS, FAKE_GATEWAY_PORT
+    )
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    assert await async_gateway_connect(transport, protocol, 0) == FAKE_GATEWAY_MAC
+    # The protocol adapter gets the full default settle before the challenge.
+    assert loop.time() - start >= 0.25
+
+
 @pytest.mark.asyncio
 async def test_login_async_gateway_connect_error1(MockProtocolAdapter):
     transport, protocol = await async_create_connection(
@@ -0,0 +1,63 @@
+import copy
+
+from screenlogicpy.const.common import UNIT
+from screenlogicpy.const.data import ATTR, DEVICE, GROUP, VALUE
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.requests.metadata import getMetadata, setValue
+from screenlogicpy.requests.pump import decode_pump_status
+from screenlogicpy.requests.status import decode_pool_status
+
+AIR_TEMPERATURE = (DEVICE.CONTROLLER, GROUP.SENSOR, VALUE.AIR_TEMPERATURE)
+
+
+def test_set_value_reuses_entry():
+    parent = {}
+    setValue(parent, AIR_TEMPERATURE, 70, UNIT.FAHRENHEIT)
+    entry = parent[VALUE.AIR_TEMPERATURE]
+    assert entry == {
+        ATTR.NAME: "Air Temperature",
+        ATTR.VALUE: 70,
+        ATTR.UNIT: UNIT.FAHRENHEIT,
+        ATTR.DEVICE_TYPE: "temperature",
+        ATTR.STATE_TYPE: "measurement",
+    }
+
+    setValue(parent, AIR_TEMPERATURE, 71, UNIT.FAHRENHEIT)
+    assert parent[VALUE.AIR_TEMPERATURE] is entry
+    assert entry[ATTR.VALUE] == 71
+
+    # Different metadata replaces the entry.
+    setValue(parent, AIR_TEMPERATURE, 22, UNIT.CELSIUS)
+    assert parent[VALUE.AIR_TEMPERATURE] is not entry
+    assert parent[VALUE.AIR_TEMPERATURE][ATTR.UNIT] == UNIT.CELSIUS
+    assert entry[ATTR.UNIT] == UNIT.FAHRENHEIT
+
+
+def test_get_metadata_is_a_copy():
+    metadata = getMetadata(AIR_TEMPERATURE, UNIT.FAHRENHEIT)
+    metadata[ATTR.NAME] = "Changed"
+    assert getMetadata(AIR_TEMPERATURE, UNIT.FAHRENHEIT)[ATTR.NAME] == "Air Temperature"
+
+
+def test_decode_updates_values_in_place(
+    response_collection: ScreenLogicResponseCollection,
+):
+    data = copy.deepcopy(response_collection.decoded_complete)
+    decode_pool_status(response_collection.status.raw, data)
+    decode_pump_status(response_collection.pumps[0].raw, data, 0)
+
+    heat_mode = data[DEVICE.BODY][0][VALUE.HEAT_MODE]
+    watts = data[DEVICE.PUMP][0][VALUE.WATTS_NOW]
+
+    decode_pool_status(response_collection.status.raw, data)
+    decode_pump_status(response_collection.pumps[0].raw, data, 0)
+
+    assert data[DEVICE.BODY][0][VALUE.HEAT_MODE] is heat_mode
+    assert data[DEVICE.PUMP][0][VALUE.WATTS_NOW] is watts
+    assert data == response_collection.decoded_complete
+    # Enum options are copied into each entry, so changing one leaves the others.
+    options = list(data[DEVICE.BODY][1][VALUE.HEAT_MODE][ATTR.ENUM_OPTIONS])
+    data[DEVICE.BODY][0][VALUE.HEAT_MODE][ATTR.ENUM_OPTIONS].append("Boost")
+    assert data[DEVICE.BODY][1][VALUE.HEAT_MODE][ATTR.ENUM_OPTIONS] == options
+    decode_pool_status(response_collection.status.raw, data)
+    assert data == response_collection.decoded_complete
@@ -0,0 +1,85 @@
+import pytest
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.msg import CODE
+from screenlogicpy.metrics import Histogram, MetricsCollector, timed_decode
+
+from .const_data import FAKE_CONNECT_INFO
+
+
+def test_histogram():
+    histogram = Histogram((1, 2, 5))
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.count == 4
+    assert histogram.sum == 14.5
+    assert histogram.cumulative() == [(1, 2), (2, 2), (5, 3), (float("inf"), 4)]
+
+
+def test_collector_as_dict():
+    now = [100.0]
+    metrics = MetricsCollector(clock=lambda: now[0])
+    metrics.record_request(CODE.PING_QUERY, 0)
+    metrics.record_timeout(CODE.PING_QUERY)
+    metrics.record_request(CODE.PING_QUERY, 1)
+    metrics.record_response(CODE.PING_QUERY, 0.02)
+    metrics.record_received(CODE.STATUS_CHANGED, 100, pushed=True)
+    metrics.record_received(CODE.STATUS_CHANGED, 100, pushed=True)
+    metrics.record_frames(2)
+    timed_decode(metrics, len, b"abc")
+    now[0] = 110.0
+
+    result = metrics.as_dict()
+    ping = result["codes"][CODE.PING_QUERY]
+    assert ping["name"] == "PING_QUERY"
+    assert (ping["requests"], ping["retries"], ping["timeouts"]) == (2, 1, 1)
+    assert ping["latency"]["count"] == 1
+    pushed = result["codes"][CODE.STATUS_CHANGED]
+    assert pushed["bytes_in"] == 200
+    assert pushed["push_rate"] == pytest.approx(0.2)
+    assert result["frames_per_read"]["buckets"][2] == 1
+    assert result["decode"]["len"]["count"] == 1
+
+    metrics.reset()
+    assert metrics.as_dict()["codes"] == {}
+
+
+def test_collector_to_prometheus():
+    metrics = MetricsCollector()
+    metrics.record_request(CODE.PING_QUERY, 0)
+    metrics.record_response(CODE.PING_QUERY, 0.02)
+
+    text = metrics.to_prometheus(labels={"gateway": "00-11-22"})
+    assert 'screenlogic_requests_total{gateway="00-11-22",code="16"} 1' in text
+    assert (
+        'screenlogic_response_seconds_bucket{gateway="00-11-22",code="16",le="0.025"} 1'
+        in text
+    )
+    assert 'screenlogic_response_seconds_count{gateway="00-11-22",code="16"} 1' in text
+    assert "# TYPE screenlogic_frames_per_read histogram" in text
+
+    text = metrics.to_prometheus(labels={"site": 'Pool "A"\\B\nC'})
+    assert (
+        'screenlogic_requests_total{site="Pool \\"A\\"\\\\B\\nC",code="16"} 1' in text
+    )
+
+
+@pytest.mark.asyncio
+async def test_gateway_metrics(MockProtocolAdapter):
+    metrics = MetricsCollector()
+    gateway = ScreenLogicGateway(metrics=metrics)
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    await gateway.async_update()
+    await gateway.async_disconnect()
+
+    assert gateway.metrics is metrics
+    status = metrics.code_stats(CODE.POOLSTATUS_QUERY)
+    assert status.requests == 1
+    assert status.latency.count == 1
+    assert status.bytes_out > 0
+    assert metrics.code_stats(CODE.POOLSTATUS_QUERY + 1).bytes_in > 0
+    assert "decode_pool_status" in metrics.as_dict()["decode"]
+
+    gateway.set_metrics(None)
+    assert gateway.metrics is None
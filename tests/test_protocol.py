@@ -2,6 +2,7 @@ import asyncio
 import pytest
 
 from screenlogicpy.const.msg import CODE as MSG_CODE
+from screenlogicpy.metrics import MetricsCollector
 from screenlogicpy.requests.protocol import ScreenLogicProtocol
 from screenlogicpy.requests.utility import makeMessage
 
@@ -93,3 +94,51 @@ async def test_async_close():
 
     for x in range(test_count):
         assert futures[x].cancelled()
+
+
+@pytest.mark.asyncio
+async def test_push_dispatch():
+    event_loop = asyncio.get_running_loop()
+    metrics = MetricsCollector()
+    protocol = ScreenLogicProtocol(event_loop, metrics=metrics, push_depth=2)
+    EVENT_CODE = 1296
+    handled = []
+    running = set()
+
+    async def handler(data: bytes, code: int):
+        # Never called again for a code before the last call returned.
+        assert code not in running
+        running.add(code)
+        await asyncio.sleep(0.01)
+        handled.append((code, data))
+        running.remove(code)
+
+    for code in (MSG_CODE.STATUS_CHANGED, EVENT_CODE):
+        protocol.register_async_message_callback(code, handler, code)
+    # A burst arriving in one read.
+    protocol.data_received(
+        b"".join(
+            makeMessage(40000 + i, code, bytes([i]))
+            for i in range(5)
+            for code in (MSG_CODE.STATUS_CHANGED, EVENT_CODE)
+        )
+    )
+    assert protocol.dispatcher.pending(MSG_CODE.STATUS_CHANGED) == 1
+    assert protocol.dispatcher.pending(EVENT_CODE) == 2
+    while protocol.dispatcher._tasks:
+        await asyncio.sleep(0.01)
+
+    # Messages of a code are handled in order.
+    assert [data for code, data in handled if code == EVENT_CODE] == [
+        b"\x03",
+        b"\x04",
+    ]
+    assert (MSG_CODE.STATUS_CHANGED, b"\x04") in handled
+    assert len(handled) == 3
+    assert protocol.dispatcher.coalesced == {MSG_CODE.STATUS_CHANGED: 4}
+    assert protocol.dispatcher.dropped == {EVENT_CODE: 3}
+    assert metrics.code_stats(MSG_CODE.STATUS_CHANGED).push_coalesced == 4
+    assert metrics.code_stats(EVENT_CODE).push_dropped == 3
+
+    with pytest.raises(ValueError):
+        protocol.dispatcher.depth = 0
@@ -0,0 +1,83 @@
+import pytest
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.msg import CODE
+from screenlogicpy.requests.ping import async_request_ping
+from screenlogicpy.requests.retry import AdaptiveRetryPolicy, RetryPolicy
+
+from .const_data import FAKE_CONNECT_INFO
+
+
+def test_fixed_policy():
+    policy = RetryPolicy(timeout=2, retry_wait=1)
+    policy.record_response(CODE.PING_QUERY, 0.01)
+
+    assert policy.get_timeout(CODE.PING_QUERY) == 2
+    assert [policy.get_retry_delay(CODE.PING_QUERY, i) for i in range(3)] == [1, 2, 3]
+
+
+def test_adaptive_policy_timeout_follows_rtt():
+    policy = AdaptiveRetryPolicy(initial_timeout=2, min_timeout=0.1, max_timeout=10)
+    assert policy.get_timeout(CODE.PING_QUERY) == 2
+
+    policy.record_response(CODE.PING_QUERY, 0.1)
+    assert policy.srtt == pytest.approx(0.1)
+    assert policy.rttvar == pytest.approx(0.05)
+    assert policy.get_timeout(CODE.PING_QUERY) == pytest.approx(0.3)
+
+    for _ in range(50):
+        policy.record_response(CODE.PING_QUERY, 0.02)
+    assert policy.srtt == pytest.approx(0.02, abs=0.001)
+    assert policy.get_timeout(CODE.PING_QUERY) == 0.1
+
+
+def test_adaptive_policy_backs_off_on_timeout():
+    policy = AdaptiveRetryPolicy(initial_timeout=1, min_timeout=0.5, max_timeout=3)
+
+    policy.record_timeout(CODE.PING_QUERY)
+    assert policy.get_timeout(CODE.PING_QUERY) == 2
+    policy.record_timeout(CODE.PING_QUERY)
+    policy.record_timeout(CODE.PING_QUERY)
+    assert policy.get_timeout(CODE.PING_QUERY) == 3
+
+    policy.record_response(CODE.PING_QUERY, 0.1)
+    assert policy.get_timeout(CODE.PING_QUERY) == 0.5
+
+
+def test_adaptive_policy_code_scale():
+    policy = AdaptiveRetryPolicy(
+        min_timeout=0.1, code_scale={CODE.CTRLCONFIG_QUERY: 4.0}
+    )
+
+    policy.record_response(CODE.CTRLCONFIG_QUERY, 0.4)
+    assert policy.srtt == pytest.approx(0.1)
+    assert policy.get_timeout(CODE.PING_QUERY) == pytest.approx(0.3)
+    assert policy.get_timeout(CODE.CTRLCONFIG_QUERY) == pytest.approx(1.2)
+
+
+def test_adaptive_policy_retry_delay():
+    policy = AdaptiveRetryPolicy(base_delay=0.25, max_delay=1, rng=lambda: 1.0)
+    assert [policy.get_retry_delay(CODE.PING_QUERY, i) for i in range(4)] == [
+        0.25,
+        0.5,
+        1,
+        1,
+    ]
+
+    policy = AdaptiveRetryPolicy(base_delay=0.25, max_delay=1, rng=lambda: 0.0)
+    assert policy.get_retry_delay(CODE.PING_QUERY, 1) == 0.25
+
+    with pytest.raises(ValueError):
+        AdaptiveRetryPolicy(initial_timeout=1, min_timeout=2)
+
+
+@pytest.mark.asyncio
+async def test_gateway_measures_rtt(MockProtocolAdapter):
+    policy = AdaptiveRetryPolicy()
+    gateway = ScreenLogicGateway(retry_policy=policy)
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+
+    assert gateway._protocol.retry_policy is policy
+    assert policy.srtt is not None
+    await async_request_ping(gateway._protocol, 1)
+    await gateway.async_disconnect()
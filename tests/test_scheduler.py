@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+import struct
+from unittest.mock import AsyncMock, patch
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.common import DATA_REQUEST
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.scheduler import PollInterval, PollScheduler
+
+POLLERS = (
+    "async_get_status",
+    "async_get_pumps",
+    "async_get_chemistry",
+    "async_get_scg",
+    "async_get_datetime",
+    "async_get_config",
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_scheduler_polls_stale_categories(
+    MockConnectedGateway: ScreenLogicGateway,
+):
+    gateway = MockConnectedGateway
+    clock = FakeClock()
+    mocks = {name: AsyncMock() for name in POLLERS}
+    with patch.multiple(ScreenLogicGateway, **mocks):
+        scheduler = PollScheduler(
+            gateway, {DATA_REQUEST.PUMPS: PollInterval(5, 20)}, clock=clock
+        )
+
+        assert await scheduler.async_poll_stale() == [
+            DATA_REQUEST.STATUS,
+            DATA_REQUEST.PUMPS,
+            DATA_REQUEST.CHEMISTRY,
+            DATA_REQUEST.SCG,
+            DATA_REQUEST.DATE_TIME,
+        ]
+        mocks["async_get_config"].assert_not_awaited()
+        assert await scheduler.async_poll_stale() == []
+
+        clock.now += 30
+        # A push keeps status fresh.
+        scheduler._on_push(DATA_REQUEST.STATUS)
+        assert scheduler.stale_categories() == [DATA_REQUEST.PUMPS]
+
+        clock.now += 30
+        assert scheduler.stale_categories() == [
+            DATA_REQUEST.PUMPS,
+            DATA_REQUEST.CHEMISTRY,
+            DATA_REQUEST.SCG,
+        ]
+        assert mocks["async_get_status"].await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_polls_config_on_structure_change(
+    MockConnectedGateway: ScreenLogicGateway,
+    response_collection: ScreenLogicResponseCollection,
+):
+    gateway = MockConnectedGateway
+    clock = FakeClock()
+    mocks = {name: AsyncMock() for name in POLLERS}
+    with patch.multiple(ScreenLogicGateway, **mocks):
+        scheduler = PollScheduler(
+            gateway, {DATA_REQUEST.CONFIG: PollInterval(30, None)}, clock=clock
+        )
+        scheduler._structure = scheduler._current_structure()
+        await scheduler.async_poll_stale()
+        scheduler.mark_refreshed(DATA_REQUEST.CONFIG)
+        assert scheduler.next_due(DATA_REQUEST.CONFIG) is None
+
+        # Replace the first circuit ID in the status payload.
+        status = bytearray(response_collection.status.raw)
+        bodies = struct.unpack_from("<I", status, 16)[0]
+        struct.pack_into("<I", status, 24 + bodies * 24, 999)
+        gateway._last[DATA_REQUEST.STATUS] = bytes(status)
+
+        clock.now += 10
+        scheduler._on_push(DATA_REQUEST.STATUS)
+        # Waits for the minimum interval since the last configuration poll.
+        assert scheduler.next_due(DATA_REQUEST.CONFIG) == clock.now + 20
+        assert scheduler.stale_categories() == []
+
+        clock.now += 20
+        assert await scheduler.async_poll_stale() == [
+            DATA_REQUEST.CONFIG,
+            DATA_REQUEST.PUMPS,
+        ]
+        mocks["async_get_config"].assert_awaited_once()
+        assert scheduler.next_due(DATA_REQUEST.CONFIG) is None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_start_stop(MockConnectedGateway: ScreenLogicGateway):
+    gateway = MockConnectedGateway
+    mocks = {name: AsyncMock() for name in POLLERS}
+    with (
+        patch.multiple(ScreenLogicGateway, **mocks),
+        patch.object(
+            ScreenLogicGateway, "async_subscribe_client", AsyncMock(return_value=None)
+        ) as mock_subscribe,
+    ):
+        scheduler = PollScheduler(gateway)
+        await scheduler.async_start()
+        assert scheduler.is_running
+        await asyncio.sleep(0.05)
+        await scheduler.async_stop()
+        assert not scheduler.is_running
+
+        assert mock_subscribe.await_count == 2
+        mocks["async_get_status"].assert_awaited_once()
+        mocks["async_get_pumps"].assert_awaited_once()
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import pytest
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.common import DATA_REQUEST, ScreenLogicError
+from screenlogicpy.const.data import DEVICE, GROUP, VALUE
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.segments import SEGMENT_LAYOUTS, Segment, SegmentStore
+
+from .const_data import FAKE_CONNECT_INFO
+
+
+def test_segment_layouts(response_collection: ScreenLogicResponseCollection):
+    data = response_collection.decoded_complete
+    status = SEGMENT_LAYOUTS[DATA_REQUEST.STATUS].extract(
+        response_collection.status.raw, None
+    )
+    assert status == (
+        data[DEVICE.CONTROLLER][GROUP.SENSOR][VALUE.AIR_TEMPERATURE]["value"],
+        data[DEVICE.BODY][0][VALUE.LAST_TEMPERATURE]["value"],
+        data[DEVICE.BODY][1][VALUE.LAST_TEMPERATURE]["value"],
+    )
+    chemistry = SEGMENT_LAYOUTS[DATA_REQUEST.CHEMISTRY].extract(
+        response_collection.chemistry.raw, None
+    )
+    assert chemistry[:2] == (
+        data[DEVICE.INTELLICHEM][GROUP.SENSOR][VALUE.PH_NOW]["value"],
+        data[DEVICE.INTELLICHEM][GROUP.SENSOR][VALUE.ORP_NOW]["value"],
+    )
+    pump = SEGMENT_LAYOUTS[DATA_REQUEST.PUMPS].extract(
+        response_collection.pumps[0].raw, 0
+    )
+    assert pump == (
+        0,
+        *(
+            data[DEVICE.PUMP][0][v]["value"]
+            for v in (VALUE.WATTS_NOW, VALUE.RPM_NOW, VALUE.GPM_NOW)
+        ),
+    )
+
+
+def test_segment_store(tmp_path, response_collection: ScreenLogicResponseCollection):
+    status = response_collection.status.raw
+    directory = str(tmp_path)
+    with SegmentStore(directory, segment_rows=4, max_segments=2) as store:
+        for timestamp in range(10):
+            store.append(DATA_REQUEST.STATUS, status, timestamp=float(timestamp))
+        store.append(DATA_REQUEST.CONFIG, response_collection.config.raw)
+
+        # The oldest segment was deleted.
+        assert sorted(os.listdir(directory)) == [
+            "status-00000001.seg",
+            "status-00000002.seg",
+        ]
+        timestamps = [row[0] for row in store.query(DATA_REQUEST.STATUS)]
+        assert timestamps == [4, 5, 6, 7, 8, 9]
+        timestamps, _ = store.column(
+            DATA_REQUEST.STATUS, VALUE.AIR_TEMPERATURE, start=5, end=9
+        )
+        assert list(timestamps) == [5, 6, 7, 8]
+
+    # A new store continues the last segment.
+    with SegmentStore(directory, segment_rows=4, max_segments=2) as store:
+        store.append(DATA_REQUEST.STATUS, status, timestamp=10.0)
+        assert [row[0] for row in store.query(DATA_REQUEST.STATUS, start=7)] == [
+            7,
+            8,
+            9,
+            10,
+        ]
+        assert len(os.listdir(directory)) == 2
+
+    with pytest.raises(ScreenLogicError):
+        Segment(
+            str(tmp_path / "status-00000001.seg"),
+            SEGMENT_LAYOUTS[DATA_REQUEST.PUMPS].row,
+        )
+
+
+@pytest.mark.asyncio
+async def test_segment_store_async(
+    tmp_path, response_collection: ScreenLogicResponseCollection
+):
+    status = response_collection.status.raw
+    directory = str(tmp_path)
+    clock = iter([1.0, 2.0, 3.0, 2.5, 4.0, 5.0, 6.0, 7.0]).__next__
+    store = SegmentStore(directory, segment_rows=2, max_segments=3, clock=clock)
+    for _ in range(8):
+        store.append(DATA_REQUEST.STATUS, status)
+    # The first segment is opened in the executor, so the rows wait for it.
+    await store.async_close()
+
+    assert sorted(os.listdir(directory)) == [
+        "status-00000001.seg",
+        "status-00000002.seg",
+        "status-00000003.seg",
+    ]
+    # A timestamp from a clock set back is stored as the last one before it.
+    store = SegmentStore(directory)
+    assert [row[0] for row in store.query(DATA_REQUEST.STATUS)] == [3, 3, 4, 5, 6, 7]
+    assert [row[0] for row in store.query(DATA_REQUEST.STATUS, start=4)] == [4, 5, 6, 7]
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_gateway_segments(tmp_path, MockProtocolAdapter: asyncio.Server):
+    segments = SegmentStore(str(tmp_path))
+    gateway = ScreenLogicGateway(segments=segments)
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    await gateway.async_update()
+    await gateway.async_disconnect()
+    await segments.async_close()
+
+    _, rpm = SegmentStore(str(tmp_path)).column(
+        DATA_REQUEST.PUMPS, VALUE.RPM_NOW, pump=0
+    )
+    assert list(rpm) == [gateway.get_value(DEVICE.PUMP, 0, VALUE.RPM_NOW)]
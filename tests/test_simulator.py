@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.data import DEVICE, GROUP, VALUE
+from screenlogicpy.const.msg import CODE
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.requests.retry import RetryPolicy
+
+from .simulator import AdapterFaults, AdapterFleet, PushTraffic
+
+
+@pytest.mark.asyncio
+async def test_simulated_fleet(response_collection: ScreenLogicResponseCollection):
+    fleet = AdapterFleet(
+        [response_collection],
+        AdapterFaults(latency=0.001, jitter=0.002, fragment=7),
+        PushTraffic(
+            status_interval=0.02,
+            chemistry_interval=0.02,
+            color_interval=0.05,
+            color_steps=3,
+            color_step_interval=0.001,
+        ),
+        seed=1,
+    )
+    hosts = await fleet.async_start(3)
+    assert len({host["port"] for host in hosts}) == 3
+
+    gateways = [ScreenLogicGateway() for _ in hosts]
+    pushes = {code: 0 for code in (CODE.STATUS_CHANGED, CODE.COLOR_UPDATE)}
+
+    def counter(code):
+        def callback():
+            pushes[code] += 1
+
+        return callback
+
+    for gateway, host in zip(gateways, hosts):
+        await gateway.async_connect(**host)
+        await gateway.async_update()
+        for code in pushes:
+            await gateway.async_subscribe_client(counter(code), code)
+    while min(pushes.values()) < 3:
+        await asyncio.sleep(0.01)
+
+    color = gateways[0].get_data(DEVICE.CONTROLLER, GROUP.COLOR_LIGHTS)
+    assert color
+    assert gateways[0].get_value(DEVICE.CONTROLLER, GROUP.SENSOR, VALUE.AIR_TEMPERATURE)
+    for gateway in gateways:
+        await gateway.async_disconnect()
+    assert sum(adapter.pushed for adapter in fleet.adapters) >= 6
+    await fleet.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_simulated_faults(response_collection: ScreenLogicResponseCollection):
+    fleet = AdapterFleet(
+        [response_collection], AdapterFaults(slow_loris=0.001, fragment=64), None
+    )
+    (host,) = await fleet.async_start(1)
+    gateway = ScreenLogicGateway(retry_policy=RetryPolicy(timeout=1, retry_wait=0))
+    await gateway.async_connect(**host)
+    # Responses trickle in a few bytes at a time.
+    await gateway.async_get_status()
+
+    # Unanswered requests make the gateway reconnect, to an adapter that answers.
+    fleet.adapters[0].faults = AdapterFaults(drop_rate=1)
+    gateway._protocol._retry_policy = RetryPolicy(timeout=0.05, retry_wait=0)
+    await gateway.async_get_status()
+    assert fleet.adapters[0].dropped == 2
+    assert len(fleet.adapters) == 2
+    await gateway.async_disconnect()
+    await fleet.async_stop()
@@ -0,0 +1,99 @@
+import copy
+import pytest
+
+from screenlogicpy import ScreenLogicGateway
+from screenlogicpy.const.data import ATTR, DEVICE, GROUP, VALUE
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.snapshot import (
+    BodyState,
+    ScreenLogicSnapshot,
+    SnapshotMetadata,
+    SnapshotView,
+)
+
+from .conftest import load_response_collections
+
+
+@pytest.mark.parametrize("filename, response_collection", load_response_collections())
+def test_snapshot_matches_data(
+    filename: str, response_collection: ScreenLogicResponseCollection
+):
+    data = response_collection.decoded_complete
+    snapshot = ScreenLogicSnapshot.capture(data)
+    assert snapshot.as_dict() == data
+    assert snapshot.get_data() == data
+
+
+def test_snapshot_values_are_independent(
+    response_collection: ScreenLogicResponseCollection,
+):
+    data = copy.deepcopy(response_collection.decoded_complete)
+    air_temp = (DEVICE.CONTROLLER, GROUP.SENSOR, VALUE.AIR_TEMPERATURE)
+    original_temp = data[DEVICE.CONTROLLER][GROUP.SENSOR][VALUE.AIR_TEMPERATURE][
+        ATTR.VALUE
+    ]
+    original_circuit = data[DEVICE.CIRCUIT][505][ATTR.VALUE]
+
+    metadata = SnapshotMetadata(data)
+    first = ScreenLogicSnapshot.capture(data, metadata)
+    data[DEVICE.CONTROLLER][GROUP.SENSOR][VALUE.AIR_TEMPERATURE][ATTR.VALUE] = 42
+    data[DEVICE.CIRCUIT][505][ATTR.VALUE] = 1 - original_circuit
+    second = ScreenLogicSnapshot.capture(data, metadata)
+
+    assert first.metadata is second.metadata
+    assert first.get_value(*air_temp) == original_temp
+    assert second.get_value(*air_temp) == 42
+    assert first.circuits[505].value == original_circuit
+    assert second.circuits[505].value == 1 - original_circuit
+    assert second.get_name(*air_temp) == "Air Temperature"
+    assert second.as_dict() == data
+
+
+def test_snapshot_get_data(response_collection: ScreenLogicResponseCollection):
+    data = response_collection.decoded_complete
+    snapshot = ScreenLogicSnapshot.capture(data)
+
+    body = snapshot.get_data(DEVICE.BODY, 0)
+    assert isinstance(body, SnapshotView)
+    assert body[VALUE.HEAT_SETPOINT] == data[DEVICE.BODY][0][VALUE.HEAT_SETPOINT]
+    assert snapshot.bodies[0] == BodyState.from_data(data[DEVICE.BODY][0])
+    assert snapshot.get_data(
+        DEVICE.CONTROLLER, GROUP.CONFIGURATION, GROUP.COLOR, 0
+    ) == {
+        ATTR.NAME: "White",
+        ATTR.VALUE: (255, 255, 255),
+    }
+    assert snapshot.get_data(DEVICE.INTELLICHEM, GROUP.ALARM, "does_not_exist") is None
+    with pytest.raises(KeyError):
+        snapshot.get_data(DEVICE.BODY, 5, strict=True)
+
+
+def test_snapshot_shares_metadata(MockConnectedGateway: ScreenLogicGateway):
+    gateway = MockConnectedGateway
+    first = gateway.take_snapshot()
+    second = gateway.take_snapshot()
+    assert first.metadata is second.metadata
+    assert first.chemistry == second.chemistry
+    assert second.as_dict() == gateway.get_data()
+
+    gateway._data[DEVICE.CONTROLLER][GROUP.CONFIGURATION][VALUE.IS_CELSIUS][
+        ATTR.VALUE
+    ] = 1
+    assert gateway.take_snapshot().metadata is not first.metadata
+
+
+def test_snapshot_before_update():
+    snapshot = ScreenLogicGateway().take_snapshot()
+    assert snapshot.as_dict() == {}
+    assert snapshot.get_data(DEVICE.CONTROLLER) is None
+    assert snapshot.bodies == {}
+
+
+def test_snapshot_as_dict_is_a_copy(
+    response_collection: ScreenLogicResponseCollection,
+):
+    data = response_collection.decoded_complete
+    snapshot = ScreenLogicSnapshot.capture(data)
+    copied = snapshot.as_dict()
+    copied[DEVICE.CONTROLLER][GROUP.CONFIGURATION][GROUP.COLOR].clear()
+    assert snapshot.as_dict() == data
@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+import struct
+
+from screenlogicpy import ScreenLogicError, ScreenLogicGateway
+from screenlogicpy.const.data import ATTR, DEVICE, GROUP, VALUE
+from screenlogicpy.const.msg import CODE
+from screenlogicpy.data import ScreenLogicResponseCollection
+from screenlogicpy.diff import DataChange
+from screenlogicpy.updates import OVERFLOW, PushUpdate, merge_updates
+
+from .const_data import FAKE_CONNECT_INFO
+
+AIR_TEMPERATURE = (DEVICE.CONTROLLER, GROUP.SENSOR, VALUE.AIR_TEMPERATURE)
+
+
+def status_with_air_temperature(status: bytes, air_temperature: int) -> bytes:
+    return status[:12] + struct.pack("<i", air_temperature) + status[16:]
+
+
+def test_merge_updates():
+    a, b = ("a",), ("b",)
+    older = PushUpdate(1, 0.0, [DataChange(a, 1, 2), DataChange(b, 1, 2)])
+    newer = PushUpdate(1, 1.0, [DataChange(a, 2, 3), DataChange(b, 2, 1)])
+    assert merge_updates(older, newer) == PushUpdate(1, 1.0, [DataChange(a, 1, 3)])
+
+
+@pytest.mark.asyncio
+async def test_gateway_updates(
+    MockProtocolAdapter: asyncio.Server,
+    response_collection: ScreenLogicResponseCollection,
+):
+    gateway = ScreenLogicGateway()
+    with pytest.raises(ScreenLogicError):
+        await gateway.updates().async_subscribe()
+
+    await gateway.async_connect(**FAKE_CONNECT_INFO)
+    await gateway.async_get_status()
+    status = response_collection.status.raw
+    air_temperature = struct.unpack_from("<i", status, 12)[0]
+    manager = gateway._client_manager
+
+    async def push(offset: int):
+        await manager._async_common_callback(
+            status_with_air_temperature(status, air_temperature + offset),
+            CODE.STATUS_CHANGED,
+            gateway._data,
+        )
+
+    async with gateway.updates([CODE.STATUS_CHANGED], maxsize=2) as updates:
+        # Unchanged status is not streamed.
+        await push(0)
+        for offset in (1, 2, 3):
+            await push(offset)
+        assert updates.dropped == 1
+        # Waiting updates are still taken after closing.
+        await updates.aclose()
+        assert [update.changes[0].new async for update in updates] == [
+            air_temperature + 2,
+            air_temperature + 3,
+        ]
+    assert CODE.STATUS_CHANGED not in manager._listeners
+
+    async with gateway.updates(
+        [CODE.STATUS_CHANGED], overflow=OVERFLOW.COALESCE_LATEST
+    ) as updates:
+        for offset in (4, 5, 6):
+            await push(offset)
+        assert updates.pending == 1
+        update = await updates.__anext__()
+        assert update.changes == [
+            DataChange(
+                (*AIR_TEMPERATURE, ATTR.VALUE),
+                air_temperature + 3,
+                air_temperature + 6,
+            )
+        ]
+        # Changes that cancel out leave nothing to stream.
+        await push(7)
+        await push(6)
+        assert updates.pending == 0
+
+    async with gateway.updates([CODE.STATUS_CHANGED], snapshots=True) as updates:
+        await push(6)
+        update = await updates.__anext__()
+        assert update.changes is None
+        assert update.snapshot.get_value(*AIR_TEMPERATURE) == air_temperature + 6
+
+    await gateway.async_disconnect()
+
+    with pytest.raises(ValueError):
+        gateway.updates(overflow="drop_newest")